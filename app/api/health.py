@@ -0,0 +1,100 @@
+import os
+
+from fastapi import APIRouter, Request, Response
+from fastapi.responses import JSONResponse
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    generate_latest,
+    multiprocess,
+)
+
+router = APIRouter()
+
+
+@router.get("/health", summary="Health check")
+async def health(request: Request):
+    """
+    Health of this process in its role.
+
+    Processes that run the RabbitMQ consumer report 503 while it is not
+    connected, so the orchestrator can restart them.
+    """
+
+    state = request.app.state
+    body = {"status": "ok", "role": state.role}
+
+    if state.runs_consumer:
+        consumer = state.case_assigned_consumer
+        consumer_stats = consumer.stats() if consumer is not None else {"healthy": False}
+        body["consumer"] = consumer_stats
+
+        if not consumer_stats["healthy"]:
+            body["status"] = "unavailable"
+            return JSONResponse(status_code=503, content=body)
+
+    return body
+
+
+@router.get("/metrics", summary="Prometheus metrics", include_in_schema=False)
+async def metrics():
+    """
+    Metrics of this process or, with PROMETHEUS_MULTIPROC_DIR set (API
+    workers started by the supervisor), of every process writing there.
+    """
+
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+
+    return Response(content=generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+
+
+@router.get("/health/http-pools", summary="Outbound HTTP connection pool usage")
+async def http_pools(request: Request):
+    return request.app.state.http_transports.stats()
+
+
+@router.get("/health/generation-capacity", summary="Generation concurrency limiter state")
+async def generation_capacity(request: Request):
+    limiter = request.app.state.generation_limiter
+
+    if limiter is None:
+        return {"limit": None}
+
+    return limiter.stats()
+
+
+@router.get("/health/scheduler", summary="Priority scheduler queues per class")
+async def scheduler_stats(request: Request):
+    scheduler = request.app.state.scheduler
+
+    if scheduler is None:
+        return {"capacity": None}
+
+    return scheduler.stats()
+
+
+@router.get("/health/generation-backends", summary="Generation router backend health")
+async def generation_backends(request: Request):
+    router = request.app.state.generation_router
+
+    if router is None:
+        return []
+
+    return router.stats()
+
+
+@router.get("/health/event-loop", summary="Event loop lag and CPU offload pool")
+async def event_loop(request: Request):
+    return {
+        "lag": request.app.state.event_loop_monitor.stats(),
+        "cpu_offload": request.app.state.cpu_offloader.stats(),
+    }
+
+
+@router.get("/health/prompts", summary="Prompt templates and per-version generation stats")
+async def prompts(request: Request):
+    return request.app.state.prompt_registry.stats()
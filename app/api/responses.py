@@ -0,0 +1,26 @@
+from typing import Any
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import BaseModel
+
+from app.core.serialization import orjson
+
+# Default response class for the app: orjson when it is installed.
+DefaultJSONResponse: type[JSONResponse] = ORJSONResponse if orjson is not None else JSONResponse
+
+
+class ModelJSONResponse(DefaultJSONResponse):
+    """
+    JSON response for a pydantic model.
+
+    The model is serialized to bytes by its compiled pydantic-core
+    serializer in one pass, instead of being converted to a dict by
+    jsonable_encoder and then encoded again. Other content is rendered as
+    usual.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.model_dump_json().encode("utf-8")
+
+        return super().render(content)
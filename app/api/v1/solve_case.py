@@ -1,13 +1,28 @@
 import logging
-from typing import Optional
+from typing import AsyncIterator, Literal, Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
 
+from app.api.responses import ModelJSONResponse
 from app.application.use_cases.generate_case_draft import GenerateCaseDraftUseCase
-from app.core.exceptions import ServiceUnavailable
-from app.dependencies import get_generate_case_draft_use_case
-from app.domain.models import CaseQuery, SolveCaseResult
+from app.application.use_cases.generate_case_draft_batch import (
+    GenerateCaseDraftBatchUseCase,
+)
+from app.core.exceptions import Overloaded, ServiceUnavailable
+from app.dependencies import (
+    get_generate_case_draft_batch_use_case,
+    get_generate_case_draft_use_case,
+)
+from app.domain.models import (
+    BatchDraftItemResult,
+    BatchDraftRequest,
+    BatchDraftResult,
+    CaseQuery,
+    DraftStreamEvent,
+    SolveCaseResult,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -29,7 +44,7 @@ async def generate_draft_recommendation(
     ),
     x_user_id: UUID = Header(..., alias="X-User-Id"),
     use_case: GenerateCaseDraftUseCase = Depends(get_generate_case_draft_use_case),
-) -> SolveCaseResult:
+) -> ModelJSONResponse:
     """
     Generate AI-assisted draft recommendations for a case.
 
@@ -38,12 +53,17 @@ async def generate_draft_recommendation(
     """
 
     try:
-        return await use_case.execute(
+        result = await use_case.execute(
             query=case_query,
             consultant_id=x_user_id,
             n=n,
         )
 
+        return ModelJSONResponse(result)
+
+    except Overloaded as exc:
+        raise _overloaded(exc) from exc
+
     except ServiceUnavailable as exc:
         raise HTTPException(status_code=503, detail=str(exc)) from exc
 
@@ -57,3 +77,180 @@ async def generate_draft_recommendation(
             detail="Internal server error",
         ) from exc
 
+
+@router.post(
+    "/draft-recommendation:stream",
+    summary="Stream an AI-assisted draft recommendation for a case",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "content": {
+                "text/event-stream": {},
+                "application/x-ndjson": {},
+            },
+            "description": "Stream of summary, recommendation, done and error events.",
+        }
+    },
+)
+async def stream_draft_recommendation(
+    case_query: CaseQuery,
+    n: Optional[int] = Query(
+        default=None,
+        ge=1,
+        le=5,
+        description="Number of draft recommendations to generate.",
+    ),
+    stream_format: Literal["sse", "ndjson"] = Query(
+        default="sse",
+        alias="format",
+        description="Server-Sent Events or newline-delimited JSON.",
+    ),
+    x_user_id: UUID = Header(..., alias="X-User-Id"),
+    use_case: GenerateCaseDraftUseCase = Depends(get_generate_case_draft_use_case),
+) -> StreamingResponse:
+    """
+    Stream AI-assisted draft recommendations for a case.
+
+    The summary and each recommendation are sent as soon as the model has
+    produced them. The final "done" event carries the complete draft,
+    including used context and important notes.
+
+    The response starts once generation has a slot, so a saturated backend
+    is reported as 503 with Retry-After rather than as an error event.
+
+    The AI output is not final advice.
+    It must be reviewed by a human consultant.
+    """
+
+    try:
+        events = await use_case.stream(
+            query=case_query,
+            consultant_id=x_user_id,
+            n=n,
+        )
+
+    except Overloaded as exc:
+        raise _overloaded(exc) from exc
+
+    except ServiceUnavailable as exc:
+        raise HTTPException(status_code=503, detail=str(exc)) from exc
+
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    if stream_format == "ndjson":
+        return StreamingResponse(
+            _ndjson_events(events),
+            media_type="application/x-ndjson",
+        )
+
+    return StreamingResponse(
+        _sse_events(events),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post(
+    "/draft-recommendations:batch",
+    response_model=BatchDraftResult,
+    summary="Generate AI-assisted draft recommendations for several cases",
+    responses={
+        200: {
+            "content": {"application/x-ndjson": {}},
+            "description": "With stream=true, one BatchDraftItemResult per line as items complete.",
+        }
+    },
+)
+async def generate_draft_recommendations_batch(
+    batch: BatchDraftRequest,
+    n: Optional[int] = Query(
+        default=None,
+        ge=1,
+        le=5,
+        description="Number of draft recommendations to generate per case.",
+    ),
+    stream: bool = Query(
+        default=False,
+        description="Stream item results as NDJSON in completion order.",
+    ),
+    x_user_id: UUID = Header(..., alias="X-User-Id"),
+    use_case: GenerateCaseDraftBatchUseCase = Depends(
+        get_generate_case_draft_batch_use_case
+    ),
+):
+    """
+    Generate AI-assisted draft recommendations for several cases.
+
+    Results are returned in request order, each with either a result or an
+    error. Identical items are generated once. A batch shed because the
+    generation backend is saturated is rejected with 503 and Retry-After;
+    when streaming, only until the first item result has been sent.
+
+    The AI output is not final advice.
+    It must be reviewed by a human consultant.
+    """
+
+    try:
+        if stream:
+            results = use_case.execute_as_completed(
+                queries=batch.items,
+                consultant_id=x_user_id,
+                n=n,
+            )
+
+            # Wait for the first result so a shed batch still gets a 503.
+            first = await anext(results, None)
+
+            return StreamingResponse(
+                _ndjson_items(first, results),
+                media_type="application/x-ndjson",
+            )
+
+        return ModelJSONResponse(
+            BatchDraftResult(
+                results=await use_case.execute(
+                    queries=batch.items,
+                    consultant_id=x_user_id,
+                    n=n,
+                )
+            )
+        )
+
+    except Overloaded as exc:
+        raise _overloaded(exc) from exc
+
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+
+def _overloaded(exc: Overloaded) -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail=str(exc),
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+async def _ndjson_items(
+    first: BatchDraftItemResult | None,
+    items: AsyncIterator[BatchDraftItemResult],
+) -> AsyncIterator[str]:
+    if first is None:
+        return
+
+    yield first.model_dump_json() + "\n"
+
+    async for item in items:
+        yield item.model_dump_json() + "\n"
+
+
+async def _sse_events(events: AsyncIterator[DraftStreamEvent]) -> AsyncIterator[str]:
+    async for event in events:
+        data = event.model_dump_json(exclude_none=True)
+        yield f"event: {event.event}\ndata: {data}\n\n"
+
+
+async def _ndjson_events(events: AsyncIterator[DraftStreamEvent]) -> AsyncIterator[str]:
+    async for event in events:
+        yield event.model_dump_json(exclude_none=True) + "\n"
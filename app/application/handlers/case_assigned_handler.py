@@ -1,8 +1,14 @@
+import asyncio
 import logging
+import time
+from collections import OrderedDict
+from uuid import NAMESPACE_URL, uuid5
 
+from app.core.metrics import CASE_PREFETCH, DUPLICATE_EVENTS_SUPPRESSED
+from app.core.resilience import deadline
 from app.domain.events import CaseAssignedEvent, CaseDraftGeneratedEvent
-from app.domain.models import CaseQuery
-from app.domain.protocols import CaseServiceClient, EventPublisher
+from app.domain.models import AIDraft, CaseQuery, PreparedDraft
+from app.domain.protocols import CaseServiceClient, EventPublisher, ProcessedEventStore
 from app.application.use_cases.generate_case_draft import GenerateCaseDraftUseCase
 
 logger = logging.getLogger(__name__)
@@ -16,7 +22,26 @@ class CaseAssignedHandler:
     - fetches the case details
     - generates an AI draft
     - sends the draft back to the case/consultant workflow
-    - optionally publishes a draft-generated event
+    - optionally publishes a draft-generated event once the draft is stored
+
+    Stage timings are logged for every handled event. All outbound calls
+    made for one event share a deadline of deadline_seconds.
+
+    Duplicates: the same (case, consultant) pair can arrive several times
+    (broker redelivery, republishing upstream).
+    - a copy arriving while the pair is being handled waits for that run
+      instead of starting a second one
+    - a copy arriving after the pair was handled successfully is skipped
+      when processed_events still remembers it
+    A failed run is not remembered, so retries of it are handled normally.
+
+    Prefetch: the consumer calls prefetch for events that are still queued.
+    Fetching the case and retrieving its context then start right away, so
+    that when a worker picks the event up only generation is left. Events
+    processed_events already remembers are not prepared. At most
+    prefetch_depth events are prepared ahead, which bounds the memory held by
+    prepared contexts; further events wait their turn in arrival order.
+    0 disables prefetching.
     """
 
     def __init__(
@@ -24,12 +49,178 @@ class CaseAssignedHandler:
         case_client: CaseServiceClient,
         generate_case_draft_use_case: GenerateCaseDraftUseCase,
         publisher: EventPublisher | None = None,
+        deadline_seconds: float | None = None,
+        processed_events: ProcessedEventStore | None = None,
+        prefetch_depth: int = 0,
     ) -> None:
         self._case_client = case_client
         self._generate_case_draft_use_case = generate_case_draft_use_case
         self._publisher = publisher
+        self._deadline_seconds = deadline_seconds
+        self._processed_events = processed_events
+        self._prefetch_depth = prefetch_depth
+        self._in_flight: dict[str, asyncio.Task] = {}
+        self._prefetched: dict[str, asyncio.Task[PreparedDraft | None]] = {}
+        self._prefetch_waiting: OrderedDict[str, CaseAssignedEvent] = OrderedDict()
+
+    def prefetch(self, event: CaseAssignedEvent) -> None:
+        """
+        Start preparing a queued event in the background.
+        """
+
+        if self._prefetch_depth <= 0:
+            return
+
+        key = self._idempotency_key(event)
+
+        if key in self._prefetched or key in self._prefetch_waiting or key in self._in_flight:
+            return
+
+        self._prefetch_waiting[key] = event
+        self._start_prefetches()
 
     async def handle(self, event: CaseAssignedEvent) -> None:
+        key = self._idempotency_key(event)
+        prefetched = self._prefetched.pop(key, None)
+        self._prefetch_waiting.pop(key, None)
+        self._start_prefetches()
+
+        if key not in self._in_flight and await self._was_handled(key):
+            self._discard(prefetched)
+            DUPLICATE_EVENTS_SUPPRESSED.labels(reason="completed").inc()
+            logger.info(
+                "Skipping already handled CaseAssignedEvent case_id=%s consultant_id=%s",
+                event.case_id,
+                event.consultant_id,
+            )
+            return
+
+        task = self._in_flight.get(key)
+
+        if task is None:
+            task = asyncio.ensure_future(self._handle_once(event, key, prefetched))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self._discard(prefetched)
+            DUPLICATE_EVENTS_SUPPRESSED.labels(reason="in_flight").inc()
+            logger.info(
+                "Coalescing duplicate CaseAssignedEvent case_id=%s consultant_id=%s",
+                event.case_id,
+                event.consultant_id,
+            )
+
+        # A shared run is not cancelled when one of its callers goes away.
+        await asyncio.shield(task)
+
+    async def _was_handled(self, key: str) -> bool:
+        if self._processed_events is None:
+            return False
+
+        try:
+            return await self._processed_events.contains(key)
+        except Exception:
+            logger.exception("Failed to look up handled CaseAssignedEvent key=%s", key)
+            return False
+
+    async def _handle_once(
+        self,
+        event: CaseAssignedEvent,
+        key: str,
+        prefetched: asyncio.Task[PreparedDraft | None] | None,
+    ) -> None:
+        with deadline(self._deadline_seconds):
+            await self._handle(event, prefetched)
+
+        if self._processed_events is not None:
+            try:
+                await self._processed_events.add(key)
+            except Exception:
+                logger.exception(
+                    "Failed to record handled CaseAssignedEvent case_id=%s",
+                    event.case_id,
+                )
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+
+        # Mark the exception as retrieved when every caller went away.
+        _retrieve_exception(task)
+
+    def _start_prefetches(self) -> None:
+        while self._prefetch_waiting and len(self._prefetched) < self._prefetch_depth:
+            key, event = self._prefetch_waiting.popitem(last=False)
+
+            task = asyncio.ensure_future(self._prefetch(event, key))
+            task.add_done_callback(_retrieve_exception)
+            self._prefetched[key] = task
+
+            CASE_PREFETCH.labels(result="started").inc()
+
+    async def _prefetch(self, event: CaseAssignedEvent, key: str) -> PreparedDraft | None:
+        # A duplicate of a handled event is skipped by handle; do not spend a
+        # Case Service call and a similarity search on it.
+        if await self._was_handled(key):
+            CASE_PREFETCH.labels(result="skipped").inc()
+            return None
+
+        with deadline(self._deadline_seconds):
+            return await self._prepare(event)
+
+    def _discard(self, prefetched: asyncio.Task[PreparedDraft | None] | None) -> None:
+        if prefetched is not None:
+            prefetched.cancel()
+            CASE_PREFETCH.labels(result="discarded").inc()
+
+    async def _handle(
+        self,
+        event: CaseAssignedEvent,
+        prefetched: asyncio.Task[PreparedDraft | None] | None = None,
+    ) -> None:
+        timings: dict[str, float] = {}
+
+        started = time.perf_counter()
+
+        prepared = None
+
+        if prefetched is not None:
+            prepared = await prefetched
+            timings["prefetch_wait"] = time.perf_counter() - started
+
+        if prepared is None:
+            # Not prefetched, or skipped as handled although handle did not
+            # find it handled (the entry expired in between).
+            started = time.perf_counter()
+            prepared = await self._prepare(event)
+            timings["prepare"] = time.perf_counter() - started
+        else:
+            CASE_PREFETCH.labels(result="used").inc()
+
+        started = time.perf_counter()
+        result = await self._generate_case_draft_use_case.generate(
+            prepared,
+            n=3,
+            priority="event",
+        )
+        timings["generate"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        await self._deliver(event, result.draft)
+        timings["deliver"] = time.perf_counter() - started
+
+        logger.info(
+            "AI draft generated for case_id=%s and consultant_id=%s (%s)",
+            event.case_id,
+            event.consultant_id,
+            ", ".join(f"{stage}={seconds * 1000:.0f}ms" for stage, seconds in timings.items()),
+        )
+
+    async def _prepare(self, event: CaseAssignedEvent) -> PreparedDraft:
+        """
+        Fetch the case and retrieve its context.
+        """
+
         case_data = await self._case_client.get_case(event.case_id)
 
         case_text = self._extract_case_text(case_data)
@@ -44,31 +235,63 @@ class CaseAssignedHandler:
             prompt_version=case_data.get("prompt_version"),
         )
 
-        result = await self._generate_case_draft_use_case.execute(
+        return await self._generate_case_draft_use_case.prepare(
             query=query,
             consultant_id=event.consultant_id,
-            n=3,
         )
 
+    async def _deliver(self, event: CaseAssignedEvent, draft: AIDraft) -> None:
+        """
+        Post the draft back, then publish the draft-generated event.
+
+        The Case Service is the source of truth for drafts, so the event is
+        only published once the draft has been stored:
+        - if posting the draft fails, the error is raised so the message is
+          retried; nothing has been published yet
+        - if only publishing the event fails, the error is logged and the
+          message is still handled, because regenerating the draft would not
+          fix a notification failure
+
+        A message retried after both succeeded (for example when the ack is
+        lost) posts the draft again, which the Case Service ignores through
+        the idempotency key, and publishes the event again. The event carries
+        the same idempotency key, so its consumers can drop the duplicate.
+        """
+
+        idempotency_key = self._idempotency_key(event)
+
         await self._case_client.add_ai_draft(
             case_id=event.case_id,
-            draft=result.draft,
+            draft=draft,
+            idempotency_key=idempotency_key,
         )
 
-        if self._publisher is not None:
+        if self._publisher is None:
+            return
+
+        try:
             await self._publisher.publish_case_draft_generated(
                 CaseDraftGeneratedEvent(
                     case_id=event.case_id,
                     consultant_id=event.consultant_id,
-                    recommendations=result.draft.recommendations,
+                    recommendations=draft.recommendations,
+                    idempotency_key=idempotency_key,
                 )
             )
+        except Exception as exc:
+            logger.error(
+                "Failed to publish CaseDraftGeneratedEvent for case_id=%s: %s",
+                event.case_id,
+                exc,
+            )
 
-        logger.info(
-            "AI draft generated for case_id=%s and consultant_id=%s",
-            event.case_id,
-            event.consultant_id,
-        )
+    def _idempotency_key(self, event: CaseAssignedEvent) -> str:
+        """
+        The same assignment always maps to the same key, so a redelivered
+        event does not add a second draft to the case.
+        """
+
+        return str(uuid5(NAMESPACE_URL, f"case-assigned/{event.case_id}/{event.consultant_id}"))
 
     def _extract_case_text(self, case_data: dict) -> str:
         case_text = (
@@ -80,4 +303,9 @@ class CaseAssignedHandler:
         if not case_text:
             raise ValueError("Case data does not contain a valid case description")
 
-        return case_text
\ No newline at end of file
+        return case_text
+
+
+def _retrieve_exception(task: asyncio.Task) -> None:
+    if not task.cancelled():
+        task.exception()
@@ -0,0 +1,258 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, get_args
+
+from app.core.exceptions import Overloaded
+from app.core.metrics import (
+    SCHEDULER_QUEUE_DEPTH,
+    SCHEDULER_REJECTIONS,
+    SCHEDULER_RUNNING,
+    SCHEDULER_WAIT,
+)
+from app.domain.models import GenerationPriority
+
+PRIORITIES: tuple[GenerationPriority, ...] = get_args(GenerationPriority)
+
+DEFAULT_WEIGHTS: dict[str, float] = {
+    "interactive": 8.0,
+    "event": 3.0,
+    "batch": 1.0,
+}
+
+
+class PriorityScheduler:
+    """
+    Admits generations from the interactive, event and batch classes into a
+    number of slots.
+
+    - weighted fair queuing: while classes are waiting, slots are handed out
+      in proportion to their weights (a waiting interactive request with
+      weight 8 gets eight slots for every batch slot)
+    - reserved capacity: event and batch generations may only use
+      capacity - reserved_interactive slots (at least one), so interactive
+      requests never wait behind a full backlog of background work
+
+    capacity is either fixed or a callable read on every dispatch, such as
+    the current limit of the generation concurrency limiter. With the
+    latter, generations never wait in the limiter, so the scheduler alone
+    decides their order.
+
+    Waiting is FIFO within a class. With max_queue, a caller arriving at a
+    full queue takes the place of the newest waiter of a lower class, which
+    is shed with Overloaded, or is shed itself if there is none; with
+    queue_timeout, a caller still waiting after that many seconds is shed.
+    is_saturated() turns on when the queue is half full and off when it is
+    empty again, like the limiter's.
+    """
+
+    def __init__(
+        self,
+        capacity: int | Callable[[], int],
+        reserved_interactive: int = 0,
+        weights: dict[str, float] | None = None,
+        max_queue: int | None = None,
+        queue_timeout: float | None = None,
+        retry_after: Callable[[int], int] | None = None,
+    ) -> None:
+        if isinstance(capacity, int):
+            if capacity < 1:
+                raise ValueError("capacity must be at least 1")
+
+            if not 0 <= reserved_interactive < capacity:
+                raise ValueError("reserved_interactive must be between 0 and capacity - 1")
+
+        elif reserved_interactive < 0:
+            raise ValueError("reserved_interactive must not be negative")
+
+        weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+
+        if any(weights[priority] <= 0 for priority in PRIORITIES):
+            raise ValueError("Scheduler weights must be positive")
+
+        self._capacity = capacity
+        self._reserved_interactive = reserved_interactive
+        self._weights = weights
+        self._max_queue = max_queue
+        self._queue_timeout = queue_timeout
+        self._retry_after = retry_after
+        self._saturated = False
+
+        self._running: dict[str, int] = {priority: 0 for priority in PRIORITIES}
+        self._queues: dict[str, deque[tuple[float, asyncio.Future]]] = {
+            priority: deque() for priority in PRIORITIES
+        }
+        self._last_tag: dict[str, float] = {priority: 0.0 for priority in PRIORITIES}
+        self._virtual_time = 0.0
+
+    @asynccontextmanager
+    async def slot(self, priority: GenerationPriority) -> AsyncIterator[None]:
+        """
+        Hold one generation slot for the given priority class.
+        """
+
+        if priority not in self._queues:
+            raise ValueError(f"Unknown generation priority: {priority}")
+
+        await self._acquire(priority)
+
+        try:
+            yield
+        finally:
+            self._release(priority)
+
+    @property
+    def capacity(self) -> int:
+        if callable(self._capacity):
+            return max(self._capacity(), 1)
+
+        return self._capacity
+
+    def is_saturated(self) -> bool:
+        return self._saturated
+
+    def stats(self) -> dict:
+        return {
+            "capacity": self.capacity,
+            "reserved_interactive": self._reserved_interactive,
+            "max_queue": self._max_queue,
+            "saturated": self._saturated,
+            "classes": {
+                priority: {
+                    "weight": self._weights[priority],
+                    "running": self._running[priority],
+                    "queued": len(self._queues[priority]),
+                }
+                for priority in PRIORITIES
+            },
+        }
+
+    async def _acquire(self, priority: str) -> None:
+        started = time.perf_counter()
+
+        # Weighted fair queuing: each waiter is tagged with a virtual finish
+        # time that advances by 1/weight per request of its class.
+        tag = max(self._virtual_time, self._last_tag[priority]) + 1 / self._weights[priority]
+        self._last_tag[priority] = tag
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._queues[priority].append((tag, waiter))
+        self._dispatch()
+
+        if not waiter.done() and self._queue_full():
+            self._shed_for(priority, waiter)
+
+        try:
+            await asyncio.wait_for(waiter, timeout=self._queue_timeout)
+
+        except asyncio.TimeoutError:
+            self._remove(priority, waiter)
+            SCHEDULER_REJECTIONS.labels(priority=priority, reason="queue_timeout").inc()
+            raise self._overloaded(
+                f"No generation slot became free within {self._queue_timeout}s"
+            ) from None
+
+        except asyncio.CancelledError:
+            # A shed waiter holds an exception, not a slot.
+            if waiter.done() and not waiter.cancelled() and waiter.exception() is None:
+                self._release(priority)
+            else:
+                self._remove(priority, waiter)
+
+            raise
+
+        SCHEDULER_WAIT.labels(priority=priority).observe(time.perf_counter() - started)
+
+    def _release(self, priority: str) -> None:
+        self._running[priority] -= 1
+        SCHEDULER_RUNNING.labels(priority=priority).set(self._running[priority])
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        while True:
+            eligible = [
+                priority
+                for priority in PRIORITIES
+                if self._queues[priority] and self._has_capacity(priority)
+            ]
+
+            if not eligible:
+                break
+
+            priority = min(eligible, key=lambda name: self._queues[name][0][0])
+            tag, waiter = self._queues[priority].popleft()
+
+            if waiter.done():
+                continue
+
+            self._virtual_time = tag
+            self._running[priority] += 1
+            SCHEDULER_RUNNING.labels(priority=priority).set(self._running[priority])
+            waiter.set_result(None)
+
+        self._on_queue_changed()
+
+    def _has_capacity(self, priority: str) -> bool:
+        running = sum(self._running.values())
+        capacity = self.capacity
+
+        if priority == "interactive":
+            return running < capacity
+
+        # A capacity that follows the limiter can drop to the reservation;
+        # background work keeps one slot rather than stalling.
+        return running < max(capacity - self._reserved_interactive, 1)
+
+    def _queue_full(self) -> bool:
+        if self._max_queue is None:
+            return False
+
+        return sum(len(queue) for queue in self._queues.values()) > self._max_queue
+
+    def _shed_for(self, priority: str, waiter: asyncio.Future) -> None:
+        # The newest waiter of the lowest class below the caller makes room;
+        # without one, the caller itself (the newest of its class) is shed.
+        victim_priority = priority
+
+        for lower in reversed(PRIORITIES[PRIORITIES.index(priority) + 1:]):
+            if self._queues[lower]:
+                victim_priority = lower
+                break
+
+        _, victim = self._queues[victim_priority].pop()
+
+        SCHEDULER_REJECTIONS.labels(priority=victim_priority, reason="queue_full").inc()
+        victim.set_exception(self._overloaded("Generation capacity exhausted, try again later"))
+        self._on_queue_changed()
+
+    def _overloaded(self, message: str) -> Overloaded:
+        queued = sum(len(queue) for queue in self._queues.values())
+        retry_after = self._retry_after(queued) if self._retry_after else 1
+
+        return Overloaded(message, retry_after=retry_after)
+
+    def _remove(self, priority: str, waiter: asyncio.Future) -> None:
+        queue = self._queues[priority]
+
+        for entry in queue:
+            if entry[1] is waiter:
+                queue.remove(entry)
+                break
+
+        self._on_queue_changed()
+
+    def _on_queue_changed(self) -> None:
+        queued = 0
+
+        for priority in PRIORITIES:
+            queued += len(self._queues[priority])
+            SCHEDULER_QUEUE_DEPTH.labels(priority=priority).set(len(self._queues[priority]))
+
+        if self._max_queue is None:
+            return
+
+        if queued >= max(1, self._max_queue // 2):
+            self._saturated = True
+        elif queued == 0:
+            self._saturated = False
@@ -1,15 +1,27 @@
 import logging
+from contextlib import nullcontext
+from typing import AsyncIterator
 from uuid import UUID
 
-from app.core.exceptions import ServiceUnavailable
+from app.application.priority_scheduler import PriorityScheduler
+from app.core.exceptions import Overloaded, ServiceUnavailable
+from app.core.metrics import GENERATIONS_IN_FLIGHT, stage_timer
 from app.domain.models import (
     AIDraft,
     CaseQuery,
+    DraftStreamEvent,
+    GenerationPriority,
+    PackedContexts,
+    PreparedDraft,
     RetrievedContext,
     SolveCaseResult,
     UsedContext,
 )
-from app.domain.protocols import GenerationModel, SimilaritySearchClient
+from app.domain.protocols import (
+    ContextPacker,
+    GenerationModel,
+    SimilaritySearchClient,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -21,9 +33,15 @@ class GenerateCaseDraftUseCase:
 
     It orchestrates:
     - retrieval from the Embedding Service
-    - generation through a replaceable generation model
+    - packing the retrieved context into the prompt budget
+    - generation through a replaceable generation model, admitted by the
+      priority scheduler when one is configured
     - formatting the result for the consultant
 
+    Retrieval and packing (prepare) are separate from generation (generate),
+    so callers can prepare the next cases while earlier ones are generating.
+    execute runs both.
+
     It does not make final decisions.
     """
 
@@ -32,25 +50,171 @@ class GenerateCaseDraftUseCase:
         similarity_search_client: SimilaritySearchClient,
         generation_model: GenerationModel,
         default_suggestion_count: int = 3,
+        context_packer: ContextPacker | None = None,
+        scheduler: PriorityScheduler | None = None,
     ) -> None:
         self._similarity_search_client = similarity_search_client
         self._generation_model = generation_model
         self._default_suggestion_count = default_suggestion_count
+        self._context_packer = context_packer
+        self._scheduler = scheduler
 
     async def execute(
         self,
         query: CaseQuery,
         consultant_id: UUID,
         n: int | None = None,
+        priority: GenerationPriority = "interactive",
+    ) -> SolveCaseResult:
+        prepared = await self.prepare(query, consultant_id)
+
+        return await self.generate(prepared, n=n, priority=priority)
+
+    async def prepare(
+        self,
+        query: CaseQuery,
+        consultant_id: UUID,
+    ) -> PreparedDraft:
+        """
+        Retrieve and pack the context for a case.
+
+        Retrieval failures are raised as ServiceUnavailable.
+        """
+
+        contexts = await self._retrieve(query, consultant_id)
+
+        return PreparedDraft(
+            query=query,
+            consultant_id=consultant_id,
+            contexts=contexts,
+            packed=self._pack(query, contexts),
+        )
+
+    async def generate(
+        self,
+        prepared: PreparedDraft,
+        n: int | None = None,
+        priority: GenerationPriority = "interactive",
     ) -> SolveCaseResult:
         suggestion_count = n or self._default_suggestion_count
+        query = prepared.query
 
         try:
-            contexts = await self._similarity_search_client.search(
-                query=query,
-                consultant_id=consultant_id,
+            async with self._slot(priority):
+                with GENERATIONS_IN_FLIGHT.track_inprogress():
+                    draft = await self._generation_model.generate_draft(
+                        query=query,
+                        contexts=prepared.packed.selected,
+                        n=suggestion_count,
+                    )
+
+            draft = self._attach_used_context(draft, prepared.contexts, prepared.packed)
+
+            logger.info(
+                "Generated AI draft with %s recommendations",
+                len(draft.recommendations),
             )
 
+        except Overloaded:
+            logger.warning("Draft generation shed: generation backend is saturated")
+            raise
+
+        except Exception as exc:
+            logger.exception("Draft generation failed")
+            raise ServiceUnavailable(f"Draft generation failed: {exc}") from exc
+
+        return SolveCaseResult(
+            case_id=query.case_id,
+            draft=draft,
+        )
+
+    async def stream(
+        self,
+        query: CaseQuery,
+        consultant_id: UUID,
+        n: int | None = None,
+    ) -> AsyncIterator[DraftStreamEvent]:
+        """
+        Retrieve context and start generation, then return an iterator of
+        incremental draft events.
+
+        This method returns once the first event is ready, so retrieval
+        failures (ServiceUnavailable) and a generation shed because the
+        backend is saturated (Overloaded) are raised before any event is
+        sent. Generation failures after that point are emitted as an error
+        event.
+        """
+
+        suggestion_count = n or self._default_suggestion_count
+
+        prepared = await self.prepare(query, consultant_id)
+
+        events = self._stream_events(prepared, suggestion_count)
+
+        # Waiting for the first event takes the scheduler and limiter slots
+        # here rather than after the caller has started its response.
+        first = await anext(events, None)
+
+        return _prepend(first, events)
+
+    async def _stream_events(
+        self,
+        prepared: PreparedDraft,
+        n: int,
+    ) -> AsyncIterator[DraftStreamEvent]:
+        try:
+            async with self._slot("interactive"):
+                with GENERATIONS_IN_FLIGHT.track_inprogress():
+                    async for event in self._generation_model.stream_draft(
+                        query=prepared.query,
+                        contexts=prepared.packed.selected,
+                        n=n,
+                    ):
+                        if event.event == "done" and event.draft is not None:
+                            draft = self._attach_used_context(
+                                event.draft,
+                                prepared.contexts,
+                                prepared.packed,
+                            )
+
+                            logger.info(
+                                "Streamed AI draft with %s recommendations",
+                                len(draft.recommendations),
+                            )
+
+                            yield DraftStreamEvent(event="done", draft=draft)
+                        else:
+                            yield event
+
+        except Overloaded:
+            logger.warning("Streamed draft generation shed: generation backend is saturated")
+            raise
+
+        except Exception as exc:
+            logger.exception("Streamed draft generation failed")
+            yield DraftStreamEvent(
+                event="error",
+                detail=f"Draft generation failed: {exc}",
+            )
+
+    def _slot(self, priority: GenerationPriority):
+        if self._scheduler is None:
+            return nullcontext()
+
+        return self._scheduler.slot(priority)
+
+    async def _retrieve(
+        self,
+        query: CaseQuery,
+        consultant_id: UUID,
+    ) -> list[RetrievedContext]:
+        try:
+            with stage_timer("similarity_search"):
+                contexts = await self._similarity_search_client.search(
+                    query=query,
+                    consultant_id=consultant_id,
+                )
+
             logger.info(
                 "Retrieved %s context chunks for consultant_id=%s",
                 len(contexts),
@@ -61,33 +225,40 @@ class GenerateCaseDraftUseCase:
             logger.exception("Similarity search failed")
             raise ServiceUnavailable(f"Similarity search failed: {exc}") from exc
 
-        try:
-            draft = await self._generation_model.generate_draft(
-                query=query,
-                contexts=contexts,
-                n=suggestion_count,
+        return contexts
+
+    def _pack(
+        self,
+        query: CaseQuery,
+        contexts: list[RetrievedContext],
+    ) -> PackedContexts:
+        if self._context_packer is None:
+            return PackedContexts(
+                selected=contexts,
+                statuses={context.id: "included" for context in contexts},
             )
 
-            draft = self._attach_used_context(draft, contexts)
+        packed = self._context_packer.pack(query=query, contexts=contexts)
 
+        dropped = len(contexts) - len(packed.selected)
+        truncated = sum(1 for status in packed.statuses.values() if status == "truncated")
+
+        if dropped or truncated:
             logger.info(
-                "Generated AI draft with %s recommendations",
-                len(draft.recommendations),
+                "Packed %s of %s context chunks (%s truncated, %s dropped)",
+                len(packed.selected),
+                len(contexts),
+                truncated,
+                dropped,
             )
 
-        except Exception as exc:
-            logger.exception("Draft generation failed")
-            raise ServiceUnavailable(f"Draft generation failed: {exc}") from exc
-
-        return SolveCaseResult(
-            case_id=query.case_id,
-            draft=draft,
-        )
+        return packed
 
     def _attach_used_context(
         self,
         draft: AIDraft,
         contexts: list[RetrievedContext],
+        packed: PackedContexts,
     ) -> AIDraft:
         used_context = [
             UsedContext(
@@ -96,6 +267,7 @@ class GenerateCaseDraftUseCase:
                 pdf_id=context.pdf_id,
                 similarity=context.similarity,
                 text_preview=self._preview(context.raw_text),
+                status=packed.statuses.get(context.id, "included"),
             )
             for context in contexts
         ]
@@ -122,4 +294,17 @@ class GenerateCaseDraftUseCase:
         if len(cleaned) <= max_length:
             return cleaned
 
-        return cleaned[:max_length].rstrip() + "..."
\ No newline at end of file
+        return cleaned[:max_length].rstrip() + "..."
+
+
+async def _prepend(
+    first: DraftStreamEvent | None,
+    events: AsyncIterator[DraftStreamEvent],
+) -> AsyncIterator[DraftStreamEvent]:
+    if first is None:
+        return
+
+    yield first
+
+    async for event in events:
+        yield event
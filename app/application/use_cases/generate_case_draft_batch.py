@@ -0,0 +1,141 @@
+import asyncio
+import logging
+from typing import AsyncIterator
+from uuid import UUID
+
+from app.application.use_cases.generate_case_draft import GenerateCaseDraftUseCase
+from app.core.exceptions import Overloaded, ServiceUnavailable
+from app.domain.models import BatchDraftItemResult, CaseQuery, SolveCaseResult
+
+logger = logging.getLogger(__name__)
+
+
+class GenerateCaseDraftBatchUseCase:
+    """
+    Application use case responsible for generating drafts for several cases
+    in one call.
+
+    It:
+    - runs GenerateCaseDraftUseCase for each item with bounded concurrency
+    - generates identical queries only once
+    - reports failures per item instead of failing the whole batch, except
+      for shedding: a batch whose item is shed with Overloaded is rejected
+      as a whole, so the caller can retry it after Retry-After
+    """
+
+    def __init__(
+        self,
+        generate_case_draft_use_case: GenerateCaseDraftUseCase,
+        max_concurrency: int = 4,
+        max_items: int = 50,
+    ) -> None:
+        self._generate_case_draft_use_case = generate_case_draft_use_case
+        self._max_concurrency = max_concurrency
+        self._max_items = max_items
+
+    async def execute(
+        self,
+        queries: list[CaseQuery],
+        consultant_id: UUID,
+        n: int | None = None,
+    ) -> list[BatchDraftItemResult]:
+        self._validate(queries)
+
+        results = [
+            item
+            async for item in self._run(queries, consultant_id, n, partial=False)
+        ]
+
+        return sorted(results, key=lambda item: item.index)
+
+    def execute_as_completed(
+        self,
+        queries: list[CaseQuery],
+        consultant_id: UUID,
+        n: int | None = None,
+    ) -> AsyncIterator[BatchDraftItemResult]:
+        """
+        Return an iterator yielding item results as they complete.
+
+        The batch is validated before this method returns, so an oversized
+        batch is rejected before any result is produced. Overloaded is raised
+        only if an item is shed before the first result; items shed after
+        that are reported per item, since results have already been sent.
+        """
+
+        self._validate(queries)
+
+        return self._run(queries, consultant_id, n, partial=True)
+
+    def _validate(self, queries: list[CaseQuery]) -> None:
+        if len(queries) > self._max_items:
+            raise ValueError(
+                f"Batch contains {len(queries)} items, the maximum is {self._max_items}"
+            )
+
+    async def _run(
+        self,
+        queries: list[CaseQuery],
+        consultant_id: UUID,
+        n: int | None,
+        partial: bool,
+    ) -> AsyncIterator[BatchDraftItemResult]:
+        semaphore = asyncio.Semaphore(self._max_concurrency)
+
+        indexes_by_key: dict[str, list[int]] = {}
+        unique_queries: dict[str, CaseQuery] = {}
+
+        for index, query in enumerate(queries):
+            key = query.model_dump_json()
+            indexes_by_key.setdefault(key, []).append(index)
+            unique_queries.setdefault(key, query)
+
+        logger.info(
+            "Generating batch of %s drafts (%s unique) for consultant_id=%s",
+            len(queries),
+            len(unique_queries),
+            consultant_id,
+        )
+
+        async def run(
+            key: str,
+        ) -> tuple[str, SolveCaseResult | None, str | None, Overloaded | None]:
+            async with semaphore:
+                try:
+                    result = await self._generate_case_draft_use_case.execute(
+                        query=unique_queries[key],
+                        consultant_id=consultant_id,
+                        n=n,
+                        priority="batch",
+                    )
+                    return key, result, None, None
+
+                except Overloaded as exc:
+                    return key, None, str(exc), exc
+
+                except (ServiceUnavailable, ValueError) as exc:
+                    return key, None, str(exc), None
+
+                except Exception:
+                    logger.exception("Unexpected error while generating batch draft")
+                    return key, None, "Internal server error", None
+
+        tasks = [asyncio.create_task(run(key)) for key in unique_queries]
+
+        sent = False
+
+        try:
+            for completed in asyncio.as_completed(tasks):
+                key, result, error, shed = await completed
+
+                if shed is not None and not (partial and sent):
+                    raise shed
+
+                sent = True
+
+                for index in indexes_by_key[key]:
+                    yield BatchDraftItemResult(index=index, result=result, error=error)
+
+        finally:
+            for task in tasks:
+                task.cancel()
@@ -0,0 +1,653 @@
+import asyncio
+import logging
+import os
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+from aiormq import AMQPConnectionError
+from fastapi import FastAPI
+from prometheus_client import multiprocess
+
+from app.application.handlers.case_assigned_handler import CaseAssignedHandler
+from app.application.priority_scheduler import PriorityScheduler
+from app.application.use_cases.generate_case_draft import GenerateCaseDraftUseCase
+from app.application.use_cases.generate_case_draft_batch import (
+    GenerateCaseDraftBatchUseCase,
+)
+from app.core.config import Settings, get_settings
+from app.core.metrics import RETRIES
+from app.core.offload import CpuOffloader, EventLoopLagMonitor
+from app.core.resilience import NO_RETRY, RetryPolicy
+from app.infrastructure.cache.backends import (
+    CacheBackend,
+    MemoryCacheBackend,
+    SqliteCacheBackend,
+)
+from app.infrastructure.cache.processed_events import CacheProcessedEventStore
+from app.infrastructure.clients.caching_similarity_search_client import (
+    CachingSimilaritySearchClient,
+)
+from app.infrastructure.clients.case_service_client import HttpxCaseServiceClient
+from app.infrastructure.clients.embedding_service_client import EmbeddingServiceClient
+from app.infrastructure.generation.adaptive_concurrency_limiter import (
+    AdaptiveConcurrencyLimiter,
+)
+from app.infrastructure.generation.concurrency_limited_generation_model import (
+    ConcurrencyLimitedGenerationModel,
+)
+from app.infrastructure.generation.mock_generation_model import MockGenerationModel
+from app.infrastructure.generation.openai_compatible_generation_model import (
+    OpenAICompatibleGenerationModel,
+)
+from app.infrastructure.generation.routed_generation_model import (
+    GenerationBackend,
+    RoutedGenerationModel,
+)
+from app.infrastructure.http_transport import HttpTransportRegistry
+from app.infrastructure.prompts.consultant_prompt_builder import ConsultantPromptBuilder
+from app.infrastructure.prompts.context_packer import TokenBudgetContextPacker
+from app.infrastructure.prompts.template_registry import (
+    BUILTIN_TEMPLATES_DIR,
+    PromptTemplateRegistry,
+)
+from app.infrastructure.rabbitmq_adapter import (
+    AioPikaEventPublisher,
+    start_case_assigned_consumer,
+)
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+)
+
+logger = logging.getLogger(__name__)
+
+
+def build_generation_cache(settings) -> CacheBackend | None:
+    backend = settings.GENERATION_CACHE_BACKEND.lower()
+
+    if backend == "none":
+        return None
+
+    if backend == "memory":
+        logger.info("Using in-memory generation cache")
+        return MemoryCacheBackend(
+            max_entries=settings.GENERATION_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.GENERATION_CACHE_TTL_SECONDS,
+        )
+
+    if backend == "sqlite":
+        logger.info("Using SQLite generation cache: %s", settings.GENERATION_CACHE_PATH)
+        return SqliteCacheBackend(
+            path=settings.GENERATION_CACHE_PATH,
+            max_entries=settings.GENERATION_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.GENERATION_CACHE_TTL_SECONDS,
+        )
+
+    raise ValueError(
+        f"Unsupported GENERATION_CACHE_BACKEND: {settings.GENERATION_CACHE_BACKEND}"
+    )
+
+
+def build_processed_event_store(settings) -> CacheProcessedEventStore | None:
+    backend = settings.CASE_ASSIGNED_DEDUP_BACKEND.lower()
+
+    if backend == "none":
+        return None
+
+    if backend == "memory":
+        logger.info("Using in-memory CaseAssigned deduplication")
+        return CacheProcessedEventStore(
+            MemoryCacheBackend(
+                max_entries=settings.CASE_ASSIGNED_DEDUP_MAX_ENTRIES,
+                ttl_seconds=settings.CASE_ASSIGNED_DEDUP_TTL_SECONDS,
+            )
+        )
+
+    if backend == "sqlite":
+        logger.info(
+            "Using SQLite CaseAssigned deduplication: %s",
+            settings.CASE_ASSIGNED_DEDUP_PATH,
+        )
+        return CacheProcessedEventStore(
+            SqliteCacheBackend(
+                path=settings.CASE_ASSIGNED_DEDUP_PATH,
+                max_entries=settings.CASE_ASSIGNED_DEDUP_MAX_ENTRIES,
+                ttl_seconds=settings.CASE_ASSIGNED_DEDUP_TTL_SECONDS,
+            )
+        )
+
+    raise ValueError(
+        f"Unsupported CASE_ASSIGNED_DEDUP_BACKEND: {settings.CASE_ASSIGNED_DEDUP_BACKEND}"
+    )
+
+
+def build_generation_model(
+    settings,
+    transports: HttpTransportRegistry,
+    response_cache: CacheBackend | None = None,
+    cpu_offloader: CpuOffloader | None = None,
+    prompt_builder: ConsultantPromptBuilder | None = None,
+):
+    provider = settings.AI_PROVIDER.lower()
+
+    if provider == "mock":
+        logger.info("Using MockGenerationModel")
+        return MockGenerationModel()
+
+    if provider == "openai_compatible":
+        logger.info(
+            "Using OpenAI-compatible generation model: %s",
+            settings.LLM_MODEL_NAME,
+        )
+
+        return build_openai_compatible_model(
+            settings,
+            base_url=settings.LLM_API_BASE,
+            model_name=settings.LLM_MODEL_NAME,
+            api_key=settings.LLM_API_KEY,
+            http_client=transports.get_client(
+                "llm",
+                timeout=settings.REQUEST_TIMEOUT,
+            ),
+            response_cache=response_cache,
+            retry_policy=build_retry_policy(settings),
+            cpu_offloader=cpu_offloader,
+            prompt_builder=prompt_builder,
+            response_format=settings.LLM_RESPONSE_FORMAT,
+        )
+
+    if provider == "router":
+        if not settings.LLM_BACKENDS:
+            raise ValueError("AI_PROVIDER=router requires LLM_BACKENDS")
+
+        logger.info(
+            "Using generation router over backends: %s",
+            ", ".join(backend.name for backend in settings.LLM_BACKENDS),
+        )
+
+        return RoutedGenerationModel(
+            backends=[
+                GenerationBackend(
+                    name=backend.name,
+                    weight=backend.weight,
+                    model=build_openai_compatible_model(
+                        settings,
+                        base_url=backend.base_url,
+                        model_name=backend.model_name,
+                        api_key=backend.api_key,
+                        http_client=transports.get_client(
+                            f"llm:{backend.name}",
+                            timeout=settings.REQUEST_TIMEOUT,
+                        ),
+                        response_cache=response_cache,
+                        # The router fails over to another backend instead.
+                        retry_policy=NO_RETRY,
+                        cpu_offloader=cpu_offloader,
+                        prompt_builder=prompt_builder,
+                        response_format=backend.response_format or settings.LLM_RESPONSE_FORMAT,
+                    ),
+                )
+                for backend in settings.LLM_BACKENDS
+            ],
+            hedge_enabled=settings.LLM_HEDGE_ENABLED,
+            hedge_delay=settings.LLM_HEDGE_DELAY_SECONDS,
+            failure_threshold=settings.LLM_CIRCUIT_FAILURE_THRESHOLD,
+            reset_timeout=settings.LLM_CIRCUIT_RESET_SECONDS,
+        )
+
+    raise ValueError(f"Unsupported AI_PROVIDER: {settings.AI_PROVIDER}")
+
+
+def build_openai_compatible_model(
+    settings,
+    base_url: str,
+    model_name: str,
+    api_key: str | None,
+    http_client,
+    response_cache: CacheBackend | None,
+    retry_policy: RetryPolicy,
+    cpu_offloader: CpuOffloader | None = None,
+    prompt_builder: ConsultantPromptBuilder | None = None,
+    response_format: str = "json_object",
+) -> OpenAICompatibleGenerationModel:
+    return OpenAICompatibleGenerationModel(
+        base_url=base_url,
+        model_name=model_name,
+        api_key=api_key,
+        timeout=settings.REQUEST_TIMEOUT,
+        temperature=settings.LLM_TEMPERATURE,
+        max_tokens=settings.LLM_MAX_TOKENS,
+        prompt_builder=prompt_builder,
+        http_client=http_client,
+        response_cache=response_cache,
+        retry_policy=retry_policy,
+        cpu_offloader=cpu_offloader,
+        response_format=response_format.lower(),
+    )
+
+
+def build_cpu_offloader(settings) -> CpuOffloader:
+    offloader = CpuOffloader(
+        mode=settings.CPU_OFFLOAD_MODE.lower(),
+        max_workers=settings.CPU_OFFLOAD_MAX_WORKERS or None,
+        min_size=settings.CPU_OFFLOAD_MIN_CHARS,
+    )
+
+    logger.info(
+        "CPU offload mode=%s for inputs of at least %s characters",
+        settings.CPU_OFFLOAD_MODE,
+        settings.CPU_OFFLOAD_MIN_CHARS,
+    )
+
+    return offloader
+
+
+def build_prompt_registry(settings) -> PromptTemplateRegistry:
+    directories = [BUILTIN_TEMPLATES_DIR]
+
+    if settings.PROMPT_TEMPLATES_DIR:
+        directories.append(Path(settings.PROMPT_TEMPLATES_DIR))
+
+    return PromptTemplateRegistry(
+        directories=directories,
+        default_version=settings.PROMPT_DEFAULT_VERSION,
+    )
+
+
+def build_retry_policy(settings) -> RetryPolicy:
+    return RetryPolicy(
+        max_attempts=settings.OUTBOUND_RETRY_ATTEMPTS,
+        base_delay=settings.OUTBOUND_RETRY_BASE_DELAY,
+        max_delay=settings.OUTBOUND_RETRY_MAX_DELAY,
+    )
+
+
+def build_generation_limiter(settings) -> AdaptiveConcurrencyLimiter | None:
+    if settings.MAX_CONCURRENT_GENERATIONS <= 0 and not settings.ADAPTIVE_CONCURRENCY_ENABLED:
+        return None
+
+    if settings.ADAPTIVE_CONCURRENCY_ENABLED:
+        initial_limit = settings.MAX_CONCURRENT_GENERATIONS or settings.ADAPTIVE_CONCURRENCY_MIN
+
+        logger.info(
+            "Adaptive generation concurrency enabled: start=%s min=%s max=%s",
+            initial_limit,
+            settings.ADAPTIVE_CONCURRENCY_MIN,
+            settings.ADAPTIVE_CONCURRENCY_MAX,
+        )
+
+        return AdaptiveConcurrencyLimiter(
+            initial_limit=initial_limit,
+            min_limit=settings.ADAPTIVE_CONCURRENCY_MIN,
+            max_limit=settings.ADAPTIVE_CONCURRENCY_MAX,
+            adaptive=True,
+            max_queue=settings.GENERATION_QUEUE_MAX_SIZE,
+            queue_timeout=settings.GENERATION_QUEUE_TIMEOUT_SECONDS,
+            latency_tolerance=settings.ADAPTIVE_CONCURRENCY_LATENCY_TOLERANCE,
+        )
+
+    return AdaptiveConcurrencyLimiter(
+        initial_limit=settings.MAX_CONCURRENT_GENERATIONS,
+        max_queue=settings.GENERATION_QUEUE_MAX_SIZE,
+        queue_timeout=settings.GENERATION_QUEUE_TIMEOUT_SECONDS,
+    )
+
+
+def build_scheduler(
+    settings,
+    limiter: AdaptiveConcurrencyLimiter | None,
+) -> PriorityScheduler | None:
+    """
+    With SCHEDULER_CAPACITY=0 the scheduler admits as many generations as
+    the limiter's current limit, so it alone decides their order, and it
+    takes over the limiter's queue size and timeout to shed by class.
+
+    A fixed capacity is kept for deployments without a limiter. Above the
+    limit, admitted generations also queue in the limiter, in arrival order
+    whatever their class; below it, throughput is capped.
+    """
+
+    if not settings.SCHEDULER_ENABLED:
+        return None
+
+    reserved_interactive = settings.SCHEDULER_RESERVED_INTERACTIVE
+
+    if settings.SCHEDULER_CAPACITY > 0:
+        if limiter is not None and (
+            limiter.adaptive or settings.SCHEDULER_CAPACITY != limiter.limit
+        ):
+            logger.warning(
+                "SCHEDULER_CAPACITY=%s does not follow the generation concurrency "
+                "limit (%s%s); set SCHEDULER_CAPACITY=0 so the scheduler decides "
+                "the order of every generation",
+                settings.SCHEDULER_CAPACITY,
+                limiter.limit,
+                ", adaptive" if limiter.adaptive else "",
+            )
+
+        logger.info(
+            "Priority scheduler enabled: capacity=%s reserved_interactive=%s",
+            settings.SCHEDULER_CAPACITY,
+            reserved_interactive,
+        )
+
+        return PriorityScheduler(
+            capacity=settings.SCHEDULER_CAPACITY,
+            reserved_interactive=reserved_interactive,
+            weights=settings.SCHEDULER_WEIGHTS,
+        )
+
+    if limiter is None:
+        logger.warning(
+            "Priority scheduler disabled: SCHEDULER_CAPACITY=0 needs a generation "
+            "concurrency limit to follow"
+        )
+        return None
+
+    if reserved_interactive >= limiter.limit:
+        logger.warning(
+            "SCHEDULER_RESERVED_INTERACTIVE=%s leaves event and batch generations "
+            "a single slot at the current limit of %s",
+            reserved_interactive,
+            limiter.limit,
+        )
+
+    logger.info(
+        "Priority scheduler enabled: capacity follows the generation concurrency "
+        "limit (%s) reserved_interactive=%s",
+        limiter.limit,
+        reserved_interactive,
+    )
+
+    return PriorityScheduler(
+        capacity=lambda: limiter.limit,
+        reserved_interactive=reserved_interactive,
+        weights=settings.SCHEDULER_WEIGHTS,
+        max_queue=settings.GENERATION_QUEUE_MAX_SIZE,
+        queue_timeout=settings.GENERATION_QUEUE_TIMEOUT_SECONDS,
+        retry_after=limiter.retry_after,
+    )
+
+
+async def connect_rabbitmq_with_retries(publisher, attempts: int = 6) -> None:
+    for attempt in range(1, attempts + 1):
+        try:
+            await publisher.connect()
+            logger.info("Connected to RabbitMQ on attempt %s", attempt)
+            return
+
+        except AMQPConnectionError as exc:
+            logger.warning(
+                "RabbitMQ not ready on attempt %s/%s: %s",
+                attempt,
+                attempts,
+                exc,
+            )
+            RETRIES.labels(target="rabbitmq_connect").inc()
+            await asyncio.sleep(5)
+
+    raise RuntimeError("RabbitMQ connection failed after multiple attempts")
+
+
+SERVICE_ROLES = ("all", "api", "worker")
+
+
+def runs_consumer(settings: Settings, role: str) -> bool:
+    """
+    The worker always consumes; the combined role only when the consumer is
+    enabled; the API-only role never does.
+    """
+
+    if role not in SERVICE_ROLES:
+        raise ValueError(f"Unsupported SERVICE_ROLE: {role}")
+
+    return role == "worker" or (role == "all" and settings.ENABLE_RABBITMQ_CONSUMER)
+
+
+async def start_services(app: FastAPI, settings: Settings, role: str) -> None:
+    """
+    Build the clients, generation model and use cases for one process and
+    store them on app.state.
+
+    Every role shares this wiring; only the RabbitMQ consumer depends on the
+    role.
+    """
+
+    run_consumer = runs_consumer(settings, role)
+
+    app.state.role = role
+    app.state.runs_consumer = run_consumer
+
+    event_loop_monitor = EventLoopLagMonitor(interval=settings.EVENT_LOOP_LAG_INTERVAL)
+    event_loop_monitor.start()
+    app.state.event_loop_monitor = event_loop_monitor
+
+    transports = HttpTransportRegistry(
+        max_connections=settings.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+        http2=settings.HTTP2_ENABLED,
+    )
+
+    app.state.http_transports = transports
+
+    similarity_search_client = EmbeddingServiceClient(
+        base_url=settings.EMBEDDING_SERVICE_URL,
+        timeout=settings.REQUEST_TIMEOUT,
+        token=settings.EMBEDDING_SERVICE_TOKEN,
+        scope=settings.EMBEDDING_SEARCH_SCOPE,
+        http_client=transports.get_client(
+            "embedding_service",
+            timeout=settings.REQUEST_TIMEOUT,
+        ),
+        retry_policy=build_retry_policy(settings),
+    )
+
+    if settings.RETRIEVAL_CACHE_ENABLED:
+        similarity_search_client = CachingSimilaritySearchClient(
+            inner=similarity_search_client,
+            ttl_seconds=settings.RETRIEVAL_CACHE_TTL_SECONDS,
+            max_entries=settings.RETRIEVAL_CACHE_MAX_ENTRIES,
+            max_bytes=settings.RETRIEVAL_CACHE_MAX_BYTES,
+            scope=settings.EMBEDDING_SEARCH_SCOPE,
+        )
+        logger.info("Similarity search cache enabled")
+
+    generation_cache = build_generation_cache(settings)
+    app.state.generation_cache = generation_cache
+
+    cpu_offloader = build_cpu_offloader(settings)
+    app.state.cpu_offloader = cpu_offloader
+
+    prompt_registry = build_prompt_registry(settings)
+    prompt_registry.start_watching(settings.PROMPT_TEMPLATES_RELOAD_INTERVAL)
+    app.state.prompt_registry = prompt_registry
+
+    generation_model = build_generation_model(
+        settings,
+        transports,
+        generation_cache,
+        cpu_offloader=cpu_offloader,
+        prompt_builder=ConsultantPromptBuilder(registry=prompt_registry),
+    )
+    app.state.generation_router = (
+        generation_model if isinstance(generation_model, RoutedGenerationModel) else None
+    )
+
+    generation_limiter = build_generation_limiter(settings)
+    app.state.generation_limiter = generation_limiter
+
+    if generation_limiter is not None:
+        generation_model = ConcurrencyLimitedGenerationModel(
+            inner=generation_model,
+            limiter=generation_limiter,
+        )
+
+    context_packer = None
+
+    if settings.CONTEXT_PACKING_ENABLED:
+        context_packer = TokenBudgetContextPacker(
+            context_window=settings.LLM_CONTEXT_WINDOW,
+            max_output_tokens=settings.LLM_MAX_TOKENS,
+            reserved_tokens=settings.CONTEXT_RESERVED_TOKENS,
+            max_chunk_tokens=settings.CONTEXT_MAX_CHUNK_TOKENS,
+            duplicate_threshold=settings.CONTEXT_DUPLICATE_THRESHOLD,
+        )
+
+    scheduler = build_scheduler(settings, generation_limiter)
+    app.state.scheduler = scheduler
+
+    # Generations wait (and are shed) in the scheduler when it follows the
+    # limit, otherwise in the limiter.
+    if scheduler is not None and settings.SCHEDULER_CAPACITY <= 0:
+        is_saturated = scheduler.is_saturated
+    elif generation_limiter is not None:
+        is_saturated = generation_limiter.is_saturated
+    else:
+        is_saturated = None
+
+    generate_case_draft_use_case = GenerateCaseDraftUseCase(
+        similarity_search_client=similarity_search_client,
+        generation_model=generation_model,
+        default_suggestion_count=settings.DEFAULT_SUGGESTION_COUNT,
+        context_packer=context_packer,
+        scheduler=scheduler,
+    )
+
+    app.state.generate_case_draft_use_case = generate_case_draft_use_case
+    app.state.generate_case_draft_batch_use_case = GenerateCaseDraftBatchUseCase(
+        generate_case_draft_use_case=generate_case_draft_use_case,
+        max_concurrency=settings.BATCH_MAX_CONCURRENCY,
+        max_items=settings.BATCH_MAX_ITEMS,
+    )
+    app.state.case_assigned_consumer = None
+    app.state.rabbit_publisher = None
+    app.state.processed_events = None
+
+    if run_consumer:
+        publisher = AioPikaEventPublisher(
+            url=settings.RABBITMQ_URL,
+            exchange_name=settings.CASE_DRAFT_GENERATED_EXCHANGE,
+            routing_key=settings.CASE_DRAFT_GENERATED_ROUTING_KEY,
+            channel_pool_size=settings.RABBITMQ_PUBLISHER_CHANNELS,
+            publisher_confirms=settings.RABBITMQ_PUBLISHER_CONFIRMS,
+            publish_batch_size=settings.RABBITMQ_PUBLISH_BATCH_SIZE,
+            publish_batch_interval=settings.RABBITMQ_PUBLISH_BATCH_INTERVAL,
+        )
+
+        await connect_rabbitmq_with_retries(publisher)
+
+        case_client = HttpxCaseServiceClient(
+            base_url=settings.CASE_SERVICE_URL,
+            timeout=30,
+            http_client=transports.get_client("case_service", timeout=30),
+            retry_policy=build_retry_policy(settings),
+        )
+
+        processed_events = build_processed_event_store(settings)
+        app.state.processed_events = processed_events
+
+        handler = CaseAssignedHandler(
+            case_client=case_client,
+            generate_case_draft_use_case=generate_case_draft_use_case,
+            publisher=publisher,
+            deadline_seconds=settings.EVENT_DEADLINE_SECONDS,
+            processed_events=processed_events,
+            prefetch_depth=settings.CASE_ASSIGNED_PREFETCH_DEPTH,
+        )
+
+        consumer = await start_case_assigned_consumer(
+            callback=handler.handle,
+            url=settings.RABBITMQ_URL,
+            exchange_name=settings.CASE_ASSIGNED_EXCHANGE,
+            routing_key=settings.CASE_ASSIGNED_ROUTING_KEY,
+            queue_name=settings.CASE_ASSIGNED_QUEUE_NAME,
+            prefetch_count=settings.RABBITMQ_PREFETCH_COUNT,
+            worker_count=settings.CONSUMER_WORKER_COUNT,
+            shutdown_timeout=settings.CONSUMER_SHUTDOWN_TIMEOUT,
+            is_saturated=is_saturated,
+            backpressure_interval=settings.CONSUMER_BACKPRESSURE_INTERVAL,
+            retry_delays=settings.CASE_ASSIGNED_RETRY_DELAYS,
+            max_attempts=settings.CASE_ASSIGNED_MAX_ATTEMPTS,
+            dlq_poll_interval=settings.CASE_ASSIGNED_DLQ_POLL_INTERVAL,
+            prefetch=handler.prefetch if settings.CASE_ASSIGNED_PREFETCH_DEPTH > 0 else None,
+        )
+
+        app.state.case_assigned_consumer = consumer
+        app.state.rabbit_publisher = publisher
+
+        logger.info("RabbitMQ consumer enabled")
+
+    else:
+        logger.info("RabbitMQ consumer disabled")
+
+    logger.info("AI Service started in ENV=%s role=%s", settings.ENV, role)
+
+
+async def stop_services(app: FastAPI) -> None:
+
+    consumer = getattr(app.state, "case_assigned_consumer", None)
+
+    if consumer:
+        await consumer.stop()
+        logger.info("RabbitMQ consumer connection closed")
+
+    publisher = getattr(app.state, "rabbit_publisher", None)
+
+    if publisher:
+        await publisher.close()
+        logger.info("RabbitMQ publisher connection closed")
+
+    processed_events = getattr(app.state, "processed_events", None)
+
+    if processed_events is not None:
+        await processed_events.close()
+
+    generation_cache = getattr(app.state, "generation_cache", None)
+
+    if generation_cache is not None:
+        await generation_cache.close()
+
+    transports = getattr(app.state, "http_transports", None)
+
+    if transports is not None:
+        await transports.aclose()
+
+    prompt_registry = getattr(app.state, "prompt_registry", None)
+
+    if prompt_registry is not None:
+        await prompt_registry.stop()
+
+    cpu_offloader = getattr(app.state, "cpu_offloader", None)
+
+    if cpu_offloader is not None:
+        cpu_offloader.close()
+
+    event_loop_monitor = getattr(app.state, "event_loop_monitor", None)
+
+    if event_loop_monitor is not None:
+        await event_loop_monitor.stop()
+
+
+def service_lifespan(role: str | None = None):
+    """
+    Lifespan for a FastAPI app in the given role; None reads SERVICE_ROLE.
+    """
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        settings = get_settings()
+
+        await start_services(app, settings, role or settings.SERVICE_ROLE)
+
+        try:
+            yield
+        finally:
+            await stop_services(app)
+
+            if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+                # Drops this worker's live gauges from the shared metrics.
+                multiprocess.mark_process_dead(os.getpid())
+
+    return lifespan
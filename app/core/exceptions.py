@@ -8,3 +8,16 @@ class ServiceUnavailable(Exception):
 class BadGateway(Exception):
     """Raised when an external dependency returns an unexpected response."""
     pass
+
+
+class Overloaded(ServiceUnavailable):
+    """Raised when a request is shed because the generation backend is saturated."""
+
+    def __init__(self, message: str, retry_after: int = 1) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class DeadlineExceeded(ServiceUnavailable):
+    """Raised when the time budget of a request or message is spent."""
+    pass
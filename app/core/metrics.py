@@ -0,0 +1,220 @@
+from prometheus_client import Counter, Gauge, Histogram
+
+# Prometheus metrics shared by all layers.
+# They are exposed by the /metrics endpoint in app/api/health.py.
+# multiprocess_mode says how a gauge is combined across API workers sharing
+# PROMETHEUS_MULTIPROC_DIR; the live modes leave out workers that exited.
+
+STAGE_DURATION = Histogram(
+    "ai_service_stage_duration_seconds",
+    "Duration of one pipeline stage.",
+    ["stage"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120),
+)
+
+PARSER_FALLBACKS = Counter(
+    "ai_service_parser_fallbacks_total",
+    "Model responses that could not be parsed as a structured draft.",
+)
+
+PARSER_REPAIRS = Counter(
+    "ai_service_parser_repairs_total",
+    "Malformed model responses recovered by the JSON repair stage.",
+)
+
+PARSER_SCHEMA_MISSES = Counter(
+    "ai_service_parser_schema_misses_total",
+    "Schema-constrained model responses that did not validate as an AIDraft directly.",
+)
+
+CACHE_REQUESTS = Counter(
+    "ai_service_cache_requests_total",
+    "Cache lookups by cache and result.",
+    ["cache", "result"],
+)
+
+RETRIES = Counter(
+    "ai_service_retries_total",
+    "Retried calls to external dependencies.",
+    ["target"],
+)
+
+LLM_BACKEND_REQUESTS = Counter(
+    "ai_service_llm_backend_requests_total",
+    "Generation requests sent by the router, by backend and result.",
+    ["backend", "result"],
+)
+
+LLM_HEDGED_REQUESTS = Counter(
+    "ai_service_llm_hedged_requests_total",
+    "Hedged generation requests, by whether the hedge returned the draft.",
+    ["result"],
+)
+
+GENERATIONS_IN_FLIGHT = Gauge(
+    "ai_service_generations_in_flight",
+    "Draft generations currently running.",
+    multiprocess_mode="livesum",
+)
+
+GENERATION_CONCURRENCY_LIMIT = Gauge(
+    "ai_service_generation_concurrency_limit",
+    "Current limit of concurrent generations.",
+    multiprocess_mode="livesum",
+)
+
+GENERATION_QUEUE_LENGTH = Gauge(
+    "ai_service_generation_queue_length",
+    "Generations waiting for a concurrency slot.",
+    multiprocess_mode="livesum",
+)
+
+GENERATION_REJECTIONS = Counter(
+    "ai_service_generation_rejections_total",
+    "Generations shed by the concurrency limiter, by reason.",
+    ["reason"],
+)
+
+SCHEDULER_QUEUE_DEPTH = Gauge(
+    "ai_service_scheduler_queue_depth",
+    "Generations waiting in the priority scheduler, by priority class.",
+    ["priority"],
+    multiprocess_mode="livesum",
+)
+
+SCHEDULER_RUNNING = Gauge(
+    "ai_service_scheduler_running",
+    "Generations admitted by the priority scheduler, by priority class.",
+    ["priority"],
+    multiprocess_mode="livesum",
+)
+
+SCHEDULER_REJECTIONS = Counter(
+    "ai_service_scheduler_rejections_total",
+    "Generations shed by the priority scheduler, by priority class and reason.",
+    ["priority", "reason"],
+)
+
+SCHEDULER_WAIT = Histogram(
+    "ai_service_scheduler_wait_seconds",
+    "Time a generation waited in the priority scheduler, by priority class.",
+    ["priority"],
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120),
+)
+
+CONSUMER_PAUSED = Gauge(
+    "ai_service_consumer_paused",
+    "1 while the CaseAssigned consumer is paused for backpressure.",
+    multiprocess_mode="livemax",
+)
+
+CONSUMER_BACKLOG = Gauge(
+    "ai_service_consumer_backlog_messages",
+    "CaseAssigned messages received by the consumer and not yet handled.",
+    multiprocess_mode="livesum",
+)
+
+DUPLICATE_EVENTS_SUPPRESSED = Counter(
+    "ai_service_duplicate_events_suppressed_total",
+    "Duplicate CaseAssigned events that were not handled again, by reason.",
+    ["reason"],
+)
+
+CASE_PREFETCH = Counter(
+    "ai_service_case_prefetch_total",
+    "Queued CaseAssigned events prepared ahead of generation, by result.",
+    ["result"],
+)
+
+CONSUMER_RETRIES = Counter(
+    "ai_service_consumer_retries_total",
+    "CaseAssigned messages sent to a delayed-retry queue, by reason.",
+    ["reason"],
+)
+
+CONSUMER_DEAD_LETTERED = Counter(
+    "ai_service_consumer_dead_lettered_total",
+    "CaseAssigned messages moved to the dead-letter queue, by reason.",
+    ["reason"],
+)
+
+CONSUMER_DLQ_DEPTH = Gauge(
+    "ai_service_consumer_dlq_depth_messages",
+    "Messages waiting in the CaseAssigned dead-letter queue.",
+    multiprocess_mode="livemax",
+)
+
+PROMPT_GENERATIONS = Counter(
+    "ai_service_prompt_generations_total",
+    "Generations by prompt template version and result (structured or fallback).",
+    ["prompt_version", "result"],
+)
+
+PROMPT_GENERATION_DURATION = Histogram(
+    "ai_service_prompt_generation_duration_seconds",
+    "Provider call and parsing time of one generation, by prompt template version.",
+    ["prompt_version"],
+    buckets=(0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120),
+)
+
+PROMPT_TOKENS = Counter(
+    "ai_service_prompt_tokens_total",
+    "Tokens reported by the generation provider, by prompt template version and kind.",
+    ["prompt_version", "kind"],
+)
+
+PROMPT_TEMPLATE_RELOADS = Counter(
+    "ai_service_prompt_template_reloads_total",
+    "Prompt template reloads after a file change, by result.",
+    ["result"],
+)
+
+CPU_OFFLOAD = Counter(
+    "ai_service_cpu_offload_total",
+    "CPU-bound tasks by task and where they ran (inline, thread or process).",
+    ["task", "mode"],
+)
+
+EVENT_LOOP_LAG = Gauge(
+    "ai_service_event_loop_lag_seconds",
+    "Most recent delay of the event loop in waking up from a timer.",
+    multiprocess_mode="livemax",
+)
+
+EVENT_LOOP_LAG_SECONDS = Histogram(
+    "ai_service_event_loop_lag_distribution_seconds",
+    "Delay of the event loop in waking up from a timer.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+
+LLM_TOKENS = Counter(
+    "ai_service_llm_tokens_total",
+    "Tokens reported by the generation provider.",
+    ["kind"],
+)
+
+
+def stage_timer(stage: str):
+    """
+    Context manager recording the duration of a pipeline stage.
+    """
+
+    return STAGE_DURATION.labels(stage=stage).time()
+
+
+def record_token_usage(usage: dict | None) -> None:
+    """
+    Record the provider's OpenAI-style usage block, if present.
+    """
+
+    if not usage:
+        return
+
+    prompt_tokens = usage.get("prompt_tokens")
+    completion_tokens = usage.get("completion_tokens")
+
+    if prompt_tokens:
+        LLM_TOKENS.labels(kind="prompt").inc(prompt_tokens)
+
+    if completion_tokens:
+        LLM_TOKENS.labels(kind="completion").inc(completion_tokens)
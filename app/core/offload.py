@@ -0,0 +1,173 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Callable, TypeVar
+
+from app.core.metrics import CPU_OFFLOAD, EVENT_LOOP_LAG, EVENT_LOOP_LAG_SECONDS
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+OFFLOAD_MODES = ("off", "thread", "process")
+
+
+class CpuOffloader:
+    """
+    Runs CPU-bound work (response parsing, prompt rendering) off the event
+    loop once its input is at least min_size characters.
+
+    - off: always inline
+    - thread: a thread pool; the GIL is released every few milliseconds,
+      so the loop keeps serving other requests and AMQP heartbeats
+    - process: a process pool (spawned, not forked), for true parallelism;
+      the function, its arguments and its result must be picklable, and
+      metrics updated inside the worker are not seen by this process
+
+    Small inputs stay inline, where a pool round trip would cost more than
+    the work itself.
+    """
+
+    def __init__(
+        self,
+        mode: str = "thread",
+        max_workers: int | None = None,
+        min_size: int = 16384,
+    ) -> None:
+        if mode not in OFFLOAD_MODES:
+            raise ValueError(f"Unsupported CPU offload mode: {mode}")
+
+        self._mode = mode
+        self._max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self._min_size = min_size
+        self._executor: Executor | None = None
+
+    async def run(self, task: str, func: Callable[..., T], *args, size: int, **kwargs) -> T:
+        """
+        Call func(*args, **kwargs), in the pool when size reaches min_size.
+
+        A process pool whose worker died is unusable; it is replaced and the
+        call retried once in the new pool, then run inline if that breaks too.
+        """
+
+        if self._mode == "off" or size < self._min_size:
+            CPU_OFFLOAD.labels(task=task, mode="inline").inc()
+            return func(*args, **kwargs)
+
+        CPU_OFFLOAD.labels(task=task, mode=self._mode).inc()
+
+        loop = asyncio.get_running_loop()
+        call = partial(func, *args, **kwargs)
+
+        for attempt in range(2):
+            executor = self._get_executor()
+
+            try:
+                return await loop.run_in_executor(executor, call)
+            except BrokenProcessPool:
+                logger.warning(
+                    "CPU offload process pool is broken; replacing it (task=%s, attempt=%s)",
+                    task,
+                    attempt + 1,
+                )
+                self._discard(executor)
+
+        CPU_OFFLOAD.labels(task=task, mode="inline").inc()
+
+        return call()
+
+    def stats(self) -> dict:
+        return {
+            "mode": self._mode,
+            "max_workers": self._max_workers,
+            "min_size": self._min_size,
+            "started": self._executor is not None,
+        }
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _discard(self, executor: Executor) -> None:
+        # Concurrent calls may already have replaced the broken pool.
+        if self._executor is executor:
+            self._executor = None
+
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self._mode == "process":
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self._max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_workers,
+                    thread_name_prefix="cpu-offload",
+                )
+
+            logger.info(
+                "Started CPU offload %s pool with %s workers",
+                self._mode,
+                self._max_workers,
+            )
+
+        return self._executor
+
+
+class EventLoopLagMonitor:
+    """
+    Measures how late the event loop wakes up from a sleep of interval
+    seconds. Anything above a few milliseconds means a callback is holding
+    the loop and every other request and heartbeat waits behind it.
+    """
+
+    def __init__(self, interval: float = 0.5) -> None:
+        self._interval = interval
+        self._task: asyncio.Task | None = None
+        self._last_lag = 0.0
+        self._max_lag = 0.0
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        self._task.cancel()
+
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+        self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "interval": self._interval,
+            "last_lag_seconds": round(self._last_lag, 6),
+            "max_lag_seconds": round(self._max_lag, 6),
+        }
+
+    async def _run(self) -> None:
+        while True:
+            expected = time.monotonic() + self._interval
+            await asyncio.sleep(self._interval)
+
+            lag = max(time.monotonic() - expected, 0.0)
+
+            self._last_lag = lag
+            self._max_lag = max(self._max_lag, lag)
+            EVENT_LOOP_LAG.set(lag)
+            EVENT_LOOP_LAG_SECONDS.observe(lag)
@@ -0,0 +1,187 @@
+import asyncio
+import logging
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Iterator, TypeVar
+
+import httpx
+
+from app.core.exceptions import DeadlineExceeded
+from app.core.metrics import RETRIES
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Monotonic time by which the current request or message must be handled.
+_deadline: ContextVar[float | None] = ContextVar("deadline", default=None)
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+@contextmanager
+def deadline(seconds: float | None) -> Iterator[None]:
+    """
+    Set the time budget for everything called inside the block.
+
+    A nested deadline can only shorten the budget, never extend it.
+    """
+
+    if seconds is None:
+        yield
+        return
+
+    new_deadline = time.monotonic() + seconds
+    current = _deadline.get()
+
+    if current is not None:
+        new_deadline = min(new_deadline, current)
+
+    token = _deadline.set(new_deadline)
+
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining_time() -> float | None:
+    """
+    Seconds left in the current budget, or None when there is no deadline.
+    """
+
+    current = _deadline.get()
+
+    if current is None:
+        return None
+
+    return current - time.monotonic()
+
+
+def timeout_for(default: float) -> float:
+    """
+    Timeout for one outbound call: the client's own timeout, capped by the
+    remaining budget. Raises DeadlineExceeded when the budget is spent.
+    """
+
+    remaining = remaining_time()
+
+    if remaining is None:
+        return default
+
+    if remaining <= 0:
+        raise DeadlineExceeded("Request deadline exceeded")
+
+    return min(default, remaining)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    Bounded retries with full-jitter exponential backoff.
+
+    max_attempts counts the first call; 1 disables retries. A server
+    Retry-After longer than max_retry_after is not waited for.
+    """
+
+    max_attempts: int = 3
+    base_delay: float = 0.2
+    max_delay: float = 5.0
+    max_retry_after: float = 30.0
+
+    def backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+NO_RETRY = RetryPolicy(max_attempts=1)
+
+
+def is_retryable(exc: Exception) -> bool:
+    """
+    Transport errors (connect, read, timeouts) and 429/5xx responses.
+    """
+
+    if isinstance(exc, httpx.TransportError):
+        return True
+
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code in RETRYABLE_STATUS_CODES
+
+    return False
+
+
+def retry_after_seconds(exc: Exception) -> float | None:
+    """
+    The Retry-After of a 429/503 response, in seconds, if there is one.
+    """
+
+    if not isinstance(exc, httpx.HTTPStatusError):
+        return None
+
+    value = exc.response.headers.get("Retry-After")
+
+    if not value:
+        return None
+
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+async def call_with_retries(
+    operation: Callable[[], Awaitable[T]],
+    target: str,
+    policy: RetryPolicy,
+) -> T:
+    """
+    Run operation, retrying retryable errors according to policy.
+
+    A Retry-After sent by the server is honored instead of the backoff. No
+    retry is attempted when its delay would not fit in the remaining
+    deadline; the last error is raised instead.
+    """
+
+    attempt = 1
+
+    while True:
+        try:
+            return await operation()
+
+        except Exception as exc:
+            if attempt >= policy.max_attempts or not is_retryable(exc):
+                raise
+
+            delay = retry_after_seconds(exc)
+
+            if delay is None:
+                delay = policy.backoff(attempt)
+            elif delay > policy.max_retry_after:
+                raise
+
+            remaining = remaining_time()
+
+            if remaining is not None and delay >= remaining:
+                raise
+
+            logger.warning(
+                "Retrying %s in %.2fs after attempt %s/%s failed: %s",
+                target,
+                delay,
+                attempt,
+                policy.max_attempts,
+                exc,
+            )
+            RETRIES.labels(target=target).inc()
+
+            await asyncio.sleep(delay)
+            attempt += 1
@@ -0,0 +1,32 @@
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+
+def json_dumps(value: Any) -> bytes:
+    """
+    Compact UTF-8 JSON for request bodies and messages, with orjson when it
+    is installed.
+
+    Pydantic models should use model_dump_json instead.
+    """
+
+    if orjson is not None:
+        return orjson.dumps(value)
+
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def json_loads(data: bytes | str) -> Any:
+    """
+    Decode a JSON body without first decoding it to str.
+    """
+
+    if orjson is not None:
+        return orjson.loads(data)
+
+    return json.loads(data)
@@ -1,9 +1,18 @@
 from fastapi import Request
 
 from app.application.use_cases.generate_case_draft import GenerateCaseDraftUseCase
+from app.application.use_cases.generate_case_draft_batch import (
+    GenerateCaseDraftBatchUseCase,
+)
 
 
 def get_generate_case_draft_use_case(
     request: Request,
 ) -> GenerateCaseDraftUseCase:
-    return request.app.state.generate_case_draft_use_case
\ No newline at end of file
+    return request.app.state.generate_case_draft_use_case
+
+
+def get_generate_case_draft_batch_use_case(
+    request: Request,
+) -> GenerateCaseDraftBatchUseCase:
+    return request.app.state.generate_case_draft_batch_use_case
\ No newline at end of file
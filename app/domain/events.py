@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 
 from pydantic import BaseModel, Field, ConfigDict
@@ -20,8 +20,12 @@ class CaseAssignedEvent(BaseModel):
 class CaseDraftGeneratedEvent(BaseModel):
     """
     Event published by the AI Service after generating draft recommendations.
+
+    idempotency_key is the key the draft was stored with; an event published
+    again for a redelivered assignment carries the same key.
     """
 
     case_id: UUID
     consultant_id: UUID
-    recommendations: List[DraftRecommendation]
\ No newline at end of file
+    recommendations: List[DraftRecommendation]
+    idempotency_key: Optional[str] = None
\ No newline at end of file
@@ -1,8 +1,12 @@
-from typing import List, Literal, Optional
+from typing import Dict, List, Literal, Optional
 from uuid import UUID
 
 from pydantic import BaseModel, Field
 
+# Scheduling class of a generation: consultant-facing API calls, background
+# CaseAssigned events, and batch requests.
+GenerationPriority = Literal["interactive", "event", "batch"]
+
 
 class CaseQuery(BaseModel):
     """
@@ -75,6 +79,33 @@ class UsedContext(BaseModel):
     pdf_id: Optional[UUID] = None
     similarity: float
     text_preview: str
+    status: Literal["included", "truncated", "duplicate", "over_budget"] = Field(
+        default="included",
+        description="Whether the chunk was sent to the model in full, truncated, or dropped.",
+    )
+
+
+class PackedContexts(BaseModel):
+    """
+    Retrieved context selected to fit the prompt budget.
+
+    selected holds the chunks sent to the model, possibly truncated, in
+    prompt order. statuses records the outcome for every retrieved chunk.
+    """
+
+    selected: List[RetrievedContext]
+    statuses: Dict[UUID, Literal["included", "truncated", "duplicate", "over_budget"]]
+
+
+class PreparedDraft(BaseModel):
+    """
+    A case query with its retrieved and packed context, ready for generation.
+    """
+
+    query: CaseQuery
+    consultant_id: UUID
+    contexts: List[RetrievedContext]
+    packed: PackedContexts
 
 
 class DraftRecommendation(BaseModel):
@@ -107,4 +138,71 @@ class SolveCaseResult(BaseModel):
     """
 
     case_id: Optional[UUID] = None
-    draft: AIDraft
\ No newline at end of file
+    draft: AIDraft
+
+
+class BatchDraftRequest(BaseModel):
+    """
+    Several case queries to draft in one request.
+    """
+
+    items: List[CaseQuery] = Field(
+        ...,
+        min_length=1,
+        description="Case queries to generate drafts for, in order.",
+    )
+
+
+class BatchDraftItemResult(BaseModel):
+    """
+    Outcome of one item of a batch draft request.
+
+    Exactly one of result or error is set.
+    """
+
+    index: int
+    result: Optional[SolveCaseResult] = None
+    error: Optional[str] = None
+
+
+class BatchDraftResult(BaseModel):
+    """
+    Response of a batch draft request, ordered like the request items.
+    """
+
+    results: List[BatchDraftItemResult]
+
+
+class DraftStreamEvent(BaseModel):
+    """
+    One incremental update of a streamed AI draft.
+
+    - summary: the draft summary is complete.
+    - recommendation: one recommendation is complete.
+    - done: the final draft, including used context and notes.
+    - error: generation failed after streaming started.
+    """
+
+    event: Literal["summary", "recommendation", "done", "error"]
+    summary: Optional[str] = None
+    index: Optional[int] = None
+    recommendation: Optional[DraftRecommendation] = None
+    draft: Optional[AIDraft] = None
+    detail: Optional[str] = None
+
+    @classmethod
+    def from_draft(cls, draft: AIDraft) -> List["DraftStreamEvent"]:
+        """
+        Events for a draft that is already complete.
+        """
+
+        events = [cls(event="summary", summary=draft.summary)]
+
+        events.extend(
+            cls(event="recommendation", index=index, recommendation=recommendation)
+            for index, recommendation in enumerate(draft.recommendations)
+        )
+
+        events.append(cls(event="done", draft=draft))
+
+        return events
\ No newline at end of file
@@ -1,8 +1,15 @@
 from abc import ABC, abstractmethod
+from typing import AsyncIterator
 from uuid import UUID
 
 from app.domain.events import CaseDraftGeneratedEvent
-from app.domain.models import AIDraft, CaseQuery, RetrievedContext
+from app.domain.models import (
+    AIDraft,
+    CaseQuery,
+    DraftStreamEvent,
+    PackedContexts,
+    RetrievedContext,
+)
 
 
 class CaseServiceClient(ABC):
@@ -14,9 +21,16 @@ class CaseServiceClient(ABC):
         pass
 
     @abstractmethod
-    async def add_ai_draft(self, case_id: UUID, draft: AIDraft) -> None:
+    async def add_ai_draft(
+        self,
+        case_id: UUID,
+        draft: AIDraft,
+        idempotency_key: str | None = None,
+    ) -> None:
         """
         Send the generated AI draft back to the Case Service or Consultant Service.
+
+        Posts with the same idempotency key must create at most one draft.
         """
         pass
 
@@ -34,6 +48,19 @@ class SimilaritySearchClient(ABC):
         pass
 
 
+class ContextPacker(ABC):
+    @abstractmethod
+    def pack(
+        self,
+        query: CaseQuery,
+        contexts: list[RetrievedContext],
+    ) -> PackedContexts:
+        """
+        Select and trim retrieved context so the prompt fits the model window.
+        """
+        pass
+
+
 class GenerationModel(ABC):
     @abstractmethod
     async def generate_draft(
@@ -47,6 +74,34 @@ class GenerationModel(ABC):
         """
         pass
 
+    async def cached_draft(
+        self,
+        query: CaseQuery,
+        contexts: list[RetrievedContext],
+        n: int,
+    ) -> AIDraft | None:
+        """
+        The draft this model would answer from its response cache without
+        calling the provider, or None. Models without a cache return None.
+        """
+        return None
+
+    async def stream_draft(
+        self,
+        query: CaseQuery,
+        contexts: list[RetrievedContext],
+        n: int,
+    ) -> AsyncIterator[DraftStreamEvent]:
+        """
+        Generate a draft and emit its parts as soon as they are complete.
+
+        Models without native streaming generate the whole draft first.
+        """
+        draft = await self.generate_draft(query=query, contexts=contexts, n=n)
+
+        for event in DraftStreamEvent.from_draft(draft):
+            yield event
+
 
 class EventPublisher(ABC):
     @abstractmethod
@@ -57,4 +112,22 @@ class EventPublisher(ABC):
         """
         Publish an event after AI draft generation.
         """
-        pass
\ No newline at end of file
+        pass
+
+
+class ProcessedEventStore(ABC):
+    """
+    Remembers which events were already handled, so redelivered or
+    republished copies can be skipped.
+    """
+
+    @abstractmethod
+    async def contains(self, key: str) -> bool:
+        pass
+
+    @abstractmethod
+    async def add(self, key: str) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
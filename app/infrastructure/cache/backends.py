@@ -0,0 +1,172 @@
+import asyncio
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+from app.infrastructure.cache.memory_cache import TTLLRUCache
+
+
+class CacheBackend(ABC):
+    """
+    Byte-oriented key/value store used by response caches.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> bytes | None:
+        pass
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes) -> None:
+        pass
+
+    @abstractmethod
+    def stats(self) -> dict:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    Process-local LRU cache with TTL.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1000,
+        ttl_seconds: float = 3600,
+        max_bytes: int | None = None,
+    ) -> None:
+        self._cache: TTLLRUCache[bytes] = TTLLRUCache(
+            max_entries=max_entries,
+            ttl_seconds=ttl_seconds,
+            max_bytes=max_bytes,
+            size_of=len,
+        )
+
+    async def get(self, key: str) -> bytes | None:
+        return self._cache.get(key)
+
+    async def set(self, key: str, value: bytes) -> None:
+        self._cache.set(key, value)
+
+    def stats(self) -> dict:
+        return {"backend": "memory", **self._cache.stats()}
+
+
+class SqliteCacheBackend(CacheBackend):
+    """
+    On-disk cache stored in a SQLite file.
+
+    Entries survive restarts and can be shared by processes on the same host.
+    SQLite calls are blocking, so they run in a worker thread.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        max_entries: int = 10000,
+        ttl_seconds: float = 3600,
+    ) -> None:
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(path), check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS cache_entries (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                expires_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS idx_cache_entries_accessed_at "
+            "ON cache_entries (accessed_at)"
+        )
+        self._connection.commit()
+
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, key: str) -> bytes | None:
+        value = await asyncio.to_thread(self._get, key)
+
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+
+        return value
+
+    async def set(self, key: str, value: bytes) -> None:
+        await asyncio.to_thread(self._set, key, value)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+
+        return {
+            "backend": "sqlite",
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+    async def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def _get(self, key: str) -> bytes | None:
+        now = time.time()
+
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value, expires_at FROM cache_entries WHERE key = ?",
+                (key,),
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            value, expires_at = row
+
+            if expires_at <= now:
+                self._connection.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+                self._connection.commit()
+                return None
+
+            self._connection.execute(
+                "UPDATE cache_entries SET accessed_at = ? WHERE key = ?",
+                (now, key),
+            )
+            self._connection.commit()
+
+            return value
+
+    def _set(self, key: str, value: bytes) -> None:
+        now = time.time()
+
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO cache_entries (key, value, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, value, now + self._ttl_seconds, now),
+            )
+            self._connection.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (now,))
+            self._connection.execute(
+                """
+                DELETE FROM cache_entries WHERE key IN (
+                    SELECT key FROM cache_entries
+                    ORDER BY accessed_at DESC
+                    LIMIT -1 OFFSET ?
+                )
+                """,
+                (self._max_entries,),
+            )
+            self._connection.commit()
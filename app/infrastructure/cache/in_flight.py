@@ -0,0 +1,48 @@
+import asyncio
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class InFlightRequests(Generic[T]):
+    """
+    Coalesces concurrent calls that share the same key.
+
+    The first caller for a key starts the operation as a task; callers that
+    arrive while it is still running await the same task instead of repeating
+    the work. A caller being cancelled does not cancel the shared task.
+    """
+
+    def __init__(self) -> None:
+        self._tasks: dict[Hashable, asyncio.Task[T]] = {}
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._tasks
+
+    async def run(
+        self,
+        key: Hashable,
+        operation: Callable[[], Awaitable[T]],
+    ) -> T:
+        task = self._tasks.get(key)
+
+        if task is None:
+            task = asyncio.ensure_future(operation())
+            self._tasks[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self.coalesced += 1
+
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task[T]) -> None:
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+
+        if not task.cancelled():
+            # Mark the exception as retrieved when every caller went away.
+            task.exception()
@@ -0,0 +1,28 @@
+from app.domain.protocols import ProcessedEventStore
+from app.infrastructure.cache.backends import CacheBackend
+
+
+class CacheProcessedEventStore(ProcessedEventStore):
+    """
+    Processed-event store on top of a cache backend.
+
+    Entries expire with the backend TTL, so a key is only remembered for as
+    long as duplicates are expected. A memory backend deduplicates within one
+    process; a SQLite backend also survives restarts and is shared by the
+    processes on one host.
+    """
+
+    def __init__(self, backend: CacheBackend) -> None:
+        self._backend = backend
+
+    async def contains(self, key: str) -> bool:
+        return await self._backend.get(key) is not None
+
+    async def add(self, key: str) -> None:
+        await self._backend.set(key, b"1")
+
+    def stats(self) -> dict:
+        return self._backend.stats()
+
+    async def close(self) -> None:
+        await self._backend.close()
@@ -0,0 +1,103 @@
+import logging
+from uuid import UUID
+
+from app.core.metrics import CACHE_REQUESTS
+from app.domain.models import CaseQuery, RetrievedContext
+from app.domain.protocols import SimilaritySearchClient
+from app.infrastructure.cache.in_flight import InFlightRequests
+from app.infrastructure.cache.memory_cache import TTLLRUCache
+
+logger = logging.getLogger(__name__)
+
+
+# Rough per-chunk overhead of the Pydantic model on top of its text.
+_CONTEXT_OVERHEAD_BYTES = 256
+
+
+def _contexts_size(contexts: list[RetrievedContext]) -> int:
+    return sum(
+        len(context.raw_text.encode("utf-8")) + _CONTEXT_OVERHEAD_BYTES
+        for context in contexts
+    )
+
+
+class CachingSimilaritySearchClient(SimilaritySearchClient):
+    """
+    Caches similarity search results in front of another SimilaritySearchClient.
+
+    Results are keyed on the consultant, the whitespace-normalized case text,
+    k, min_similarity and the search scope. Concurrent searches for the same
+    key share one upstream call.
+    """
+
+    def __init__(
+        self,
+        inner: SimilaritySearchClient,
+        ttl_seconds: float = 300,
+        max_entries: int = 1000,
+        max_bytes: int | None = None,
+        scope: str = "both",
+    ) -> None:
+        self._inner = inner
+        self._scope = scope
+        self._cache: TTLLRUCache[list[RetrievedContext]] = TTLLRUCache(
+            max_entries=max_entries,
+            ttl_seconds=ttl_seconds,
+            max_bytes=max_bytes,
+            size_of=_contexts_size,
+        )
+        self._in_flight: InFlightRequests[list[RetrievedContext]] = InFlightRequests()
+
+    async def search(
+        self,
+        query: CaseQuery,
+        consultant_id: UUID,
+    ) -> list[RetrievedContext]:
+        key = self._cache_key(query, consultant_id)
+
+        cached = self._cache.get(key)
+
+        if cached is not None:
+            CACHE_REQUESTS.labels(cache="retrieval", result="hit").inc()
+            logger.info("Similarity search cache hit for consultant_id=%s", consultant_id)
+            return list(cached)
+
+        CACHE_REQUESTS.labels(cache="retrieval", result="miss").inc()
+
+        contexts = await self._in_flight.run(
+            key,
+            lambda: self._search_and_store(key, query, consultant_id),
+        )
+
+        return list(contexts)
+
+    def stats(self) -> dict:
+        return {
+            **self._cache.stats(),
+            "coalesced": self._in_flight.coalesced,
+            "in_flight": len(self._in_flight),
+        }
+
+    async def _search_and_store(
+        self,
+        key: tuple,
+        query: CaseQuery,
+        consultant_id: UUID,
+    ) -> list[RetrievedContext]:
+        contexts = await self._inner.search(
+            query=query,
+            consultant_id=consultant_id,
+        )
+
+        self._cache.set(key, contexts)
+
+        return contexts
+
+    def _cache_key(self, query: CaseQuery, consultant_id: UUID) -> tuple:
+        return (
+            str(consultant_id),
+            " ".join(query.text.split()),
+            query.k,
+            query.min_similarity,
+            self._scope,
+        )
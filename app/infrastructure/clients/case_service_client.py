@@ -1,8 +1,10 @@
-from uuid import UUID
+from uuid import UUID, uuid4
 
 import httpx
-from fastapi.encoders import jsonable_encoder
 
+from app.core.metrics import stage_timer
+from app.core.resilience import RetryPolicy, call_with_retries, timeout_for
+from app.core.serialization import json_loads
 from app.domain.models import AIDraft
 from app.domain.protocols import CaseServiceClient
 
@@ -10,33 +12,61 @@ from app.domain.protocols import CaseServiceClient
 class HttpxCaseServiceClient(CaseServiceClient):
     """
     HTTP client for communicating with the Case Service.
+
+    Calls are retried on transient errors. Every draft post carries an
+    Idempotency-Key header, so a retried post does not create a second draft.
     """
 
     def __init__(
         self,
         base_url: str,
         timeout: int = 30,
+        http_client: httpx.AsyncClient | None = None,
+        retry_policy: RetryPolicy | None = None,
     ) -> None:
         self._base_url = base_url.rstrip("/")
         self._timeout = timeout
+        self._http_client = http_client or httpx.AsyncClient(timeout=timeout)
+        self._retry_policy = retry_policy or RetryPolicy()
 
     async def get_case(self, case_id: UUID) -> dict:
         url = f"{self._base_url}/cases/{case_id}"
 
-        async with httpx.AsyncClient(timeout=self._timeout) as client:
-            response = await client.get(url)
+        async def get() -> httpx.Response:
+            with stage_timer("case_service_get"):
+                response = await self._http_client.get(
+                    url,
+                    timeout=timeout_for(self._timeout),
+                )
             response.raise_for_status()
-            return response.json()
+            return response
+
+        response = await call_with_retries(get, "case_service", self._retry_policy)
+        return json_loads(response.content)
 
     async def add_ai_draft(
         self,
         case_id: UUID,
         draft: AIDraft,
+        idempotency_key: str | None = None,
     ) -> None:
         url = f"{self._base_url}/cases/{case_id}/ai-draft"
 
-        payload = jsonable_encoder(draft)
+        # Serialized once, straight to bytes; retries reuse the same body.
+        body = draft.model_dump_json(by_alias=True).encode("utf-8")
+        headers = {
+            "Content-Type": "application/json",
+            "Idempotency-Key": idempotency_key or str(uuid4()),
+        }
+
+        async def post() -> None:
+            with stage_timer("case_service_post"):
+                response = await self._http_client.post(
+                    url,
+                    content=body,
+                    headers=headers,
+                    timeout=timeout_for(self._timeout),
+                )
+            response.raise_for_status()
 
-        async with httpx.AsyncClient(timeout=self._timeout) as client:
-            response = await client.post(url, json=payload)
-            response.raise_for_status()
\ No newline at end of file
+        await call_with_retries(post, "case_service", self._retry_policy)
\ No newline at end of file
@@ -3,6 +3,8 @@ from uuid import UUID
 
 import httpx
 
+from app.core.resilience import RetryPolicy, call_with_retries, timeout_for
+from app.core.serialization import json_dumps, json_loads
 from app.domain.models import CaseQuery, RetrievedContext
 from app.domain.protocols import SimilaritySearchClient
 
@@ -15,6 +17,7 @@ class EmbeddingServiceClient(SimilaritySearchClient):
 
     The AI Service uses this client only for similarity search.
     It does not store vectors, chunk PDFs, or manage embeddings.
+    Transient errors are retried with jittered backoff.
     """
 
     def __init__(
@@ -22,10 +25,16 @@ class EmbeddingServiceClient(SimilaritySearchClient):
         base_url: str,
         timeout: int = 120,
         token: str | None = None,
+        scope: str = "both",
+        http_client: httpx.AsyncClient | None = None,
+        retry_policy: RetryPolicy | None = None,
     ) -> None:
         self._base_url = base_url.rstrip("/")
         self._timeout = timeout
         self._token = token
+        self._scope = scope
+        self._http_client = http_client or httpx.AsyncClient(timeout=timeout)
+        self._retry_policy = retry_policy or RetryPolicy()
 
     async def search(
         self,
@@ -34,24 +43,35 @@ class EmbeddingServiceClient(SimilaritySearchClient):
     ) -> list[RetrievedContext]:
         url = f"{self._base_url}/embedding/similarity-search"
 
-        payload = {
-            "query": query.text,
-            "k": query.k,
-            "scope": "both",
-            "min_similarity": query.min_similarity,
-        }
+        body = json_dumps(
+            {
+                "query": query.text,
+                "k": query.k,
+                "scope": self._scope,
+                "min_similarity": query.min_similarity,
+            }
+        )
 
         headers = {
+            "Content-Type": "application/json",
             "X-User-Id": str(consultant_id),
         }
 
         if self._token:
             headers["Authorization"] = f"Bearer {self._token}"
 
-        async with httpx.AsyncClient(timeout=self._timeout) as client:
-            response = await client.post(url, json=payload, headers=headers)
+        async def post() -> httpx.Response:
+            response = await self._http_client.post(
+                url,
+                content=body,
+                headers=headers,
+                timeout=timeout_for(self._timeout),
+            )
             response.raise_for_status()
-            data = response.json()
+            return response
+
+        response = await call_with_retries(post, "embedding_service", self._retry_policy)
+        data = json_loads(response.content)
 
         results = data.get("results", [])
 
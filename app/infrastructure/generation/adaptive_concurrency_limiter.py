@@ -0,0 +1,269 @@
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+
+from app.core.exceptions import Overloaded
+from app.core.metrics import (
+    GENERATION_CONCURRENCY_LIMIT,
+    GENERATION_QUEUE_LENGTH,
+    GENERATION_REJECTIONS,
+)
+
+logger = logging.getLogger(__name__)
+
+# Percentile of recent latencies that a generation is compared against.
+BASELINE_PERCENTILE = 0.1
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Concurrency limit with a bounded wait queue, optionally adapted with AIMD.
+
+    - a caller gets a slot while fewer than `limit` generations run;
+      otherwise it waits in a FIFO queue of at most max_queue callers for at
+      most queue_timeout seconds, and is rejected with Overloaded after that
+    - with adaptive=True the limit grows by about one slot per limit
+      successful generations (additive increase) and is multiplied by
+      backoff_ratio (multiplicative decrease) when a generation is slower than
+      latency_tolerance times the baseline (the 10th percentile of recent
+      latencies, so one outlier does not set it), or when the backend
+      signals overload; it stays within [min_limit, max_limit]
+
+    is_saturated() turns on when the queue is half full and off when it is
+    empty again, so callers that can wait (the RabbitMQ consumer) can pause
+    without flapping.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int,
+        min_limit: int = 1,
+        max_limit: int | None = None,
+        adaptive: bool = False,
+        max_queue: int = 100,
+        queue_timeout: float = 30.0,
+        latency_tolerance: float = 2.0,
+        backoff_ratio: float = 0.9,
+        latency_window: int = 100,
+    ) -> None:
+        max_limit = max_limit or initial_limit
+
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError("Expected 1 <= min_limit <= initial_limit <= max_limit")
+
+        self._limit = float(initial_limit)
+        self._min_limit = min_limit
+        self._max_limit = max_limit
+        self._adaptive = adaptive
+        self._max_queue = max_queue
+        self._queue_timeout = queue_timeout
+        self._latency_tolerance = latency_tolerance
+        self._backoff_ratio = backoff_ratio
+
+        self._in_flight = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        self._saturated = False
+        self._latencies: deque[float] = deque(maxlen=latency_window)
+        self._last_decrease = 0.0
+
+        GENERATION_CONCURRENCY_LIMIT.set(self.limit)
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def adaptive(self) -> bool:
+        return self._adaptive
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queue_length(self) -> int:
+        return len(self._waiters)
+
+    def is_saturated(self) -> bool:
+        return self._saturated
+
+    def acquire(self, sample_latency: bool = True) -> "_Permit":
+        """
+        Async context manager holding one concurrency slot.
+        """
+
+        return _Permit(self, sample_latency)
+
+    def retry_after(self, queued: int | None = None) -> int:
+        """
+        Rough number of seconds until a slot frees up for a caller behind
+        queued others (by default this limiter's queue), for Retry-After.
+        """
+
+        if not self._latencies:
+            return 1
+
+        if queued is None:
+            queued = len(self._waiters)
+
+        average = sum(self._latencies) / len(self._latencies)
+        waves = (queued + 1) / max(self.limit, 1)
+
+        return min(max(math.ceil(average * waves), 1), 120)
+
+    def stats(self) -> dict:
+        return {
+            "limit": self.limit,
+            "adaptive": self._adaptive,
+            "in_flight": self._in_flight,
+            "queued": len(self._waiters),
+            "max_queue": self._max_queue,
+            "saturated": self._saturated,
+        }
+
+    async def _acquire(self) -> None:
+        if self._in_flight < self.limit and not self._waiters:
+            self._in_flight += 1
+            return
+
+        if len(self._waiters) >= self._max_queue:
+            GENERATION_REJECTIONS.labels(reason="queue_full").inc()
+            raise Overloaded(
+                "Generation capacity exhausted, try again later",
+                retry_after=self.retry_after(),
+            )
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._on_queue_changed()
+
+        try:
+            await asyncio.wait_for(waiter, timeout=self._queue_timeout)
+
+        except asyncio.TimeoutError:
+            self._remove_waiter(waiter)
+            GENERATION_REJECTIONS.labels(reason="queue_timeout").inc()
+            raise Overloaded(
+                f"No generation slot became free within {self._queue_timeout}s",
+                retry_after=self.retry_after(),
+            ) from None
+
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just before the caller went away.
+                self._release()
+            else:
+                self._remove_waiter(waiter)
+
+            raise
+
+    def _release(self) -> None:
+        self._in_flight -= 1
+        self._wake_waiters()
+
+    def _wake_waiters(self) -> None:
+        while self._waiters and self._in_flight < self.limit:
+            waiter = self._waiters.popleft()
+
+            if waiter.done():
+                continue
+
+            self._in_flight += 1
+            waiter.set_result(None)
+
+        self._on_queue_changed()
+
+    def _remove_waiter(self, waiter: asyncio.Future) -> None:
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+        self._on_queue_changed()
+
+    def _on_queue_changed(self) -> None:
+        queued = len(self._waiters)
+
+        if queued >= max(1, self._max_queue // 2):
+            self._saturated = True
+        elif queued == 0:
+            self._saturated = False
+
+        GENERATION_QUEUE_LENGTH.set(queued)
+
+    def _on_success(self, latency: float | None) -> None:
+        if latency is not None:
+            self._latencies.append(latency)
+
+        if not self._adaptive or latency is None:
+            return
+
+        if latency > self._baseline() * self._latency_tolerance:
+            self._decrease(latency)
+        else:
+            self._set_limit(self._limit + 1 / self._limit)
+
+    def _baseline(self) -> float:
+        ordered = sorted(self._latencies)
+
+        return ordered[int((len(ordered) - 1) * BASELINE_PERCENTILE)]
+
+    def _on_overload(self) -> None:
+        if self._adaptive:
+            self._decrease(None)
+
+    def _decrease(self, latency: float | None) -> None:
+        now = time.monotonic()
+
+        # Back off at most once per round trip, otherwise one slow burst
+        # would collapse the limit to the minimum.
+        if latency is not None and now - self._last_decrease < latency:
+            return
+
+        self._last_decrease = now
+        self._set_limit(self._limit * self._backoff_ratio)
+
+    def _set_limit(self, limit: float) -> None:
+        previous = self.limit
+        self._limit = min(max(limit, self._min_limit), self._max_limit)
+
+        if self.limit != previous:
+            logger.info("Generation concurrency limit %s -> %s", previous, self.limit)
+            GENERATION_CONCURRENCY_LIMIT.set(self.limit)
+            self._wake_waiters()
+
+
+class _Permit:
+    def __init__(
+        self,
+        limiter: AdaptiveConcurrencyLimiter,
+        sample_latency: bool,
+    ) -> None:
+        self._limiter = limiter
+        self._sample_latency = sample_latency
+        self._overloaded = False
+        self._started = 0.0
+
+    def mark_overloaded(self) -> None:
+        """
+        The backend rejected or timed out the call; shrink the limit.
+        """
+
+        self._overloaded = True
+
+    async def __aenter__(self) -> "_Permit":
+        await self._limiter._acquire()
+        self._started = time.perf_counter()
+
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self._limiter._release()
+
+        if self._overloaded:
+            self._limiter._on_overload()
+        elif exc_type is None:
+            latency = time.perf_counter() - self._started
+            self._limiter._on_success(latency if self._sample_latency else None)
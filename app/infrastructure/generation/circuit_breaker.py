@@ -0,0 +1,88 @@
+import time
+
+
+class CircuitBreaker:
+    """
+    Tracks the health of one generation backend.
+
+    - closed: requests flow; consecutive failures are counted
+    - open: after failure_threshold consecutive failures the backend is
+      skipped for reset_timeout seconds
+    - half_open: after the timeout one probe request is let through; its
+      success closes the circuit, its failure opens it again
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+    ) -> None:
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be at least 1")
+
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self._state == self.OPEN and self._reset_elapsed():
+            return self.HALF_OPEN
+
+        return self._state
+
+    @property
+    def consecutive_failures(self) -> int:
+        return self._consecutive_failures
+
+    def allows_request(self) -> bool:
+        """
+        Whether a request may be sent now, without reserving the probe.
+        """
+
+        state = self.state
+
+        if state == self.CLOSED:
+            return True
+
+        return state == self.HALF_OPEN and not self._probe_in_flight
+
+    def on_request(self) -> None:
+        """
+        Record that a request was sent; in half-open state it is the probe.
+        """
+
+        if self.state == self.HALF_OPEN:
+            self._state = self.HALF_OPEN
+            self._probe_in_flight = True
+
+    def record_success(self) -> None:
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self._consecutive_failures += 1
+        self._probe_in_flight = False
+
+        if self._state == self.HALF_OPEN or self._consecutive_failures >= self._failure_threshold:
+            self._state = self.OPEN
+            self._opened_at = time.monotonic()
+
+    def record_cancelled(self) -> None:
+        """
+        A cancelled request (for example a losing hedge) says nothing about
+        the backend's health; it only releases the half-open probe.
+        """
+
+        self._probe_in_flight = False
+
+    def _reset_elapsed(self) -> bool:
+        return time.monotonic() - self._opened_at >= self._reset_timeout
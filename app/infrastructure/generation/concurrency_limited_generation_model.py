@@ -0,0 +1,122 @@
+import asyncio
+from typing import AsyncIterator
+
+import httpx
+
+from app.domain.models import AIDraft, CaseQuery, DraftStreamEvent, RetrievedContext
+from app.domain.protocols import GenerationModel
+from app.infrastructure.generation.adaptive_concurrency_limiter import (
+    AdaptiveConcurrencyLimiter,
+)
+
+# Provider statuses that mean "too much load", as opposed to a bad request.
+OVERLOAD_STATUS_CODES = {429, 502, 503, 504}
+
+
+class ConcurrencyLimitedGenerationModel(GenerationModel):
+    """
+    Caps how many generations run against the wrapped model at the same time.
+
+    The limiter is shared by every caller of the use case (HTTP requests and
+    the RabbitMQ consumer), so it should be sized to the capacity of the
+    generation backend rather than to the broker prefetch. Callers that do
+    not get a slot in time are rejected with Overloaded.
+
+    Provider timeouts and overload statuses are reported to the limiter so an
+    adaptive limit backs off.
+
+    Drafts the wrapped model can answer from its response cache are returned
+    without taking a slot: they do not load the backend, and their near-zero
+    latency would otherwise become the adaptive limit's baseline.
+    """
+
+    def __init__(
+        self,
+        inner: GenerationModel,
+        limiter: AdaptiveConcurrencyLimiter,
+    ) -> None:
+        self._inner = inner
+        self._limiter = limiter
+
+    @property
+    def in_flight(self) -> int:
+        return self._limiter.in_flight
+
+    @property
+    def limiter(self) -> AdaptiveConcurrencyLimiter:
+        return self._limiter
+
+    async def generate_draft(
+        self,
+        query: CaseQuery,
+        contexts: list[RetrievedContext],
+        n: int,
+    ) -> AIDraft:
+        cached = await self._inner.cached_draft(query=query, contexts=contexts, n=n)
+
+        if cached is not None:
+            return cached
+
+        async with self._limiter.acquire() as permit:
+            try:
+                return await self._inner.generate_draft(
+                    query=query,
+                    contexts=contexts,
+                    n=n,
+                )
+            except Exception as exc:
+                if _indicates_overload(exc):
+                    permit.mark_overloaded()
+
+                raise
+
+    async def stream_draft(
+        self,
+        query: CaseQuery,
+        contexts: list[RetrievedContext],
+        n: int,
+    ) -> AsyncIterator[DraftStreamEvent]:
+        cached = await self._inner.cached_draft(query=query, contexts=contexts, n=n)
+
+        if cached is not None:
+            for event in DraftStreamEvent.from_draft(cached):
+                yield event
+            return
+
+        # Stream durations depend on the reader, so they are not used to
+        # adapt the limit.
+        async with self._limiter.acquire(sample_latency=False) as permit:
+            try:
+                async for event in self._inner.stream_draft(
+                    query=query,
+                    contexts=contexts,
+                    n=n,
+                ):
+                    yield event
+            except Exception as exc:
+                if _indicates_overload(exc):
+                    permit.mark_overloaded()
+
+                raise
+
+    async def cached_draft(
+        self,
+        query: CaseQuery,
+        contexts: list[RetrievedContext],
+        n: int,
+    ) -> AIDraft | None:
+        return await self._inner.cached_draft(query=query, contexts=contexts, n=n)
+
+
+def _indicates_overload(exc: Exception) -> bool:
+    if isinstance(exc, (httpx.TimeoutException, asyncio.TimeoutError)):
+        return True
+
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code in OVERLOAD_STATUS_CODES
+
+    # The generation router wraps the last backend error.
+    if isinstance(exc.__cause__, Exception):
+        return _indicates_overload(exc.__cause__)
+
+    return False
@@ -0,0 +1,184 @@
+import json
+import logging
+import re
+
+from pydantic import ValidationError
+
+from app.domain.models import DraftRecommendation, DraftStreamEvent
+
+logger = logging.getLogger(__name__)
+
+
+_THINK_OPEN = re.compile(r"<think>", flags=re.IGNORECASE)
+_THINK_CLOSE = re.compile(r"</think>", flags=re.IGNORECASE)
+
+
+class IncrementalDraftParser:
+    """
+    Parses a streamed AIDraft JSON document while it is being generated.
+
+    Text chunks are fed as they arrive. The parser tracks JSON structure
+    (strings, escapes, nesting) in a single pass and emits:
+    - the summary once its string value is closed
+    - each recommendation once its object is closed
+
+    Leading <think> blocks are skipped. The complete text is still parsed by
+    LLMResponseParser at the end of the stream, so anything this parser
+    cannot recognize only delays output, it does not lose it.
+    """
+
+    def __init__(self) -> None:
+        self._buffer = ""
+        self._pos = 0
+        self._started = False
+        self._in_think = False
+        self._finished = False
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._stack: list[tuple[str, int, str | None]] = []
+        self._current_key: str | None = None
+        self._expect_value = False
+        self._recommendation_count = 0
+        self._events: list[DraftStreamEvent] = []
+
+    @property
+    def text(self) -> str:
+        return self._buffer
+
+    def feed(self, chunk: str) -> list[DraftStreamEvent]:
+        self._buffer += chunk
+
+        if not self._finished:
+            self._scan()
+
+        events, self._events = self._events, []
+
+        return events
+
+    def _scan(self) -> None:
+        if not self._started and not self._find_root():
+            return
+
+        buffer = self._buffer
+        index = self._pos
+
+        while index < len(buffer) and not self._finished:
+            char = buffer[index]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    self._on_string_end(index)
+
+            elif char == '"':
+                self._in_string = True
+                self._string_start = index
+
+            elif char in "{[":
+                key = self._current_key if len(self._stack) == 1 else None
+                self._stack.append((char, index, key))
+
+            elif char in "}]":
+                if self._stack:
+                    opener, start, _ = self._stack.pop()
+                    self._on_container_end(opener, start, index)
+
+                if not self._stack:
+                    self._finished = True
+
+            elif len(self._stack) == 1:
+                if char == ":":
+                    self._expect_value = True
+                elif char == ",":
+                    self._expect_value = False
+                    self._current_key = None
+
+            index += 1
+
+        self._pos = index
+
+    def _find_root(self) -> bool:
+        while True:
+            if self._in_think:
+                close = _THINK_CLOSE.search(self._buffer, self._pos)
+
+                if close is None:
+                    # Keep a possible partial "</think>" tag for the next chunk.
+                    self._pos = max(self._pos, len(self._buffer) - len("</think>"))
+                    return False
+
+                self._in_think = False
+                self._pos = close.end()
+
+            think = _THINK_OPEN.search(self._buffer, self._pos)
+            brace = self._buffer.find("{", self._pos)
+
+            if think is not None and (brace == -1 or think.start() < brace):
+                self._in_think = True
+                self._pos = think.end()
+                continue
+
+            if brace == -1:
+                # Keep a possible partial "<think>" tag for the next chunk.
+                self._pos = max(self._pos, len(self._buffer) - len("<think>"))
+                return False
+
+            self._pos = brace
+            self._started = True
+            return True
+
+    def _on_string_end(self, end: int) -> None:
+        if len(self._stack) != 1:
+            return
+
+        value = self._decode(self._buffer[self._string_start : end + 1])
+
+        if not isinstance(value, str):
+            return
+
+        if not self._expect_value:
+            self._current_key = value
+            return
+
+        if self._current_key == "summary":
+            self._events.append(DraftStreamEvent(event="summary", summary=value))
+
+    def _on_container_end(self, opener: str, start: int, end: int) -> None:
+        if opener != "{" or len(self._stack) != 2:
+            return
+
+        parent_opener, _, parent_key = self._stack[1]
+
+        if parent_opener != "[" or parent_key != "recommendations":
+            return
+
+        value = self._decode(self._buffer[start : end + 1])
+
+        if not isinstance(value, dict):
+            return
+
+        try:
+            recommendation = DraftRecommendation.model_validate(value)
+        except ValidationError:
+            logger.warning("Streamed recommendation does not match the schema")
+            return
+
+        self._events.append(
+            DraftStreamEvent(
+                event="recommendation",
+                index=self._recommendation_count,
+                recommendation=recommendation,
+            )
+        )
+        self._recommendation_count += 1
+
+    def _decode(self, raw: str):
+        try:
+            return json.loads(raw)
+        except json.JSONDecodeError:
+            return None
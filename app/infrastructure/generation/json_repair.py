@@ -0,0 +1,125 @@
+_CONTROL_ESCAPES = {
+    "\n": "\\n",
+    "\r": "\\r",
+    "\t": "\\t",
+}
+
+_CLOSERS = {
+    "{": "}",
+    "[": "]",
+}
+
+
+def repair_json(text: str) -> str:
+    """
+    Best-effort repair of common LLM JSON mistakes in a single pass.
+
+    It fixes:
+    - missing commas between values or object members
+    - trailing commas before a closing brace or bracket
+    - raw newlines and tabs inside strings
+    - output cut off by the token limit, by dropping the incomplete tail and
+      closing the open objects and arrays
+
+    The result is not guaranteed to be valid JSON; callers should still
+    handle a decode error.
+    """
+
+    out: list[str] = []
+
+    # Each open container is [opener, expected], where expected is one of
+    # "key", "colon", "value" or "comma".
+    stack: list[list[str]] = []
+
+    in_string = False
+    escape = False
+
+    safe_length = 0
+    safe_openers: list[str] = []
+
+    def value_done() -> None:
+        nonlocal safe_length, safe_openers
+
+        if stack:
+            stack[-1][1] = "comma"
+
+        safe_length = len(out)
+        safe_openers = [opener for opener, _ in stack]
+
+    for char in text:
+        if in_string:
+            if escape:
+                escape = False
+                out.append(char)
+            elif char == "\\":
+                escape = True
+                out.append(char)
+            elif char == '"':
+                in_string = False
+                out.append(char)
+
+                if stack and stack[-1][0] == "{" and stack[-1][1] == "key":
+                    stack[-1][1] = "colon"
+                else:
+                    value_done()
+            else:
+                out.append(_CONTROL_ESCAPES.get(char, char))
+
+            continue
+
+        if char.isspace():
+            out.append(char)
+            continue
+
+        if stack and stack[-1][1] == "comma" and char not in ",}]":
+            out.append(",")
+            stack[-1][1] = "key" if stack[-1][0] == "{" else "value"
+
+        if char == '"':
+            in_string = True
+            out.append(char)
+
+        elif char in "{[":
+            stack.append([char, "key" if char == "{" else "value"])
+            out.append(char)
+
+        elif char in "}]":
+            _drop_trailing_comma(out)
+
+            if stack:
+                stack.pop()
+
+            out.append(char)
+            value_done()
+
+        elif char == ":":
+            if stack and stack[-1][0] == "{":
+                stack[-1][1] = "value"
+
+            out.append(char)
+
+        elif char == ",":
+            if stack:
+                stack[-1][1] = "key" if stack[-1][0] == "{" else "value"
+
+            out.append(char)
+
+        else:
+            out.append(char)
+
+    if in_string or stack:
+        del out[safe_length:]
+        _drop_trailing_comma(out)
+        out.extend(_CLOSERS[opener] for opener in reversed(safe_openers))
+
+    return "".join(out)
+
+
+def _drop_trailing_comma(out: list[str]) -> None:
+    index = len(out) - 1
+
+    while index >= 0 and out[index].isspace():
+        index -= 1
+
+    if index >= 0 and out[index] == ",":
+        del out[index]
@@ -1,11 +1,31 @@
+import hashlib
+import json
 import logging
+import time
+from typing import AsyncIterator
 
 import httpx
 
-from app.domain.models import AIDraft, CaseQuery, RetrievedContext
+from app.core.metrics import (
+    CACHE_REQUESTS,
+    STAGE_DURATION,
+    record_token_usage,
+    stage_timer,
+)
+from app.core.offload import CpuOffloader
+from app.core.resilience import RetryPolicy, call_with_retries, timeout_for
+from app.core.serialization import json_dumps, json_loads
+from app.domain.models import AIDraft, CaseQuery, DraftStreamEvent, RetrievedContext
 from app.domain.protocols import GenerationModel
+from app.infrastructure.cache.backends import CacheBackend
+from app.infrastructure.generation.incremental_draft_parser import IncrementalDraftParser
 from app.infrastructure.generation.response_parser import LLMResponseParser
+from app.infrastructure.generation.response_schema import (
+    RESPONSE_FORMATS,
+    response_format_payload,
+)
 from app.infrastructure.prompts.consultant_prompt_builder import ConsultantPromptBuilder
+from app.infrastructure.prompts.template_registry import PromptTemplate
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +37,26 @@ class OpenAICompatibleGenerationModel(GenerationModel):
     This keeps the AI Service provider-replaceable.
     It can work with local or hosted providers as long as they expose
     /chat/completions with OpenAI-style request/response format.
+
+    Failed completions are retried on transient errors (streams are not,
+    since part of the answer may already have been sent).
+
+    When a response cache is configured, parsed drafts are stored under a hash
+    of the request payload (messages and model parameters), so an identical
+    prompt is answered without calling the provider again. Fallback drafts
+    are never cached.
+
+    With a CPU offloader, large prompts are rendered and large responses
+    parsed in its pool instead of on the event loop.
+
+    Latency, token usage and fallbacks of every provider call are recorded
+    against the prompt template version that produced the prompt.
+
+    response_format selects how JSON output is requested: json_object
+    describes the structure in the prompt, while json_schema and
+    guided_json send the AIDraft schema for constrained decoding; the
+    prompt then leaves out the structure and JSON rules, and the response
+    is validated directly.
     """
 
     def __init__(
@@ -29,7 +69,15 @@ class OpenAICompatibleGenerationModel(GenerationModel):
         max_tokens: int = 1000,
         prompt_builder: ConsultantPromptBuilder | None = None,
         response_parser: LLMResponseParser | None = None,
+        http_client: httpx.AsyncClient | None = None,
+        response_cache: CacheBackend | None = None,
+        retry_policy: RetryPolicy | None = None,
+        cpu_offloader: CpuOffloader | None = None,
+        response_format: str = "json_object",
     ) -> None:
+        if response_format not in RESPONSE_FORMATS:
+            raise ValueError(f"Unsupported response format: {response_format}")
+
         self._base_url = base_url.rstrip("/")
         self._model_name = model_name
         self._api_key = api_key
@@ -38,6 +86,12 @@ class OpenAICompatibleGenerationModel(GenerationModel):
         self._max_tokens = max_tokens
         self._prompt_builder = prompt_builder or ConsultantPromptBuilder()
         self._response_parser = response_parser or LLMResponseParser()
+        self._http_client = http_client or httpx.AsyncClient(timeout=timeout)
+        self._response_cache = response_cache
+        self._retry_policy = retry_policy or RetryPolicy()
+        self._cpu_offloader = cpu_offloader
+        self._response_format = response_format
+        self._constrained = response_format != "json_object"
 
     async def generate_draft(
         self,
@@ -45,22 +99,204 @@ class OpenAICompatibleGenerationModel(GenerationModel):
         contexts: list[RetrievedContext],
         n: int,
     ) -> AIDraft:
-        messages = self._prompt_builder.build_messages(
-            query=query,
-            contexts=contexts,
-            n=n,
-        )
+        template = self._prompt_builder.select(query)
+        payload = await self._build_payload(template, query=query, contexts=contexts, n=n)
+        cache_key = self._cache_key(payload, n)
+
+        cached = await self._get_cached(cache_key)
+
+        if cached is not None:
+            return cached
+
+        body = json_dumps(payload)
+        started = time.perf_counter()
+
+        async def post() -> httpx.Response:
+            with stage_timer("llm_call"):
+                response = await self._http_client.post(
+                    self._completions_url(),
+                    content=body,
+                    headers=self._headers(),
+                    timeout=timeout_for(self._timeout),
+                )
+
+            if response.status_code >= 400:
+                logger.error(
+                    "Generation provider error status=%s body=%s",
+                    response.status_code,
+                    response.text,
+                )
+                response.raise_for_status()
+
+            return response
+
+        response = await call_with_retries(post, "llm", self._retry_policy)
+        data = json_loads(response.content)
+
+        content = data["choices"][0]["message"]["content"]
+        usage = data.get("usage")
+        record_token_usage(usage)
+
+        logger.info("Received generation response from model=%s", self._model_name)
+
+        with stage_timer("response_parse"):
+            draft = await self._parse(content)
+
+        self._record_generation(template, started, usage, draft)
+        await self._store(cache_key, draft)
+
+        return draft
 
-        payload = {
+    async def cached_draft(
+        self,
+        query: CaseQuery,
+        contexts: list[RetrievedContext],
+        n: int,
+    ) -> AIDraft | None:
+        if self._response_cache is None:
+            return None
+
+        template = self._prompt_builder.select(query)
+        payload = await self._build_payload(template, query=query, contexts=contexts, n=n)
+
+        # A miss is counted by the generation that follows.
+        return await self._get_cached(self._cache_key(payload, n), count_miss=False)
+
+    async def stream_draft(
+        self,
+        query: CaseQuery,
+        contexts: list[RetrievedContext],
+        n: int,
+    ) -> AsyncIterator[DraftStreamEvent]:
+        template = self._prompt_builder.select(query)
+        payload = await self._build_payload(template, query=query, contexts=contexts, n=n)
+        cache_key = self._cache_key(payload, n)
+
+        cached = await self._get_cached(cache_key)
+
+        if cached is not None:
+            for event in DraftStreamEvent.from_draft(cached):
+                yield event
+            return
+
+        parser = IncrementalDraftParser()
+        stream_payload = {
+            **payload,
+            "stream": True,
+            "stream_options": {"include_usage": True},
+        }
+
+        started = time.perf_counter()
+        usage = None
+
+        async with self._http_client.stream(
+            "POST",
+            self._completions_url(),
+            content=json_dumps(stream_payload),
+            headers=self._headers(),
+            timeout=timeout_for(self._timeout),
+        ) as response:
+            if response.status_code >= 400:
+                await response.aread()
+                logger.error(
+                    "Generation provider error status=%s body=%s",
+                    response.status_code,
+                    response.text,
+                )
+                response.raise_for_status()
+
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+
+                data = line[len("data:"):].strip()
+
+                if data == "[DONE]":
+                    break
+
+                chunk = json_loads(data)
+                record_token_usage(chunk.get("usage"))
+                usage = chunk.get("usage") or usage
+
+                content = self._delta_content(chunk)
+
+                if content:
+                    for event in parser.feed(content):
+                        yield event
+
+        STAGE_DURATION.labels(stage="llm_call").observe(time.perf_counter() - started)
+
+        logger.info("Received streamed generation response from model=%s", self._model_name)
+
+        with stage_timer("response_parse"):
+            draft = await self._parse(parser.text)
+
+        self._record_generation(template, started, usage, draft)
+        await self._store(cache_key, draft)
+
+        yield DraftStreamEvent(event="done", draft=draft)
+
+    async def _build_payload(
+        self,
+        template: PromptTemplate,
+        query: CaseQuery,
+        contexts: list[RetrievedContext],
+        n: int,
+    ) -> dict:
+        with stage_timer("prompt_build"):
+            if self._cpu_offloader is None:
+                messages = template.build_messages(
+                    query=query,
+                    contexts=contexts,
+                    n=n,
+                    constrained=self._constrained,
+                )
+            else:
+                messages = await self._cpu_offloader.run(
+                    "prompt_build",
+                    template.build_messages,
+                    query=query,
+                    contexts=contexts,
+                    n=n,
+                    constrained=self._constrained,
+                    size=len(query.text) + sum(len(context.raw_text) for context in contexts),
+                )
+
+        return {
             "model": self._model_name,
             "messages": messages,
             "temperature": self._temperature,
             "max_tokens": self._max_tokens,
-            "response_format": {
-                "type": "json_object"
-            },
+            **response_format_payload(self._response_format, n),
         }
 
+    async def _parse(self, content: str) -> AIDraft:
+        if self._cpu_offloader is None:
+            return self._response_parser.parse_ai_draft(content, strict=self._constrained)
+
+        return await self._cpu_offloader.run(
+            "response_parse",
+            self._response_parser.parse_ai_draft,
+            content,
+            strict=self._constrained,
+            size=len(content),
+        )
+
+    def _record_generation(
+        self,
+        template: PromptTemplate,
+        started: float,
+        usage: dict | None,
+        draft: AIDraft,
+    ) -> None:
+        self._prompt_builder.record_generation(
+            template,
+            latency=time.perf_counter() - started,
+            usage=usage,
+            fallback=self._response_parser.is_fallback(draft),
+        )
+
+    def _headers(self) -> dict[str, str]:
         headers = {
             "Content-Type": "application/json",
         }
@@ -68,23 +304,52 @@ class OpenAICompatibleGenerationModel(GenerationModel):
         if self._api_key:
             headers["Authorization"] = f"Bearer {self._api_key}"
 
-        url = f"{self._base_url}/chat/completions"
+        return headers
 
-        async with httpx.AsyncClient(timeout=self._timeout) as client:
-            response = await client.post(url, json=payload, headers=headers)
+    def _completions_url(self) -> str:
+        return f"{self._base_url}/chat/completions"
 
-            if response.status_code >= 400:
-                logger.error(
-                    "Generation provider error status=%s body=%s",
-                    response.status_code,
-                    response.text,
-                )
-                response.raise_for_status()
+    def _delta_content(self, chunk: dict) -> str | None:
+        choices = chunk.get("choices") or []
 
-            data = response.json()
+        if not choices:
+            return None
 
-        content = data["choices"][0]["message"]["content"]
+        return (choices[0].get("delta") or {}).get("content")
 
-        logger.info("Received generation response from model=%s", self._model_name)
+    async def _get_cached(self, cache_key: str, count_miss: bool = True) -> AIDraft | None:
+        if self._response_cache is None:
+            return None
+
+        cached = await self._response_cache.get(cache_key)
+
+        if cached is None:
+            if count_miss:
+                CACHE_REQUESTS.labels(cache="generation", result="miss").inc()
+
+            return None
+
+        CACHE_REQUESTS.labels(cache="generation", result="hit").inc()
+
+        logger.info("Generation cache hit for model=%s", self._model_name)
+
+        return AIDraft.model_validate_json(cached)
+
+    async def _store(self, cache_key: str, draft: AIDraft) -> None:
+        if self._response_cache is None or self._response_parser.is_fallback(draft):
+            return
+
+        await self._response_cache.set(
+            cache_key,
+            draft.model_dump_json().encode("utf-8"),
+        )
+
+    def _cache_key(self, payload: dict, n: int) -> str:
+        canonical = json.dumps(
+            {**payload, "n": n},
+            sort_keys=True,
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
 
-        return self._response_parser.parse_ai_draft(content)
\ No newline at end of file
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
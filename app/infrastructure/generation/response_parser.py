@@ -5,36 +5,87 @@ from typing import Any
 
 from pydantic import ValidationError
 
+from app.core.metrics import PARSER_FALLBACKS, PARSER_REPAIRS, PARSER_SCHEMA_MISSES
 from app.domain.models import AIDraft, DraftRecommendation
+from app.infrastructure.generation.json_repair import repair_json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
 
+FALLBACK_SUMMARY = "The model returned an unstructured draft."
+
+_THINK_OPEN = re.compile(r"<think>", flags=re.IGNORECASE)
+_THINK_CLOSE = re.compile(r"</think>\s*", flags=re.IGNORECASE)
+_JSON_FENCE = re.compile(r"```json", flags=re.IGNORECASE)
+
+
 class LLMResponseParser:
     """
     Parses LLM output into the AI Service domain model.
 
     The model is instructed to return JSON, but this parser is defensive
     because LLMs may still return markdown, text, or malformed JSON.
+
+    Parsing goes through increasingly expensive stages:
+    1. clean JSON is validated directly with AIDraft.model_validate_json
+    2. <think> blocks and markdown fences are skipped with a linear scan and
+       the JSON candidate is decoded (with orjson when it is installed)
+    3. a malformed candidate is repaired and decoded again, and invalid
+       recommendations are dropped instead of rejecting the whole draft
+    4. anything else becomes an unstructured fallback draft
+
+    With strict=True (the provider enforced the AIDraft JSON schema) the
+    text is validated as is, without looking for JSON first; the other
+    stages only run if that fails, e.g. when the output hit the token limit.
     """
 
-    def parse_ai_draft(self, text: str) -> AIDraft:
+    def __init__(self, use_orjson: bool = True) -> None:
+        self._use_orjson = use_orjson and orjson is not None
+
+    def parse_ai_draft(self, text: str, strict: bool = False) -> AIDraft:
+        if strict:
+            try:
+                return AIDraft.model_validate_json(text)
+            except ValidationError:
+                logger.warning("Schema-constrained output did not validate, parsing defensively")
+                PARSER_SCHEMA_MISSES.inc()
+
+        draft = self._try_fast_path(text)
+
+        if draft is not None:
+            return draft
+
         cleaned = self._clean_output(text)
         candidate = self._extract_json_candidate(cleaned)
 
         if candidate:
             parsed = self._try_parse_json(candidate)
+            repaired = False
+
+            if parsed is None:
+                parsed = self._try_parse_json(repair_json(candidate))
+                repaired = parsed is not None
 
             if parsed is not None:
                 draft = self._try_build_ai_draft(parsed)
 
                 if draft is not None:
+                    if repaired:
+                        logger.info("Repaired malformed LLM JSON output")
+                        PARSER_REPAIRS.inc()
+
                     return draft
 
         logger.warning("Falling back to plain-text AI draft parsing")
+        PARSER_FALLBACKS.inc()
 
         return AIDraft(
-            summary="The model returned an unstructured draft.",
+            summary=FALLBACK_SUMMARY,
             recommendations=[
                 DraftRecommendation(
                     title="AI-generated draft",
@@ -48,25 +99,63 @@ class LLMResponseParser:
             ],
         )
 
+    def is_fallback(self, draft: AIDraft) -> bool:
+        """
+        Whether the draft is the unstructured fallback rather than parsed JSON.
+        """
+
+        return draft.summary == FALLBACK_SUMMARY
+
+    def _try_fast_path(self, text: str) -> AIDraft | None:
+        stripped = text.strip()
+
+        if not (stripped.startswith("{") and stripped.endswith("}")):
+            return None
+
+        try:
+            return AIDraft.model_validate_json(stripped)
+        except ValidationError:
+            return None
+
     def _clean_output(self, text: str) -> str:
-        without_thinking = re.sub(
-            r"<think>[\s\S]*?</think>\s*",
-            "",
-            text,
-            flags=re.IGNORECASE,
-        )
+        if "<" not in text:
+            return text.strip()
+
+        parts = []
+        position = 0
+
+        while True:
+            opening = _THINK_OPEN.search(text, position)
+
+            if opening is None:
+                break
 
-        return without_thinking.strip()
+            closing = _THINK_CLOSE.search(text, opening.end())
+
+            if closing is None:
+                break
+
+            parts.append(text[position : opening.start()])
+            position = closing.end()
+
+        parts.append(text[position:])
+
+        return "".join(parts).strip()
 
     def _extract_json_candidate(self, text: str) -> str | None:
-        fenced_object = re.search(
-            r"```json\s*(\{[\s\S]*?\})\s*```",
-            text,
-            flags=re.IGNORECASE,
-        )
+        fence = _JSON_FENCE.search(text)
+
+        if fence is not None:
+            fence_end = text.find("```", fence.end())
 
-        if fenced_object:
-            return fenced_object.group(1)
+            if fence_end != -1:
+                fenced = text[fence.end() : fence_end].strip()
+
+                if fenced.startswith("{") and fenced.endswith("}"):
+                    return fenced
+
+        if text.startswith("[") and text.endswith("]"):
+            return text
 
         start = text.find("{")
         end = text.rfind("}")
@@ -74,11 +163,19 @@ class LLMResponseParser:
         if start != -1 and end != -1 and end > start:
             return text[start : end + 1]
 
+        if start != -1:
+            # The output was probably cut off; let the repair stage close it.
+            return text[start:]
+
         return None
 
     def _try_parse_json(self, candidate: str) -> Any | None:
         try:
+            if self._use_orjson:
+                return orjson.loads(candidate)
+
             return json.loads(candidate)
+
         except json.JSONDecodeError:
             logger.warning("Failed to parse LLM JSON candidate")
             return None
@@ -104,4 +201,29 @@ class LLMResponseParser:
         except ValidationError:
             logger.warning("Parsed JSON does not match AIDraft schema")
 
-        return None
\ No newline at end of file
+            if isinstance(parsed, dict):
+                return self._salvage(parsed)
+
+        return None
+
+    def _salvage(self, parsed: dict) -> AIDraft | None:
+        """
+        Keep the valid recommendations of a draft whose other items are
+        incomplete, typically because the output hit the token limit.
+        """
+
+        recommendations = []
+
+        for item in parsed.get("recommendations") or []:
+            try:
+                recommendations.append(DraftRecommendation.model_validate(item))
+            except ValidationError:
+                continue
+
+        if not isinstance(parsed.get("summary"), str) or not recommendations:
+            return None
+
+        try:
+            return AIDraft.model_validate({**parsed, "recommendations": recommendations})
+        except ValidationError:
+            return None
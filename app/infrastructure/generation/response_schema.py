@@ -0,0 +1,117 @@
+import copy
+from functools import lru_cache
+
+from app.domain.models import AIDraft
+
+RESPONSE_FORMATS = ("json_object", "json_schema", "guided_json")
+
+# Filled in by the service after generation, never by the model.
+_SERVER_FIELDS = ("used_context",)
+
+# Annotations that do not constrain decoding; some backends reject them in
+# strict mode.
+_IGNORED_KEYWORDS = ("title", "default", "description")
+
+
+@lru_cache(maxsize=16)
+def _draft_schema(n: int | None) -> dict:
+    schema = AIDraft.model_json_schema()
+    definitions = schema.pop("$defs", {})
+
+    for field in _SERVER_FIELDS:
+        schema["properties"].pop(field, None)
+
+    schema = _strict(_inline(schema, definitions))
+
+    if n is not None:
+        schema["properties"]["recommendations"]["minItems"] = n
+        schema["properties"]["recommendations"]["maxItems"] = n
+
+    return schema
+
+
+def ai_draft_response_schema(n: int | None = None) -> dict:
+    """
+    JSON schema of the AIDraft the model has to produce, for constrained
+    decoding.
+
+    Server-side fields (used_context) are left out. Every object lists all
+    its properties as required and forbids additional ones, as strict
+    json_schema mode requires; references are inlined for backends that do
+    not resolve $ref. With n, the recommendation count is fixed to n.
+    """
+
+    return copy.deepcopy(_draft_schema(n))
+
+
+def response_format_payload(response_format: str, n: int) -> dict:
+    """
+    Request fields asking the provider for JSON output.
+
+    - json_object: any JSON object; the prompt describes the structure
+    - json_schema: OpenAI-style structured output (OpenAI, vLLM, llama.cpp
+      server, LM Studio)
+    - guided_json: vLLM's guided decoding parameter
+    """
+
+    if response_format == "json_object":
+        return {"response_format": {"type": "json_object"}}
+
+    schema = _draft_schema(n)
+
+    if response_format == "json_schema":
+        return {
+            "response_format": {
+                "type": "json_schema",
+                "json_schema": {"name": "ai_draft", "strict": True, "schema": schema},
+            }
+        }
+
+    if response_format == "guided_json":
+        return {"guided_json": schema}
+
+    raise ValueError(f"Unsupported response format: {response_format}")
+
+
+def _inline(node, definitions: dict):
+    if isinstance(node, dict):
+        reference = node.get("$ref")
+
+        if reference is not None:
+            return _inline(definitions[reference.rsplit("/", 1)[-1]], definitions)
+
+        inlined = {
+            key: _inline(value, definitions)
+            for key, value in node.items()
+            if key not in _IGNORED_KEYWORDS and key != "properties"
+        }
+
+        # Property names are not keywords; a field may be called "title".
+        if "properties" in node:
+            inlined["properties"] = {
+                name: _inline(value, definitions)
+                for name, value in node["properties"].items()
+            }
+
+        return inlined
+
+    if isinstance(node, list):
+        return [_inline(item, definitions) for item in node]
+
+    return node
+
+
+def _strict(node):
+    if isinstance(node, dict):
+        node = {key: _strict(value) for key, value in node.items()}
+
+        if node.get("type") == "object" and "properties" in node:
+            node["required"] = list(node["properties"])
+            node["additionalProperties"] = False
+
+        return node
+
+    if isinstance(node, list):
+        return [_strict(item) for item in node]
+
+    return node
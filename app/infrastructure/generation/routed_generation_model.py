@@ -0,0 +1,344 @@
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from dataclasses import dataclass
+from functools import partial
+from typing import AsyncIterator
+
+from app.core.exceptions import ServiceUnavailable
+from app.core.metrics import LLM_BACKEND_REQUESTS, LLM_HEDGED_REQUESTS
+from app.domain.models import AIDraft, CaseQuery, DraftStreamEvent, RetrievedContext
+from app.domain.protocols import GenerationModel
+from app.infrastructure.generation.circuit_breaker import CircuitBreaker
+from app.infrastructure.generation.response_parser import LLMResponseParser
+
+logger = logging.getLogger(__name__)
+
+# Below this many observed latencies the configured hedge delay is used
+# instead of the measured p95.
+MIN_LATENCY_SAMPLES = 20
+
+
+@dataclass
+class GenerationBackend:
+    name: str
+    model: GenerationModel
+    weight: float = 1.0
+
+
+class _BackendState:
+    def __init__(
+        self,
+        backend: GenerationBackend,
+        breaker: CircuitBreaker,
+    ) -> None:
+        self.backend = backend
+        self.breaker = breaker
+        self.outstanding = 0
+
+    @property
+    def name(self) -> str:
+        return self.backend.name
+
+    def load(self) -> float:
+        return (self.outstanding + 1) / self.backend.weight
+
+
+class RoutedGenerationModel(GenerationModel):
+    """
+    Spreads generations over several backends (usually OpenAI-compatible
+    endpoints serving the same model).
+
+    - balancing: each request goes to the healthy backend with the fewest
+      outstanding requests relative to its weight
+    - health: every backend has a circuit breaker; backends with an open
+      circuit are skipped until a probe request succeeds
+    - failover: when a backend fails, the request is retried on the next
+      backend that was not tried yet
+    - hedging (optional): when the first backend has not answered after the
+      observed p95 latency, a second backend is started and the first valid
+      draft wins; the other request is cancelled
+
+    A fallback (unstructured) draft is only returned when no backend produced
+    a structured one.
+    """
+
+    def __init__(
+        self,
+        backends: list[GenerationBackend],
+        hedge_enabled: bool = False,
+        hedge_delay: float = 10.0,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        latency_window: int = 200,
+        response_parser: LLMResponseParser | None = None,
+    ) -> None:
+        if not backends:
+            raise ValueError("At least one generation backend is required")
+
+        if any(backend.weight <= 0 for backend in backends):
+            raise ValueError("Backend weights must be positive")
+
+        self._states = [
+            _BackendState(
+                backend=backend,
+                breaker=CircuitBreaker(
+                    failure_threshold=failure_threshold,
+                    reset_timeout=reset_timeout,
+                ),
+            )
+            for backend in backends
+        ]
+        self._hedge_enabled = hedge_enabled and len(backends) > 1
+        self._hedge_delay = hedge_delay
+        self._latencies: deque[float] = deque(maxlen=latency_window)
+        self._response_parser = response_parser or LLMResponseParser()
+
+    async def generate_draft(
+        self,
+        query: CaseQuery,
+        contexts: list[RetrievedContext],
+        n: int,
+    ) -> AIDraft:
+        tried: set[str] = set()
+        tasks: dict[asyncio.Task, _BackendState] = {}
+        hedge_task: asyncio.Task | None = None
+        fallback_draft: AIDraft | None = None
+        last_error: Exception | None = None
+
+        def launch() -> asyncio.Task | None:
+            state = self._select(exclude=tried)
+
+            if state is None:
+                return None
+
+            tried.add(state.name)
+
+            # Outstanding requests are counted when the backend is picked, so
+            # concurrent selections see each other.
+            started = self._on_start(state)
+            task = asyncio.create_task(
+                state.backend.model.generate_draft(
+                    query=query,
+                    contexts=contexts,
+                    n=n,
+                )
+            )
+            task.add_done_callback(partial(self._on_done, state, started))
+            tasks[task] = state
+
+            return task
+
+        if launch() is None:
+            raise ServiceUnavailable("No healthy generation backend is available")
+
+        hedge_pending = self._hedge_enabled
+
+        try:
+            while tasks:
+                done, _ = await asyncio.wait(
+                    tasks,
+                    timeout=self.hedge_delay() if hedge_pending else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+
+                if not done:
+                    hedge_pending = False
+                    hedge_task = launch()
+
+                    if hedge_task is not None:
+                        logger.info(
+                            "Hedging generation on backend=%s",
+                            tasks[hedge_task].name,
+                        )
+
+                    continue
+
+                for task in done:
+                    tasks.pop(task)
+
+                    if task.exception() is not None:
+                        last_error = task.exception()
+                        continue
+
+                    draft = task.result()
+
+                    if not self._response_parser.is_fallback(draft):
+                        if hedge_task is not None:
+                            LLM_HEDGED_REQUESTS.labels(
+                                result="won" if task is hedge_task else "lost"
+                            ).inc()
+
+                        return draft
+
+                    fallback_draft = fallback_draft or draft
+
+                if not tasks and fallback_draft is None:
+                    launch()
+
+        finally:
+            for task in tasks:
+                task.cancel()
+
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+        if fallback_draft is not None:
+            return fallback_draft
+
+        raise ServiceUnavailable("All generation backends failed") from last_error
+
+    async def cached_draft(
+        self,
+        query: CaseQuery,
+        contexts: list[RetrievedContext],
+        n: int,
+    ) -> AIDraft | None:
+        """
+        A cached draft of any backend; a lookup does not call the backend, so
+        circuit breakers are not consulted.
+        """
+
+        for state in self._states:
+            draft = await state.backend.model.cached_draft(query=query, contexts=contexts, n=n)
+
+            if draft is not None:
+                return draft
+
+        return None
+
+    async def stream_draft(
+        self,
+        query: CaseQuery,
+        contexts: list[RetrievedContext],
+        n: int,
+    ) -> AsyncIterator[DraftStreamEvent]:
+        """
+        Stream from one backend. Failover only happens before the first event
+        is emitted; a stream is never hedged.
+        """
+
+        tried: set[str] = set()
+        last_error: Exception | None = None
+
+        while True:
+            state = self._select(exclude=tried)
+
+            if state is None:
+                raise ServiceUnavailable(
+                    "All generation backends failed"
+                ) from last_error
+
+            tried.add(state.name)
+            emitted = False
+            started = self._on_start(state)
+
+            try:
+                async for event in state.backend.model.stream_draft(
+                    query=query,
+                    contexts=contexts,
+                    n=n,
+                ):
+                    emitted = True
+                    yield event
+
+            except (asyncio.CancelledError, GeneratorExit):
+                self._on_cancelled(state)
+                raise
+
+            except Exception as exc:
+                self._on_failure(state, exc)
+
+                if emitted:
+                    raise
+
+                last_error = exc
+                continue
+
+            self._on_success(state, started)
+            return
+
+    def hedge_delay(self) -> float:
+        """
+        p95 of recent successful generation latencies, or the configured
+        delay until enough latencies were observed.
+        """
+
+        if len(self._latencies) < MIN_LATENCY_SAMPLES:
+            return self._hedge_delay
+
+        ordered = sorted(self._latencies)
+
+        return ordered[int((len(ordered) - 1) * 0.95)]
+
+    def stats(self) -> list[dict]:
+        return [
+            {
+                "name": state.name,
+                "weight": state.backend.weight,
+                "outstanding": state.outstanding,
+                "circuit": state.breaker.state,
+                "consecutive_failures": state.breaker.consecutive_failures,
+            }
+            for state in self._states
+        ]
+
+    def _select(self, exclude: set[str]) -> _BackendState | None:
+        candidates = [
+            state
+            for state in self._states
+            if state.name not in exclude and state.breaker.allows_request()
+        ]
+
+        if not candidates:
+            return None
+
+        lowest = min(state.load() for state in candidates)
+
+        return random.choice(
+            [state for state in candidates if state.load() == lowest]
+        )
+
+    def _on_done(
+        self,
+        state: _BackendState,
+        started: float,
+        task: asyncio.Task,
+    ) -> None:
+        if task.cancelled():
+            self._on_cancelled(state)
+        elif task.exception() is not None:
+            self._on_failure(state, task.exception())
+        else:
+            self._on_success(state, started)
+
+    def _on_start(self, state: _BackendState) -> float:
+        state.outstanding += 1
+        state.breaker.on_request()
+
+        return time.perf_counter()
+
+    def _on_success(self, state: _BackendState, started: float) -> None:
+        state.outstanding -= 1
+        state.breaker.record_success()
+        self._latencies.append(time.perf_counter() - started)
+        LLM_BACKEND_REQUESTS.labels(backend=state.name, result="success").inc()
+
+    def _on_failure(self, state: _BackendState, exc: Exception) -> None:
+        state.outstanding -= 1
+        state.breaker.record_failure()
+        LLM_BACKEND_REQUESTS.labels(backend=state.name, result="error").inc()
+
+        logger.warning(
+            "Generation backend=%s failed circuit=%s: %s",
+            state.name,
+            state.breaker.state,
+            exc,
+        )
+
+    def _on_cancelled(self, state: _BackendState) -> None:
+        state.outstanding -= 1
+        state.breaker.record_cancelled()
+        LLM_BACKEND_REQUESTS.labels(backend=state.name, result="cancelled").inc()
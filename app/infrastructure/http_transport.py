@@ -0,0 +1,110 @@
+import logging
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+class HttpTransportRegistry:
+    """
+    Owns the long-lived HTTP connection pools used by outbound service clients.
+
+    Each upstream (Embedding Service, Case Service, LLM provider) gets one
+    named httpx.AsyncClient so connections are kept alive and reused instead
+    of paying a TCP/TLS handshake on every call.
+
+    The registry is created during application startup and closed on shutdown.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        http2: bool = False,
+    ) -> None:
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._http2 = http2
+        self._clients: dict[str, httpx.AsyncClient] = {}
+        self._transports: dict[str, httpx.AsyncHTTPTransport] = {}
+
+    def get_client(
+        self,
+        name: str,
+        timeout: float = 120,
+    ) -> httpx.AsyncClient:
+        """
+        Return the shared client for an upstream, creating it on first use.
+        """
+
+        client = self._clients.get(name)
+
+        if client is not None and not client.is_closed:
+            return client
+
+        transport = httpx.AsyncHTTPTransport(
+            limits=self._limits,
+            http2=self._http2,
+        )
+
+        client = httpx.AsyncClient(
+            transport=transport,
+            timeout=timeout,
+        )
+
+        self._transports[name] = transport
+        self._clients[name] = client
+
+        logger.info(
+            "Created HTTP connection pool name=%s max_connections=%s http2=%s",
+            name,
+            self._limits.max_connections,
+            self._http2,
+        )
+
+        return client
+
+    def stats(self) -> dict[str, dict]:
+        """
+        Pool utilization per upstream.
+
+        httpx does not expose pool state publicly, so this reads the
+        underlying httpcore pool and degrades to an empty view if the
+        internals change.
+        """
+
+        result: dict[str, dict] = {}
+
+        for name, transport in self._transports.items():
+            pool = getattr(transport, "_pool", None)
+            connections = list(getattr(pool, "connections", []))
+            requests = getattr(pool, "_requests", [])
+
+            idle = sum(1 for connection in connections if connection.is_idle())
+
+            result[name] = {
+                "max_connections": self._limits.max_connections,
+                "max_keepalive_connections": self._limits.max_keepalive_connections,
+                "keepalive_expiry": self._limits.keepalive_expiry,
+                "http2": self._http2,
+                "connections": len(connections),
+                "active": len(connections) - idle,
+                "idle": idle,
+                "in_flight_requests": len(requests),
+                "closed": self._clients[name].is_closed,
+            }
+
+        return result
+
+    async def aclose(self) -> None:
+        for name, client in self._clients.items():
+            if not client.is_closed:
+                await client.aclose()
+                logger.info("Closed HTTP connection pool name=%s", name)
+
+        self._clients.clear()
+        self._transports.clear()
@@ -0,0 +1,137 @@
+import math
+import re
+
+from app.domain.models import CaseQuery, PackedContexts, RetrievedContext
+from app.domain.protocols import ContextPacker
+
+
+_WORD = re.compile(r"\w+", flags=re.UNICODE)
+
+# Chunks that would be cut below this size are dropped instead.
+_MIN_CHUNK_TOKENS = 32
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Cheap token estimate (about four characters per token).
+
+    It does not depend on the model tokenizer, so budgets should keep
+    some headroom.
+    """
+
+    return math.ceil(len(text) / 4)
+
+
+class TokenBudgetContextPacker(ContextPacker):
+    """
+    Fits retrieved context into a token budget.
+
+    The budget is the model context window minus the output tokens, the
+    fixed prompt instructions, and the case text itself. Chunks are then
+    selected greedily by similarity:
+    - near-duplicates of an already selected chunk are dropped
+    - chunks longer than max_chunk_tokens are truncated
+    - the last chunk that fits is truncated to the remaining budget
+    - everything after the budget is exhausted is dropped
+    """
+
+    def __init__(
+        self,
+        context_window: int = 32768,
+        max_output_tokens: int = 1000,
+        reserved_tokens: int = 800,
+        max_chunk_tokens: int = 1000,
+        duplicate_threshold: float = 0.9,
+    ) -> None:
+        self._context_window = context_window
+        self._max_output_tokens = max_output_tokens
+        self._reserved_tokens = reserved_tokens
+        self._max_chunk_tokens = max_chunk_tokens
+        self._duplicate_threshold = duplicate_threshold
+
+    def pack(
+        self,
+        query: CaseQuery,
+        contexts: list[RetrievedContext],
+    ) -> PackedContexts:
+        remaining = self._budget(query)
+
+        selected: list[RetrievedContext] = []
+        selected_shingles: list[set[tuple[str, ...]]] = []
+        statuses = {}
+
+        for context in sorted(contexts, key=lambda item: item.similarity, reverse=True):
+            shingles = self._shingles(context.raw_text)
+
+            if self._is_duplicate(shingles, selected_shingles):
+                statuses[context.id] = "duplicate"
+                continue
+
+            limit = min(self._max_chunk_tokens, remaining)
+
+            if limit < _MIN_CHUNK_TOKENS:
+                statuses[context.id] = "over_budget"
+                continue
+
+            tokens = estimate_tokens(context.raw_text)
+
+            if tokens > limit:
+                context = context.model_copy(
+                    update={"raw_text": self._truncate(context.raw_text, limit)}
+                )
+                tokens = limit
+                statuses[context.id] = "truncated"
+            else:
+                statuses[context.id] = "included"
+
+            selected.append(context)
+            selected_shingles.append(shingles)
+            remaining -= tokens
+
+        return PackedContexts(selected=selected, statuses=statuses)
+
+    def _budget(self, query: CaseQuery) -> int:
+        return max(
+            0,
+            self._context_window
+            - self._max_output_tokens
+            - self._reserved_tokens
+            - estimate_tokens(query.text),
+        )
+
+    def _truncate(self, text: str, max_tokens: int) -> str:
+        max_chars = max_tokens * 4
+        cut = text[:max_chars]
+        space = cut.rfind(" ")
+
+        if space > max_chars // 2:
+            cut = cut[:space]
+
+        return cut.rstrip() + " ..."
+
+    def _shingles(self, text: str, size: int = 3) -> set[tuple[str, ...]]:
+        words = _WORD.findall(text.lower())
+
+        if len(words) < size:
+            return {tuple(words)} if words else set()
+
+        return {tuple(words[index : index + size]) for index in range(len(words) - size + 1)}
+
+    def _is_duplicate(
+        self,
+        shingles: set[tuple[str, ...]],
+        selected_shingles: list[set[tuple[str, ...]]],
+    ) -> bool:
+        if not shingles:
+            return False
+
+        for other in selected_shingles:
+            if not other:
+                continue
+
+            similarity = len(shingles & other) / len(shingles | other)
+
+            if similarity >= self._duplicate_threshold:
+                return True
+
+        return False
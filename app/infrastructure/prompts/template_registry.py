@@ -0,0 +1,420 @@
+import asyncio
+import logging
+import string
+import time
+import tomllib
+from dataclasses import dataclass
+from pathlib import Path
+
+from app.core.metrics import (
+    PROMPT_GENERATION_DURATION,
+    PROMPT_GENERATIONS,
+    PROMPT_TEMPLATE_RELOADS,
+    PROMPT_TOKENS,
+)
+from app.domain.models import CaseQuery, RetrievedContext
+
+logger = logging.getLogger(__name__)
+
+BUILTIN_TEMPLATES_DIR = Path(__file__).parent / "templates"
+
+PLACEHOLDERS = frozenset({"case", "speciality", "language", "prompt_version", "context", "n"})
+
+CONTEXT_FORMATS = ("scored", "ranked")
+
+
+class PromptTemplateError(ValueError):
+    pass
+
+
+def compile_template(text: str, source: str) -> str:
+    """
+    Turn a $placeholder template into a str.format string.
+
+    Unknown or malformed placeholders are rejected here, once, instead of
+    on the first request that renders the template.
+    """
+
+    parts = []
+    position = 0
+
+    for match in string.Template.pattern.finditer(text):
+        parts.append(_escape(text[position:match.start()]))
+        position = match.end()
+
+        if match.group("escaped") is not None:
+            parts.append("$")
+            continue
+
+        name = match.group("named") or match.group("braced")
+
+        if name is None:
+            raise PromptTemplateError(f"{source}: invalid placeholder at offset {match.start()}")
+
+        if name not in PLACEHOLDERS:
+            raise PromptTemplateError(f"{source}: unknown placeholder ${name}")
+
+        parts.append("{" + name + "}")
+
+    parts.append(_escape(text[position:]))
+
+    return "".join(parts)
+
+
+def _escape(literal: str) -> str:
+    return literal.replace("{", "{{").replace("}", "}}")
+
+
+@dataclass(frozen=True)
+class MessageTemplates:
+    """
+    Compiled system and user message templates.
+
+    A system message without placeholders is rendered once at load time;
+    it is then byte-identical for every request.
+    """
+
+    system: str
+    user: str
+    static_system: bool
+
+    def render(self, values: dict) -> list[dict[str, str]]:
+        system_message = self.system if self.static_system else self.system.format_map(values)
+
+        return [
+            {"role": "system", "content": system_message},
+            {"role": "user", "content": self.user.format_map(values)},
+        ]
+
+
+@dataclass(frozen=True)
+class PromptTemplate:
+    """
+    One prompt version, optionally specific to a speciality, precompiled
+    into str.format strings.
+
+    constrained_messages are used when the provider enforces the response
+    JSON schema itself, so the prompt can leave out the output structure
+    and JSON rules; without a [constrained] table they are the same as
+    messages.
+    """
+
+    version: str
+    speciality: str | None
+    context_format: str
+    messages: MessageTemplates
+    constrained_messages: MessageTemplates
+    source: str
+
+    @property
+    def static_system(self) -> bool:
+        return self.messages.static_system and self.constrained_messages.static_system
+
+    def build_messages(
+        self,
+        query: CaseQuery,
+        contexts: list[RetrievedContext],
+        n: int,
+        constrained: bool = False,
+    ) -> list[dict[str, str]]:
+        values = {
+            "case": query.text,
+            "speciality": query.speciality or "general consultation",
+            "language": query.language or "en",
+            "prompt_version": self.version,
+            "context": self._build_context_block(contexts),
+            "n": n,
+        }
+
+        messages = self.constrained_messages if constrained else self.messages
+
+        return messages.render(values)
+
+    def _build_context_block(self, contexts: list[RetrievedContext]) -> str:
+        if not contexts:
+            return "No retrieved context was found."
+
+        if self.context_format == "ranked":
+            # Similarity scores are left out so a chunk renders the same for
+            # every case that retrieves it; the order already ranks them.
+            ordered = sorted(contexts, key=lambda context: (-context.similarity, str(context.id)))
+
+            return "\n\n".join(
+                f"[{index}] source={context.source}\n{context.raw_text}"
+                for index, context in enumerate(ordered, start=1)
+            )
+
+        return "\n\n".join(
+            f"[{index}] "
+            f"source={context.source}, "
+            f"similarity={context.similarity:.3f}\n"
+            f"{context.raw_text}"
+            for index, context in enumerate(contexts, start=1)
+        )
+
+
+def load_template(path: Path) -> PromptTemplate:
+    """
+    Load a TOML template with version, optional speciality and
+    context_format, the system and user message templates, and an optional
+    [constrained] table overriding either message for schema-constrained
+    decoding.
+    """
+
+    try:
+        data = tomllib.loads(path.read_text(encoding="utf-8"))
+    except (OSError, tomllib.TOMLDecodeError) as exc:
+        raise PromptTemplateError(f"{path}: {exc}") from exc
+
+    missing = [key for key in ("version", "system", "user") if not data.get(key)]
+
+    if missing:
+        raise PromptTemplateError(f"{path}: missing {', '.join(missing)}")
+
+    constrained = data.get("constrained", {})
+
+    if not isinstance(constrained, dict):
+        raise PromptTemplateError(f"{path}: constrained must be a table")
+
+    _require_strings(data, ("version", "speciality", "context_format", "system", "user"), str(path))
+    _require_strings(constrained, ("system", "user"), f"{path} [constrained]")
+
+    context_format = data.get("context_format", "scored")
+
+    if context_format not in CONTEXT_FORMATS:
+        raise PromptTemplateError(f"{path}: unsupported context_format {context_format}")
+
+    return PromptTemplate(
+        version=data["version"],
+        speciality=(data.get("speciality") or "").strip().lower() or None,
+        context_format=context_format,
+        messages=_compile_messages(data["system"], data["user"], str(path)),
+        constrained_messages=_compile_messages(
+            constrained.get("system") or data["system"],
+            constrained.get("user") or data["user"],
+            f"{path} [constrained]",
+        ),
+        source=str(path),
+    )
+
+
+def _require_strings(data: dict, keys: tuple[str, ...], source: str) -> None:
+    for key in keys:
+        if key in data and not isinstance(data[key], str):
+            raise PromptTemplateError(f"{source}: {key} must be a string")
+
+
+def _compile_messages(system: str, user: str, source: str) -> MessageTemplates:
+    system = compile_template(system.strip(), source)
+    static_system = not any("{" + name + "}" in system for name in PLACEHOLDERS)
+
+    if static_system:
+        system = system.format()
+
+    return MessageTemplates(
+        system=system,
+        user=compile_template(user.strip(), source),
+        static_system=static_system,
+    )
+
+
+class PromptTemplateRegistry:
+    """
+    Versioned prompt templates loaded from *.toml files.
+
+    Directories are read in order, so a template in a later directory
+    replaces a built-in one with the same version and speciality. A request
+    gets the template for its prompt_version and speciality, falling back
+    to the version's generic template and then to the default version.
+
+    Files are loaded and compiled once. reload_if_changed(), run
+    periodically after start_watching(), reloads them when a file is added,
+    removed or modified; a reload that fails keeps the templates already
+    loaded.
+
+    Per-version generation counts, fallbacks, latency and token usage are
+    kept for stats() and exported as Prometheus metrics, so prompt versions
+    can be compared under real traffic.
+    """
+
+    def __init__(
+        self,
+        directories: list[Path] | None = None,
+        default_version: str = "default_v1",
+    ) -> None:
+        self._directories = directories or [BUILTIN_TEMPLATES_DIR]
+        self._default_version = default_version
+        self._templates: dict[tuple[str, str | None], PromptTemplate] = {}
+        self._mtimes: dict[Path, float] = {}
+        self._loaded_at = 0.0
+        self._stats: dict[str, dict[str, float]] = {}
+        self._watch_task: asyncio.Task | None = None
+
+        self.reload()
+
+    def select(self, prompt_version: str | None, speciality: str | None) -> PromptTemplate:
+        speciality = (speciality or "").strip().lower() or None
+
+        for version in (prompt_version, self._default_version):
+            if version is None:
+                continue
+
+            template = self._templates.get((version, speciality)) or self._templates.get(
+                (version, None)
+            )
+
+            if template is not None:
+                return template
+
+        raise PromptTemplateError(f"No prompt template for version {self._default_version}")
+
+    def templates(self) -> list[PromptTemplate]:
+        return list(self._templates.values())
+
+    def reload(self) -> None:
+        mtimes = self._scan()
+        templates: dict[tuple[str, str | None], PromptTemplate] = {}
+
+        for path in mtimes:
+            template = load_template(path)
+            templates[(template.version, template.speciality)] = template
+
+        if (self._default_version, None) not in templates:
+            raise PromptTemplateError(
+                f"Default prompt version {self._default_version} has no generic template"
+            )
+
+        self._templates = templates
+        self._mtimes = mtimes
+        self._loaded_at = time.time()
+
+        logger.info(
+            "Loaded %s prompt template(s): %s",
+            len(templates),
+            ", ".join(sorted(f"{version}/{speciality or '*'}" for version, speciality in templates)),
+        )
+
+    def reload_if_changed(self) -> bool:
+        mtimes = self._scan()
+
+        if mtimes == self._mtimes:
+            return False
+
+        try:
+            self.reload()
+        except PromptTemplateError:
+            logger.exception("Prompt template reload failed; keeping the loaded templates")
+            PROMPT_TEMPLATE_RELOADS.labels(result="failed").inc()
+            # Retried on the next change, not on every check.
+            self._mtimes = mtimes
+            return False
+
+        PROMPT_TEMPLATE_RELOADS.labels(result="reloaded").inc()
+
+        return True
+
+    def start_watching(self, interval: float) -> None:
+        if interval > 0 and self._watch_task is None:
+            self._watch_task = asyncio.create_task(self._watch(interval))
+
+    async def stop(self) -> None:
+        if self._watch_task is None:
+            return
+
+        self._watch_task.cancel()
+
+        try:
+            await self._watch_task
+        except asyncio.CancelledError:
+            pass
+
+        self._watch_task = None
+
+    def record_generation(
+        self,
+        version: str,
+        latency: float,
+        usage: dict | None,
+        fallback: bool,
+    ) -> None:
+        stats = self._stats.setdefault(
+            version,
+            {
+                "generations": 0,
+                "fallbacks": 0,
+                "latency_seconds": 0.0,
+                "prompt_tokens": 0,
+                "completion_tokens": 0,
+            },
+        )
+
+        stats["generations"] += 1
+        stats["latency_seconds"] += latency
+        PROMPT_GENERATION_DURATION.labels(prompt_version=version).observe(latency)
+
+        if fallback:
+            stats["fallbacks"] += 1
+
+        PROMPT_GENERATIONS.labels(
+            prompt_version=version,
+            result="fallback" if fallback else "structured",
+        ).inc()
+
+        for kind in ("prompt", "completion"):
+            tokens = (usage or {}).get(f"{kind}_tokens")
+
+            if tokens:
+                stats[f"{kind}_tokens"] += tokens
+                PROMPT_TOKENS.labels(prompt_version=version, kind=kind).inc(tokens)
+
+    def stats(self) -> dict:
+        versions = {}
+
+        for version, stats in self._stats.items():
+            generations = stats["generations"]
+            versions[version] = {
+                "generations": generations,
+                "fallbacks": stats["fallbacks"],
+                "fallback_rate": round(stats["fallbacks"] / generations, 4),
+                "mean_latency_seconds": round(stats["latency_seconds"] / generations, 4),
+                "mean_prompt_tokens": round(stats["prompt_tokens"] / generations, 1),
+                "mean_completion_tokens": round(stats["completion_tokens"] / generations, 1),
+            }
+
+        return {
+            "default_version": self._default_version,
+            "loaded_at": self._loaded_at,
+            "templates": [
+                {
+                    "version": template.version,
+                    "speciality": template.speciality,
+                    "context_format": template.context_format,
+                    "static_system": template.static_system,
+                    "source": template.source,
+                }
+                for template in self._templates.values()
+            ],
+            "versions": versions,
+        }
+
+    def _scan(self) -> dict[Path, float]:
+        mtimes = {}
+
+        for directory in self._directories:
+            for path in sorted(Path(directory).glob("*.toml")):
+                try:
+                    mtimes[path] = path.stat().st_mtime
+                except OSError:
+                    continue
+
+        return mtimes
+
+    async def _watch(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+
+            # The loaded templates stay in use; keep watching for a fix.
+            try:
+                self.reload_if_changed()
+            except Exception:
+                logger.exception("Prompt template reload check failed")
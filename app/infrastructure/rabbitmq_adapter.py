@@ -1,11 +1,28 @@
-import json
+import asyncio
 import logging
 import os
 from typing import Awaitable, Callable
 
-from aio_pika import ExchangeType, IncomingMessage, Message, connect_robust
-from aio_pika.abc import AbstractRobustConnection
-
+import httpx
+from aio_pika import DeliveryMode, ExchangeType, IncomingMessage, Message, connect_robust
+from aio_pika.abc import (
+    AbstractChannel,
+    AbstractExchange,
+    AbstractQueue,
+    AbstractRobustConnection,
+)
+from aio_pika.pool import Pool
+from pydantic import BaseModel
+
+from app.core.exceptions import Overloaded
+from app.core.metrics import (
+    CONSUMER_BACKLOG,
+    CONSUMER_DEAD_LETTERED,
+    CONSUMER_DLQ_DEPTH,
+    CONSUMER_PAUSED,
+    CONSUMER_RETRIES,
+    stage_timer,
+)
 from app.domain.events import CaseAssignedEvent, CaseDraftGeneratedEvent
 from app.domain.protocols import EventPublisher
 
@@ -42,16 +59,15 @@ CASE_DRAFT_GENERATED_ROUTING_KEY = os.getenv(
     "case.draft.generated",
 )
 
+# Wait before requeueing a message whose retry or dead-letter copy could not
+# be published, so it does not cycle through the queue while the broker
+# rejects publishes.
+REPUBLISH_FAILURE_DELAY_SECONDS = 5.0
 
-async def start_case_assigned_consumer(
-    callback: Callable[[CaseAssignedEvent], Awaitable[None]],
-    url: str = RABBIT_URL,
-    exchange_name: str = CASE_ASSIGNED_EXCHANGE,
-    routing_key: str = CASE_ASSIGNED_ROUTING_KEY,
-    queue_name: str = CASE_ASSIGNED_QUEUE_NAME,
-) -> AbstractRobustConnection:
+
+class CaseAssignedConsumer:
     """
-    Start consuming CaseAssignedEvent messages.
+    Consumes CaseAssignedEvent messages.
 
     The expected incoming format is compatible with MassTransit-style envelopes:
     {
@@ -60,32 +76,353 @@ async def start_case_assigned_consumer(
         "consultantId": "..."
       }
     }
+
+    Two modes are supported:
+    - worker_count == 0: each delivery is handled inside the delivery callback.
+    - worker_count > 0: deliveries are queued and handled by a fixed pool of
+      worker tasks, so parallelism is controlled separately from prefetch.
+
+    stop() cancels the consumer and waits for in-flight messages to finish
+    before the connection is closed. Messages that do not finish in time are
+    left unacknowledged and redelivered by the broker.
+
+    Backpressure: when is_saturated is given, it is polled every
+    backpressure_interval seconds; while it returns True the consumer stops
+    receiving new deliveries (messages already received are still handled)
+    and resumes once it returns False.
+
+    Failures: the consumer declares a retry exchange "<queue>.retry" with one
+    queue per delay in retry_delays ("<queue>.retry.<seconds>s"). Each of
+    those queues holds messages for its TTL and then dead-letters them back
+    to the main queue. The number of failed attempts is kept in the
+    x-attempt header.
+    - a failed message is republished to the next delay tier and acked
+    - after max_attempts failures, or when the message can never succeed
+      (invalid payload, 4xx from the Case Service), it is moved to the
+      dead-letter queue "<queue>.dlq"
+    - a message whose generation is shed with Overloaded goes to the first
+      delay tier without counting an attempt
+    The DLQ depth is polled every dlq_poll_interval seconds.
+
+    Prefetch: with a worker pool, prefetch is called with every event as it
+    enters the backlog, so the handler can start preparing it before a
+    worker is free.
     """
 
-    connection = await connect_robust(url)
-    channel = await connection.channel()
-    await channel.set_qos(prefetch_count=10)
+    def __init__(
+        self,
+        callback: Callable[[CaseAssignedEvent], Awaitable[None]],
+        url: str = RABBIT_URL,
+        exchange_name: str = CASE_ASSIGNED_EXCHANGE,
+        routing_key: str = CASE_ASSIGNED_ROUTING_KEY,
+        queue_name: str = CASE_ASSIGNED_QUEUE_NAME,
+        prefetch_count: int = 10,
+        worker_count: int = 0,
+        shutdown_timeout: float = 30.0,
+        is_saturated: Callable[[], bool] | None = None,
+        backpressure_interval: float = 0.5,
+        retry_delays: list[float] | None = None,
+        max_attempts: int = 5,
+        dlq_poll_interval: float = 30.0,
+        prefetch: Callable[[CaseAssignedEvent], None] | None = None,
+    ) -> None:
+        self._callback = callback
+        self._url = url
+        self._exchange_name = exchange_name
+        self._routing_key = routing_key
+        self._queue_name = queue_name
+        self._prefetch_count = prefetch_count
+        self._worker_count = worker_count
+        self._shutdown_timeout = shutdown_timeout
+        self._is_saturated = is_saturated
+        self._backpressure_interval = backpressure_interval
+        self._retry_delays = retry_delays if retry_delays is not None else [10, 60, 300]
 
-    exchange = await channel.declare_exchange(
-        name=exchange_name,
-        type=ExchangeType.FANOUT,
-        durable=True,
-    )
+        if not self._retry_delays:
+            raise ValueError("At least one retry delay is required")
 
-    queue = await channel.declare_queue(
-        name=queue_name,
-        durable=True,
-    )
+        self._max_attempts = max_attempts
+        self._dlq_poll_interval = dlq_poll_interval
+        self._prefetch = prefetch
+
+        self._connection: AbstractRobustConnection | None = None
+        self._queue: AbstractQueue | None = None
+        self._publish_channel: AbstractChannel | None = None
+        self._retry_exchange: AbstractExchange | None = None
+        self._dead_letter_queue: AbstractQueue | None = None
+        self._dlq_task: asyncio.Task | None = None
+        self._consumer_tag: str | None = None
+        self._backlog: asyncio.Queue[
+            tuple[IncomingMessage, CaseAssignedEvent | None]
+        ] | None = None
+        self._workers: list[asyncio.Task] = []
+        self._in_flight: set[asyncio.Task] = set()
+        self._paused = False
+        self._backpressure_task: asyncio.Task | None = None
+
+    @property
+    def paused(self) -> bool:
+        return self._paused
+
+    @property
+    def connection(self) -> AbstractRobustConnection | None:
+        return self._connection
+
+    def stats(self) -> dict:
+        connected = self._connection is not None and not self._connection.is_closed
+        consuming = self._consumer_tag is not None
+
+        return {
+            # A paused consumer is healthy: it is holding back on purpose.
+            "healthy": connected and (consuming or self._paused),
+            "connected": connected,
+            "consuming": consuming,
+            "paused": self._paused,
+            "workers": self._worker_count,
+            "backlog": self._backlog.qsize() if self._backlog is not None else len(self._in_flight),
+        }
+
+    async def start(self) -> None:
+        if self._worker_count > self._prefetch_count:
+            logger.warning(
+                "CaseAssigned worker_count=%s exceeds prefetch_count=%s; "
+                "extra workers will stay idle",
+                self._worker_count,
+                self._prefetch_count,
+            )
+
+        self._connection = await connect_robust(self._url)
+        channel = await self._connection.channel()
+        await channel.set_qos(prefetch_count=self._prefetch_count)
+
+        exchange = await channel.declare_exchange(
+            name=self._exchange_name,
+            type=ExchangeType.FANOUT,
+            durable=True,
+        )
+
+        self._queue = await channel.declare_queue(
+            name=self._queue_name,
+            durable=True,
+        )
+
+        await self._queue.bind(exchange, routing_key=self._routing_key)
+
+        await self._declare_retry_topology()
+
+        if self._worker_count > 0:
+            self._backlog = asyncio.Queue()
+            self._workers = [
+                asyncio.create_task(self._run_worker(index))
+                for index in range(self._worker_count)
+            ]
+
+        await self._consume()
+
+        if self._is_saturated is not None:
+            self._backpressure_task = asyncio.create_task(self._watch_backpressure())
+
+        self._dlq_task = asyncio.create_task(self._watch_dead_letter_queue())
+
+        logger.info(
+            "Started CaseAssignedEvent consumer prefetch=%s workers=%s",
+            self._prefetch_count,
+            self._worker_count,
+        )
+
+    async def pause(self) -> None:
+        """
+        Stop receiving deliveries; received messages are still handled.
+        """
+
+        if self._paused:
+            return
+
+        self._paused = True
+        CONSUMER_PAUSED.set(1)
+        await self._cancel_consumer()
+
+        logger.warning("CaseAssigned consumer paused: generation backend is saturated")
+
+    async def resume(self) -> None:
+        if not self._paused:
+            return
+
+        self._paused = False
+        CONSUMER_PAUSED.set(0)
+        await self._consume()
+
+        logger.info("CaseAssigned consumer resumed")
 
-    await queue.bind(exchange, routing_key=routing_key)
+    async def stop(self) -> None:
+        for watcher in (self._backpressure_task, self._dlq_task):
+            if watcher is not None:
+                watcher.cancel()
+                await asyncio.gather(watcher, return_exceptions=True)
 
-    async def on_message(message: IncomingMessage) -> None:
-        async with message.process():
-            raw = json.loads(message.body)
+        self._backpressure_task = None
+        self._dlq_task = None
 
-            payload = raw.get("message", raw)
+        await self._cancel_consumer()
 
-            event = CaseAssignedEvent.model_validate(payload)
+        try:
+            await asyncio.wait_for(self._drain(), timeout=self._shutdown_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                "CaseAssigned consumer did not drain within %ss; "
+                "unfinished messages will be redelivered",
+                self._shutdown_timeout,
+            )
+
+        for worker in self._workers:
+            worker.cancel()
+
+        for task in list(self._in_flight):
+            task.cancel()
+
+        await asyncio.gather(*self._workers, *self._in_flight, return_exceptions=True)
+        self._workers = []
+
+        if self._connection and not self._connection.is_closed:
+            await self._connection.close()
+
+        logger.info("CaseAssignedEvent consumer stopped")
+
+    async def _declare_retry_topology(self) -> None:
+        assert self._connection is not None
+
+        # Retries and dead letters are published with confirms, so the
+        # original message is only acked once its copy is safely stored.
+        self._publish_channel = await self._connection.channel(publisher_confirms=True)
+
+        self._retry_exchange = await self._publish_channel.declare_exchange(
+            name=f"{self._queue_name}.retry",
+            type=ExchangeType.DIRECT,
+            durable=True,
+        )
+
+        for delay in self._retry_delays:
+            tier = await self._publish_channel.declare_queue(
+                name=self._retry_tier(delay),
+                durable=True,
+                arguments={
+                    "x-message-ttl": int(delay * 1000),
+                    "x-dead-letter-exchange": "",
+                    "x-dead-letter-routing-key": self._queue_name,
+                },
+            )
+            await tier.bind(self._retry_exchange, routing_key=self._retry_tier(delay))
+
+        self._dead_letter_queue = await self._publish_channel.declare_queue(
+            name=f"{self._queue_name}.dlq",
+            durable=True,
+        )
+
+    def _retry_tier(self, delay: float) -> str:
+        return f"{self._queue_name}.retry.{delay:g}s"
+
+    async def _watch_dead_letter_queue(self) -> None:
+        while True:
+            try:
+                if self._dead_letter_queue is not None:
+                    declared = await self._dead_letter_queue.declare()
+                    CONSUMER_DLQ_DEPTH.set(declared.message_count or 0)
+            except Exception:
+                logger.exception("Failed to read CaseAssigned dead-letter queue depth")
+
+            await asyncio.sleep(self._dlq_poll_interval)
+
+    async def _consume(self) -> None:
+        assert self._queue is not None
+
+        callback = self._enqueue if self._worker_count > 0 else self._on_message
+        self._consumer_tag = await self._queue.consume(callback)
+
+    async def _cancel_consumer(self) -> None:
+        if self._queue is not None and self._consumer_tag is not None:
+            await self._queue.cancel(self._consumer_tag)
+            self._consumer_tag = None
+
+    async def _watch_backpressure(self) -> None:
+        assert self._is_saturated is not None
+
+        while True:
+            await asyncio.sleep(self._backpressure_interval)
+
+            try:
+                if self._is_saturated():
+                    await self.pause()
+                else:
+                    await self.resume()
+            except Exception:
+                logger.exception("CaseAssigned consumer backpressure check failed")
+
+    async def _drain(self) -> None:
+        if self._backlog is not None:
+            await self._backlog.join()
+
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+
+    async def _enqueue(self, message: IncomingMessage) -> None:
+        assert self._backlog is not None
+        CONSUMER_BACKLOG.inc()
+
+        # Parsed once here; the worker gets the event with the message.
+        try:
+            event = parse_case_assigned_event(message.body)
+        except ValueError:
+            # Invalid messages are dead-lettered when a worker reaches them.
+            event = None
+
+        if self._prefetch is not None and event is not None:
+            self._prefetch(event)
+
+        await self._backlog.put((message, event))
+
+    async def _run_worker(self, index: int) -> None:
+        assert self._backlog is not None
+
+        while True:
+            message, event = await self._backlog.get()
+
+            try:
+                await self._process(message, event)
+            except Exception:
+                logger.exception("CaseAssigned worker %s failed to handle message", index)
+            finally:
+                CONSUMER_BACKLOG.dec()
+                self._backlog.task_done()
+
+    async def _on_message(self, message: IncomingMessage) -> None:
+        task = asyncio.current_task()
+
+        if task is not None:
+            self._in_flight.add(task)
+
+        CONSUMER_BACKLOG.inc()
+
+        try:
+            await self._process(message)
+        finally:
+            CONSUMER_BACKLOG.dec()
+
+            if task is not None:
+                self._in_flight.discard(task)
+
+    async def _process(
+        self,
+        message: IncomingMessage,
+        event: CaseAssignedEvent | None = None,
+    ) -> None:
+        async with message.process(ignore_processed=True):
+            try:
+                if event is None:
+                    event = parse_case_assigned_event(message.body)
+
+            except ValueError as exc:
+                await self._dead_letter(message, "invalid_message", self._attempts(message), exc)
+                return
 
             logger.info(
                 "Received CaseAssignedEvent case_id=%s consultant_id=%s",
@@ -93,18 +430,276 @@ async def start_case_assigned_consumer(
                 event.consultant_id,
             )
 
-            await callback(event)
+            try:
+                await self._callback(event)
+
+            except Overloaded:
+                logger.warning(
+                    "Generation shed for case_id=%s; retrying the message later",
+                    event.case_id,
+                )
+                await self._retry(
+                    message,
+                    "overloaded",
+                    self._attempts(message),
+                    self._retry_delays[0],
+                )
+
+            except Exception as exc:
+                attempts = self._attempts(message) + 1
+
+                logger.exception(
+                    "Failed to handle CaseAssignedEvent case_id=%s attempt=%s/%s",
+                    event.case_id,
+                    attempts,
+                    self._max_attempts,
+                )
+
+                if _is_permanent_failure(exc):
+                    await self._dead_letter(message, "permanent_failure", attempts, exc)
+                elif attempts >= self._max_attempts:
+                    await self._dead_letter(message, "attempts_exhausted", attempts, exc)
+                else:
+                    delay = self._retry_delays[min(attempts, len(self._retry_delays)) - 1]
+                    await self._retry(message, "failure", attempts, delay, exc)
+
+    def _attempts(self, message: IncomingMessage) -> int:
+        try:
+            return int((message.headers or {}).get("x-attempt", 0))
+        except (TypeError, ValueError):
+            return 0
+
+    async def _retry(
+        self,
+        message: IncomingMessage,
+        reason: str,
+        attempts: int,
+        delay: float,
+        exc: Exception | None = None,
+    ) -> None:
+        if not await self._republish(
+            message,
+            self._retry_exchange,
+            self._retry_tier(delay),
+            attempts,
+            exc,
+        ):
+            return
+
+        CONSUMER_RETRIES.labels(reason=reason).inc()
+
+        logger.info(
+            "Scheduled CaseAssigned message retry in %ss after %s attempt(s)",
+            delay,
+            attempts,
+        )
+
+    async def _dead_letter(
+        self,
+        message: IncomingMessage,
+        reason: str,
+        attempts: int,
+        exc: Exception,
+    ) -> None:
+        assert self._publish_channel is not None
+
+        if not await self._republish(
+            message,
+            self._publish_channel.default_exchange,
+            f"{self._queue_name}.dlq",
+            attempts,
+            exc,
+        ):
+            return
+
+        CONSUMER_DEAD_LETTERED.labels(reason=reason).inc()
+
+        logger.error("Moved CaseAssigned message to the dead-letter queue (%s): %s", reason, exc)
+
+    async def _republish(
+        self,
+        message: IncomingMessage,
+        exchange: AbstractExchange | None,
+        routing_key: str,
+        attempts: int,
+        exc: Exception | None,
+    ) -> bool:
+        """
+        Publish a copy of the message; the original is acked when _process
+        returns. If the copy cannot be published, the original is requeued
+        after REPUBLISH_FAILURE_DELAY_SECONDS so it is not lost, and False is
+        returned.
+        """
+
+        assert exchange is not None
+
+        headers = {
+            **(message.headers or {}),
+            "x-attempt": attempts,
+        }
+
+        if exc is not None:
+            headers["x-last-error"] = f"{type(exc).__name__}: {exc}"[:500]
+
+        try:
+            await exchange.publish(
+                Message(
+                    body=message.body,
+                    headers=headers,
+                    content_type=message.content_type,
+                    message_id=message.message_id,
+                    correlation_id=message.correlation_id,
+                    delivery_mode=DeliveryMode.PERSISTENT,
+                ),
+                routing_key=routing_key,
+            )
+
+        except Exception:
+            logger.exception(
+                "Failed to republish CaseAssigned message; requeueing it in %ss",
+                REPUBLISH_FAILURE_DELAY_SECONDS,
+            )
+            await asyncio.sleep(REPUBLISH_FAILURE_DELAY_SECONDS)
+            await message.nack(requeue=True)
+            return False
+
+        return True
+
+
+class _MassTransitEnvelope(BaseModel):
+    """
+    The part of a MassTransit envelope the consumer reads; other envelope
+    fields are ignored without being materialized.
+    """
+
+    message: CaseAssignedEvent | None = None
+
+
+def parse_case_assigned_event(body: bytes) -> CaseAssignedEvent:
+    """
+    Validate the raw body in one pass, without decoding it to a dict first.
+
+    Bodies that are not wrapped in an envelope are accepted as the bare
+    event. Raises ValueError (pydantic ValidationError) for invalid bodies.
+    """
+
+    envelope = _MassTransitEnvelope.model_validate_json(body)
+
+    if envelope.message is not None:
+        return envelope.message
+
+    return CaseAssignedEvent.model_validate_json(body)
+
+
+def _is_permanent_failure(exc: Exception) -> bool:
+    """
+    Failures that a retry cannot fix: bad case data or a 4xx from a
+    dependency (except timeouts and rate limiting).
+    """
+
+    if isinstance(exc, ValueError):
+        return True
+
+    if isinstance(exc, httpx.HTTPStatusError):
+        status_code = exc.response.status_code
+        return 400 <= status_code < 500 and status_code not in (408, 429)
+
+    return False
+
+
+async def start_case_assigned_consumer(
+    callback: Callable[[CaseAssignedEvent], Awaitable[None]],
+    url: str = RABBIT_URL,
+    exchange_name: str = CASE_ASSIGNED_EXCHANGE,
+    routing_key: str = CASE_ASSIGNED_ROUTING_KEY,
+    queue_name: str = CASE_ASSIGNED_QUEUE_NAME,
+    prefetch_count: int = 10,
+    worker_count: int = 0,
+    shutdown_timeout: float = 30.0,
+    is_saturated: Callable[[], bool] | None = None,
+    backpressure_interval: float = 0.5,
+    retry_delays: list[float] | None = None,
+    max_attempts: int = 5,
+    dlq_poll_interval: float = 30.0,
+    prefetch: Callable[[CaseAssignedEvent], None] | None = None,
+) -> CaseAssignedConsumer:
+    """
+    Create and start a CaseAssignedConsumer.
+    """
+
+    consumer = CaseAssignedConsumer(
+        callback=callback,
+        url=url,
+        exchange_name=exchange_name,
+        routing_key=routing_key,
+        queue_name=queue_name,
+        prefetch_count=prefetch_count,
+        worker_count=worker_count,
+        shutdown_timeout=shutdown_timeout,
+        is_saturated=is_saturated,
+        backpressure_interval=backpressure_interval,
+        retry_delays=retry_delays,
+        max_attempts=max_attempts,
+        dlq_poll_interval=dlq_poll_interval,
+        prefetch=prefetch,
+    )
+
+    await consumer.start()
+
+    return consumer
+
 
-    await queue.consume(on_message)
+class _PublisherChannel:
+    """
+    A pooled publisher channel with its declared exchange cached.
 
-    logger.info("Started CaseAssignedEvent consumer")
+    Robust channels are restored by aio-pika after a connection recovery.
+    If the channel was closed for any other reason it is reopened and the
+    exchange is declared again the next time it is used.
+    """
 
-    return connection
+    def __init__(
+        self,
+        connection: AbstractRobustConnection,
+        exchange_name: str,
+        publisher_confirms: bool,
+    ) -> None:
+        self._connection = connection
+        self._exchange_name = exchange_name
+        self._publisher_confirms = publisher_confirms
+        self._channel: AbstractChannel | None = None
+        self._exchange: AbstractExchange | None = None
+
+    async def get_exchange(self) -> AbstractExchange:
+        if self._channel is None or self._channel.is_closed or self._exchange is None:
+            self._channel = await self._connection.channel(
+                publisher_confirms=self._publisher_confirms,
+            )
+
+            self._exchange = await self._channel.declare_exchange(
+                name=self._exchange_name,
+                type=ExchangeType.FANOUT,
+                durable=True,
+            )
+
+        return self._exchange
+
+    async def close(self) -> None:
+        if self._channel is not None and not self._channel.is_closed:
+            await self._channel.close()
 
 
 class AioPikaEventPublisher(EventPublisher):
     """
     RabbitMQ publisher for AI Service events.
+
+    Channels are pooled and keep their declared exchange, so publishing an
+    event is a single write instead of opening a channel and declaring the
+    exchange every time.
+
+    When publish_batch_size > 1, events are buffered for up to
+    publish_batch_interval seconds and published together; with publisher
+    confirms enabled each caller still waits for the broker ack of its event.
     """
 
     def __init__(
@@ -112,32 +707,44 @@ class AioPikaEventPublisher(EventPublisher):
         url: str = RABBIT_URL,
         exchange_name: str = CASE_DRAFT_GENERATED_EXCHANGE,
         routing_key: str = CASE_DRAFT_GENERATED_ROUTING_KEY,
+        channel_pool_size: int = 2,
+        publisher_confirms: bool = True,
+        publish_batch_size: int = 1,
+        publish_batch_interval: float = 0.05,
     ) -> None:
         self._url = url
         self._exchange_name = exchange_name
         self._routing_key = routing_key
+        self._channel_pool_size = channel_pool_size
+        self._publisher_confirms = publisher_confirms
+        self._publish_batch_size = publish_batch_size
+        self._publish_batch_interval = publish_batch_interval
         self._connection: AbstractRobustConnection | None = None
+        self._channel_pool: Pool[_PublisherChannel] | None = None
+        self._pending: list[tuple[Message, asyncio.Future]] = []
+        self._flush_task: asyncio.Task | None = None
 
     async def connect(self) -> None:
         if self._connection is None or self._connection.is_closed:
             self._connection = await connect_robust(self._url)
+            self._channel_pool = Pool(
+                self._create_channel,
+                max_size=self._channel_pool_size,
+            )
 
-    async def publish_case_draft_generated(
-        self,
-        event: CaseDraftGeneratedEvent,
-    ) -> None:
-        await self.connect()
-
+    async def _create_channel(self) -> _PublisherChannel:
         assert self._connection is not None
 
-        channel = await self._connection.channel()
-
-        exchange = await channel.declare_exchange(
-            name=self._exchange_name,
-            type=ExchangeType.FANOUT,
-            durable=True,
+        return _PublisherChannel(
+            connection=self._connection,
+            exchange_name=self._exchange_name,
+            publisher_confirms=self._publisher_confirms,
         )
 
+    async def publish_case_draft_generated(
+        self,
+        event: CaseDraftGeneratedEvent,
+    ) -> None:
         payload = event.model_dump_json(by_alias=True).encode("utf-8")
 
         message = Message(
@@ -145,10 +752,13 @@ class AioPikaEventPublisher(EventPublisher):
             content_type="application/json",
         )
 
-        await exchange.publish(
-            message,
-            routing_key=self._routing_key,
-        )
+        if self._publish_batch_size > 1:
+            await self._publish_batched(message)
+        else:
+            # Failures (including nacks) come back as results, not raised.
+            for result in await self._publish_messages([message]):
+                if isinstance(result, BaseException):
+                    raise result
 
         logger.info(
             "Published CaseDraftGeneratedEvent case_id=%s consultant_id=%s",
@@ -156,6 +766,66 @@ class AioPikaEventPublisher(EventPublisher):
             event.consultant_id,
         )
 
+    async def _publish_messages(self, messages: list[Message]) -> list:
+        await self.connect()
+
+        assert self._channel_pool is not None
+
+        with stage_timer("amqp_publish"):
+            async with self._channel_pool.acquire() as publisher_channel:
+                exchange = await publisher_channel.get_exchange()
+
+                return await asyncio.gather(
+                    *(
+                        exchange.publish(message, routing_key=self._routing_key)
+                        for message in messages
+                    ),
+                    return_exceptions=True,
+                )
+
+    async def _publish_batched(self, message: Message) -> None:
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((message, future))
+
+        if len(self._pending) >= self._publish_batch_size:
+            await self._flush()
+        elif self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+        await future
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self._publish_batch_interval)
+        await self._flush()
+
+    async def _flush(self) -> None:
+        batch, self._pending = self._pending, []
+
+        if not batch:
+            return
+
+        try:
+            results = await self._publish_messages([message for message, _ in batch])
+        except Exception as exc:
+            results = [exc] * len(batch)
+
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(None)
+
     async def close(self) -> None:
+        await self._flush()
+
+        if self._flush_task is not None and not self._flush_task.done():
+            self._flush_task.cancel()
+
+        if self._channel_pool is not None and not self._channel_pool.is_closed:
+            await self._channel_pool.close()
+
         if self._connection and not self._connection.is_closed:
-            await self._connection.close()
\ No newline at end of file
+            await self._connection.close()
@@ -0,0 +1,242 @@
+import logging
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from app.core.config import Settings, get_settings
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+)
+
+logger = logging.getLogger(__name__)
+
+# Delay before a child that exited unexpectedly is started again.
+RESTART_DELAY_SECONDS = 5.0
+
+# Extra time given to children on shutdown, on top of the consumer drain.
+SHUTDOWN_GRACE_SECONDS = 10.0
+
+METRICS_DIR_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+
+@dataclass
+class ChildProcess:
+    name: str
+    command: list[str]
+    env: dict[str, str]
+    process: subprocess.Popen | None = None
+    restart_at: float = 0.0
+    restarts: int = 0
+    metrics_dir: Path | None = None
+
+    def start(self) -> None:
+        if self.metrics_dir is not None:
+            # Files of a previous run would be added to the new one's metrics.
+            clear_metrics_dir(self.metrics_dir)
+
+        self.process = subprocess.Popen(self.command, env=self.env)
+        logger.info("Started %s pid=%s", self.name, self.process.pid)
+
+
+def process_counts(settings: Settings, cpu_count: int | None = None) -> tuple[int, int]:
+    """
+    (API workers, consumer processes).
+
+    Unset counts are sized to the CPU count: a quarter of the cores for
+    consumers (generation is I/O bound; they mostly parse and serialize),
+    the rest for API workers, at least one of each.
+    """
+
+    cpus = cpu_count or os.cpu_count() or 1
+
+    consumers = settings.SUPERVISOR_CONSUMER_PROCESSES or max(1, cpus // 4)
+    api_workers = settings.SUPERVISOR_API_WORKERS or max(1, cpus - consumers)
+
+    return api_workers, consumers
+
+
+def prepare_metrics_dir() -> tuple[Path, bool]:
+    """
+    Directory the API workers write their metrics to, so that /metrics on
+    any of them reports all of them: PROMETHEUS_MULTIPROC_DIR when set,
+    otherwise a new temporary directory. The flag tells whether it was
+    created here and should be removed on exit.
+    """
+
+    configured = os.environ.get(METRICS_DIR_ENV)
+
+    if configured:
+        path = Path(configured)
+        path.mkdir(parents=True, exist_ok=True)
+        return path, False
+
+    return Path(tempfile.mkdtemp(prefix="ai-service-metrics-")), True
+
+
+def clear_metrics_dir(path: Path) -> None:
+    for file in path.glob("*.db"):
+        file.unlink(missing_ok=True)
+
+
+def build_children(settings: Settings, metrics_dir: Path | None = None) -> list[ChildProcess]:
+    api_workers, consumers = process_counts(settings)
+
+    # Consumers keep per-process metrics, scraped on their own health ports.
+    worker_env = {key: value for key, value in os.environ.items() if key != METRICS_DIR_ENV}
+    api_env = {**os.environ, "SERVICE_ROLE": "api"}
+
+    if metrics_dir is not None:
+        api_env[METRICS_DIR_ENV] = str(metrics_dir)
+
+    children = [
+        ChildProcess(
+            name="api",
+            command=[
+                sys.executable,
+                "-m",
+                "uvicorn",
+                "app.main:app",
+                "--host",
+                settings.API_HOST,
+                "--port",
+                str(settings.API_PORT),
+                "--workers",
+                str(api_workers),
+                "--log-level",
+                "info",
+            ],
+            env=api_env,
+            metrics_dir=metrics_dir,
+        )
+    ]
+
+    for index in range(consumers):
+        children.append(
+            ChildProcess(
+                name=f"worker-{index}",
+                command=[sys.executable, "-m", "app.worker"],
+                env={
+                    **worker_env,
+                    "SERVICE_ROLE": "worker",
+                    "WORKER_HEALTH_PORT": str(settings.WORKER_HEALTH_PORT + index),
+                },
+            )
+        )
+
+    logger.info(
+        "Supervising %s API worker(s) on port %s and %s consumer process(es) "
+        "with health ports %s-%s",
+        api_workers,
+        settings.API_PORT,
+        consumers,
+        settings.WORKER_HEALTH_PORT,
+        settings.WORKER_HEALTH_PORT + consumers - 1,
+    )
+
+    return children
+
+
+class Supervisor:
+    """
+    Runs the API (uvicorn with several workers, no consumer) and several
+    consumer worker processes, restarting children that exit.
+
+    SIGTERM or SIGINT is forwarded to every child, which drains in-flight
+    work; children still running after the grace period are killed.
+    """
+
+    def __init__(self, children: list[ChildProcess], shutdown_timeout: float) -> None:
+        self._children = children
+        self._shutdown_timeout = shutdown_timeout
+        self._stopping = False
+
+    def run(self) -> int:
+        signal.signal(signal.SIGTERM, self._request_stop)
+        signal.signal(signal.SIGINT, self._request_stop)
+
+        for child in self._children:
+            child.start()
+
+        while not self._stopping:
+            self._check_children()
+            time.sleep(1.0)
+
+        return self._stop_children()
+
+    def _request_stop(self, signum, frame) -> None:
+        logger.info("Received signal %s, stopping children", signum)
+        self._stopping = True
+
+    def _check_children(self) -> None:
+        now = time.monotonic()
+
+        for child in self._children:
+            if child.process is None:
+                if now >= child.restart_at:
+                    child.restarts += 1
+                    child.start()
+                continue
+
+            returncode = child.process.poll()
+
+            if returncode is None:
+                continue
+
+            logger.error(
+                "%s pid=%s exited with code %s; restarting in %ss",
+                child.name,
+                child.process.pid,
+                returncode,
+                RESTART_DELAY_SECONDS,
+            )
+            child.process = None
+            child.restart_at = now + RESTART_DELAY_SECONDS
+
+    def _stop_children(self) -> int:
+        running = [child.process for child in self._children if child.process is not None]
+
+        for process in running:
+            if process.poll() is None:
+                process.send_signal(signal.SIGTERM)
+
+        deadline = time.monotonic() + self._shutdown_timeout
+
+        for process in running:
+            try:
+                process.wait(timeout=max(deadline - time.monotonic(), 0))
+            except subprocess.TimeoutExpired:
+                logger.warning("pid=%s did not stop in time; killing it", process.pid)
+                process.kill()
+                process.wait()
+
+        logger.info("All children stopped")
+
+        return 0
+
+
+def main() -> int:
+    settings = get_settings()
+    metrics_dir, created = prepare_metrics_dir()
+
+    supervisor = Supervisor(
+        children=build_children(settings, metrics_dir),
+        shutdown_timeout=settings.CONSUMER_SHUTDOWN_TIMEOUT + SHUTDOWN_GRACE_SECONDS,
+    )
+
+    try:
+        return supervisor.run()
+    finally:
+        if created:
+            shutil.rmtree(metrics_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,51 @@
+import logging
+
+import uvicorn
+from fastapi import FastAPI
+
+from app.api.health import router as health_router
+from app.api.responses import DefaultJSONResponse
+from app.bootstrap import service_lifespan
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+def create_worker_app() -> FastAPI:
+    """
+    Consumer-only process: the RabbitMQ consumer with the same use case
+    wiring as the API, plus the health and metrics routes. The draft
+    endpoints are not served.
+    """
+
+    app = FastAPI(
+        title="AI Service worker",
+        lifespan=service_lifespan("worker"),
+        default_response_class=DefaultJSONResponse,
+    )
+    app.include_router(health_router)
+
+    return app
+
+
+def main() -> None:
+    settings = get_settings()
+
+    logger.info(
+        "Starting CaseAssigned worker, health on %s:%s",
+        settings.WORKER_HEALTH_HOST,
+        settings.WORKER_HEALTH_PORT,
+    )
+
+    # uvicorn runs the lifespan, so SIGTERM drains the consumer before exit.
+    uvicorn.run(
+        create_worker_app(),
+        host=settings.WORKER_HEALTH_HOST,
+        port=settings.WORKER_HEALTH_PORT,
+        log_level="info",
+        access_log=False,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""
+Local stand-ins for the services the AI Service depends on.
+
+They implement only the endpoints the AI Service calls, with configurable
+latency, token rate, and error injection, so benchmarks can run without the
+Embedding Service, the Case Service, or a real LLM provider.
+"""
+
+import asyncio
+import json
+import random
+import uuid
+from dataclasses import dataclass
+
+import uvicorn
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import StreamingResponse
+
+
+@dataclass
+class FakeServiceConfig:
+    embedding_latency: float = 0.02
+    case_latency: float = 0.01
+    llm_first_token_latency: float = 0.2
+    llm_tokens_per_second: float = 200.0
+    llm_output_tokens: int = 300
+    context_count: int = 5
+    context_chars: int = 1200
+    error_rate: float = 0.0
+
+
+def _maybe_fail(config: FakeServiceConfig) -> None:
+    if config.error_rate and random.random() < config.error_rate:
+        raise HTTPException(status_code=503, detail="Injected failure")
+
+
+def build_embedding_app(config: FakeServiceConfig) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/embedding/similarity-search")
+    async def similarity_search(body: dict):
+        await asyncio.sleep(config.embedding_latency)
+        _maybe_fail(config)
+
+        text = " ".join(f"context-{index}" for index in range(config.context_chars // 10))
+
+        return {
+            "results": [
+                {
+                    "id": str(uuid.uuid4()),
+                    "source": "text",
+                    "raw_text": f"{index} {text}",
+                    "pdf_id": None,
+                    "similarity": 0.95 - index * 0.02,
+                }
+                for index in range(min(config.context_count, body.get("k", 10)))
+            ]
+        }
+
+    return app
+
+
+def build_case_app(config: FakeServiceConfig) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/cases/{case_id}")
+    async def get_case(case_id: str):
+        await asyncio.sleep(config.case_latency)
+        _maybe_fail(config)
+
+        return {
+            "id": case_id,
+            "description": (
+                "The user is asking whether they should use a monolithic "
+                "architecture or microservices for a small final-year project."
+            ),
+            "speciality": "software architecture",
+            "language": "en",
+        }
+
+    @app.post("/cases/{case_id}/ai-draft")
+    async def add_ai_draft(case_id: str, request: Request):
+        await request.body()
+        await asyncio.sleep(config.case_latency)
+        _maybe_fail(config)
+
+        return {"status": "stored"}
+
+    return app
+
+
+def _draft_json(recommendation_count: int, output_tokens: int) -> str:
+    filler_words = max(1, output_tokens // max(1, recommendation_count) - 20)
+    filler = " ".join("detail" for _ in range(filler_words))
+
+    return json.dumps(
+        {
+            "summary": "A student is deciding between a monolith and microservices.",
+            "recommendations": [
+                {
+                    "title": f"Recommendation {index}",
+                    "content": f"Consider option {index}. {filler}",
+                    "reasoning": "Based on the retrieved context.",
+                }
+                for index in range(1, recommendation_count + 1)
+            ],
+            "missing_information": ["Team size."],
+            "important_notes": ["Draft only."],
+        }
+    )
+
+
+def build_llm_app(config: FakeServiceConfig) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(body: dict):
+        _maybe_fail(config)
+
+        content = _draft_json(3, config.llm_output_tokens)
+        prompt_tokens = sum(len(message["content"]) for message in body["messages"]) // 4
+        generation_seconds = config.llm_output_tokens / config.llm_tokens_per_second
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": config.llm_output_tokens,
+        }
+
+        if not body.get("stream"):
+            await asyncio.sleep(config.llm_first_token_latency + generation_seconds)
+
+            return {
+                "choices": [{"message": {"role": "assistant", "content": content}}],
+                "usage": usage,
+            }
+
+        async def events():
+            await asyncio.sleep(config.llm_first_token_latency)
+
+            chunk_count = 20
+            chunk_size = max(1, len(content) // chunk_count)
+
+            for start in range(0, len(content), chunk_size):
+                await asyncio.sleep(generation_seconds / chunk_count)
+                delta = {"choices": [{"delta": {"content": content[start : start + chunk_size]}}]}
+                yield f"data: {json.dumps(delta)}\n\n"
+
+            yield f"data: {json.dumps({'choices': [], 'usage': usage})}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    return app
+
+
+class FakeServices:
+    """
+    Runs the fake Embedding Service, Case Service, and LLM on local ports.
+    """
+
+    def __init__(
+        self,
+        config: FakeServiceConfig,
+        host: str = "127.0.0.1",
+        embedding_port: int = 18050,
+        case_port: int = 18010,
+        llm_port: int = 18234,
+    ) -> None:
+        self.config = config
+        self.embedding_url = f"http://{host}:{embedding_port}"
+        self.case_url = f"http://{host}:{case_port}"
+        self.llm_url = f"http://{host}:{llm_port}/v1"
+        self._servers = [
+            _server(build_embedding_app(config), host, embedding_port),
+            _server(build_case_app(config), host, case_port),
+            _server(build_llm_app(config), host, llm_port),
+        ]
+        self._tasks: list[asyncio.Task] = []
+
+    async def __aenter__(self) -> "FakeServices":
+        self._tasks = [asyncio.create_task(server.serve()) for server in self._servers]
+
+        while not all(server.started for server in self._servers):
+            await asyncio.sleep(0.05)
+
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        for server in self._servers:
+            server.should_exit = True
+
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+
+def _server(app: FastAPI, host: str, port: int) -> uvicorn.Server:
+    return uvicorn.Server(
+        uvicorn.Config(app, host=host, port=port, log_level="warning", lifespan="off")
+    )
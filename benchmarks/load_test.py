@@ -0,0 +1,376 @@
+"""
+Offline load test for the AI Service.
+
+Starts local fake Embedding Service, Case Service, and LLM servers, then
+drives the AI Service at a target request rate through:
+- the HTTP API (POST /v1/draft-recommendation), served by uvicorn in-process
+- the consumer path (CaseAssignedHandler.handle), called directly
+
+Each path is measured with the mock and the OpenAI-compatible generation
+models. Latency percentiles, throughput, errors, and memory are written to a
+JSON file that can be compared with a previous run.
+
+Usage:
+    python -m benchmarks.load_test --rps 20 --duration 30
+    python -m benchmarks.load_test --compare benchmarks/results/baseline.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Awaitable, Callable
+
+import httpx
+import uvicorn
+
+from benchmarks.fake_services import FakeServiceConfig, FakeServices
+
+API_PORT = 18040
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+CASE_TEXT = (
+    "The user is asking whether they should use a monolithic architecture "
+    "or microservices for a small final-year project."
+)
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is reported in kilobytes on Linux and bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+
+    return peak / divisor
+
+
+async def run_open_loop(
+    send: Callable[[int], Awaitable[None]],
+    rps: float,
+    duration: float,
+) -> dict:
+    """
+    Start one request every 1/rps seconds, regardless of how long earlier
+    requests take, so queueing shows up in the latencies.
+    """
+
+    latencies: list[float] = []
+    errors: list[str] = []
+
+    async def one(index: int) -> None:
+        started = time.perf_counter()
+
+        try:
+            await send(index)
+            latencies.append(time.perf_counter() - started)
+        except Exception as exc:
+            errors.append(type(exc).__name__)
+
+    total = int(rps * duration)
+    tasks = []
+    started = time.perf_counter()
+
+    for index in range(total):
+        delay = started + index / rps - time.perf_counter()
+
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        tasks.append(asyncio.create_task(one(index)))
+
+    await asyncio.gather(*tasks)
+
+    elapsed = time.perf_counter() - started
+
+    return {
+        "requests": total,
+        "completed": len(latencies),
+        "errors": len(errors),
+        "error_types": sorted(set(errors)),
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 3) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+        "max_ms": round(max(latencies, default=0.0) * 1000, 2),
+    }
+
+
+def configure_environment(provider: str, services: FakeServices) -> None:
+    os.environ.update(
+        {
+            "AI_PROVIDER": provider,
+            "EMBEDDING_SERVICE_URL": services.embedding_url,
+            "CASE_SERVICE_URL": services.case_url,
+            "LLM_API_BASE": services.llm_url,
+            "LLM_MODEL_NAME": "fake-model",
+            "ENABLE_RABBITMQ_CONSUMER": "false",
+        }
+    )
+
+    from app.core.config import get_settings
+
+    get_settings.cache_clear()
+
+
+async def bench_api(provider: str, services: FakeServices, args) -> dict:
+    configure_environment(provider, services)
+
+    from app.main import app
+
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=API_PORT, log_level="warning")
+    )
+    server_task = asyncio.create_task(server.serve())
+
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=200)
+
+    async with httpx.AsyncClient(
+        base_url=f"http://127.0.0.1:{API_PORT}",
+        timeout=args.timeout,
+        limits=limits,
+    ) as client:
+
+        async def send(index: int) -> None:
+            response = await client.post(
+                "/v1/draft-recommendation",
+                params={"n": 3},
+                json={"text": f"{CASE_TEXT} Variant {index % args.distinct_cases}."},
+                headers={"X-User-Id": str(uuid.uuid4())},
+            )
+            response.raise_for_status()
+
+        result = await run_open_loop(send, args.rps, args.duration)
+
+    server.should_exit = True
+    await server_task
+
+    return result
+
+
+async def bench_consumer(provider: str, services: FakeServices, args) -> dict:
+    configure_environment(provider, services)
+
+    from app.application.handlers.case_assigned_handler import CaseAssignedHandler
+    from app.application.use_cases.generate_case_draft import GenerateCaseDraftUseCase
+    from app.core.config import get_settings
+    from app.domain.events import CaseAssignedEvent
+    from app.infrastructure.clients.case_service_client import HttpxCaseServiceClient
+    from app.infrastructure.clients.embedding_service_client import EmbeddingServiceClient
+    from app.infrastructure.http_transport import HttpTransportRegistry
+    from app.bootstrap import build_generation_model
+
+    settings = get_settings()
+    transports = HttpTransportRegistry(
+        max_connections=settings.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    )
+
+    handler = CaseAssignedHandler(
+        case_client=HttpxCaseServiceClient(
+            base_url=settings.CASE_SERVICE_URL,
+            http_client=transports.get_client("case_service"),
+        ),
+        generate_case_draft_use_case=GenerateCaseDraftUseCase(
+            similarity_search_client=EmbeddingServiceClient(
+                base_url=settings.EMBEDDING_SERVICE_URL,
+                http_client=transports.get_client("embedding_service"),
+            ),
+            generation_model=build_generation_model(settings, transports),
+        ),
+    )
+
+    workers = asyncio.Semaphore(args.consumer_workers)
+
+    async def send(index: int) -> None:
+        async with workers:
+            await handler.handle(
+                CaseAssignedEvent(case_id=uuid.uuid4(), consultant_id=uuid.uuid4())
+            )
+
+    try:
+        return await run_open_loop(send, args.rps, args.duration)
+    finally:
+        await transports.aclose()
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            stderr=subprocess.DEVNULL,
+            text=True,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current: dict, baseline: dict, max_regression: float) -> list[str]:
+    """
+    Return the scenarios whose p95 latency or throughput regressed by more
+    than max_regression (a fraction) compared with the baseline run.
+    """
+
+    regressions = []
+    baseline_results = {
+        (item["path"], item["provider"]): item for item in baseline.get("results", [])
+    }
+
+    for item in current["results"]:
+        previous = baseline_results.get((item["path"], item["provider"]))
+
+        if previous is None:
+            continue
+
+        name = f"{item['path']}/{item['provider']}"
+
+        if previous["p95_ms"] and item["p95_ms"] > previous["p95_ms"] * (1 + max_regression):
+            regressions.append(
+                f"{name}: p95 {previous['p95_ms']}ms -> {item['p95_ms']}ms"
+            )
+
+        if item["throughput_rps"] < previous["throughput_rps"] * (1 - max_regression):
+            regressions.append(
+                f"{name}: throughput {previous['throughput_rps']} -> {item['throughput_rps']} rps"
+            )
+
+    return regressions
+
+
+async def run(args) -> dict:
+    config = FakeServiceConfig(
+        embedding_latency=args.embedding_latency,
+        case_latency=args.case_latency,
+        llm_first_token_latency=args.llm_first_token_latency,
+        llm_tokens_per_second=args.llm_tokens_per_second,
+        llm_output_tokens=args.llm_output_tokens,
+        error_rate=args.error_rate,
+    )
+
+    results = []
+
+    async with FakeServices(config) as services:
+        for path in args.paths:
+            for provider in args.providers:
+                bench = bench_api if path == "api" else bench_consumer
+                rss_before = peak_rss_mb()
+
+                result = await bench(provider, services, args)
+
+                result.update(
+                    {
+                        "path": path,
+                        "provider": provider,
+                        "peak_rss_mb": round(peak_rss_mb(), 1),
+                        "peak_rss_growth_mb": round(peak_rss_mb() - rss_before, 1),
+                    }
+                )
+                results.append(result)
+
+                print(
+                    f"{path:<9} {provider:<18} "
+                    f"p50={result['p50_ms']:>8}ms p95={result['p95_ms']:>8}ms "
+                    f"p99={result['p99_ms']:>8}ms rps={result['throughput_rps']:>7} "
+                    f"errors={result['errors']}"
+                )
+
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "git_commit": git_commit(),
+        "python": platform.python_version(),
+        "config": {
+            "rps": args.rps,
+            "duration": args.duration,
+            "consumer_workers": args.consumer_workers,
+            "fake_services": config.__dict__,
+        },
+        "results": results,
+    }
+
+
+def parse_args(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rps", type=float, default=10.0)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument(
+        "--paths",
+        nargs="+",
+        choices=["api", "consumer"],
+        default=["api", "consumer"],
+    )
+    parser.add_argument(
+        "--providers",
+        nargs="+",
+        choices=["mock", "openai_compatible"],
+        default=["mock", "openai_compatible"],
+    )
+    parser.add_argument("--consumer-workers", type=int, default=10)
+    parser.add_argument("--distinct-cases", type=int, default=1000)
+    parser.add_argument("--embedding-latency", type=float, default=0.02)
+    parser.add_argument("--case-latency", type=float, default=0.01)
+    parser.add_argument("--llm-first-token-latency", type=float, default=0.2)
+    parser.add_argument("--llm-tokens-per-second", type=float, default=200.0)
+    parser.add_argument("--llm-output-tokens", type=int, default=300)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--output", type=Path, default=None)
+    parser.add_argument("--compare", type=Path, default=None)
+    parser.add_argument("--max-regression", type=float, default=0.2)
+    parser.add_argument("--verbose", action="store_true", help="Keep service INFO logs.")
+
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+
+    if not args.verbose:
+        # app.main configures INFO logging on import; keep the output readable.
+        import app.main  # noqa: F401
+
+        logging.getLogger().setLevel(logging.WARNING)
+
+    report = asyncio.run(run(args))
+
+    output = args.output or RESULTS_DIR / f"load_{datetime.now():%Y%m%d_%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"Results written to {output}")
+
+    if args.compare:
+        regressions = compare(report, json.loads(args.compare.read_text()), args.max_regression)
+
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
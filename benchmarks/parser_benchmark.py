@@ -0,0 +1,173 @@
+"""
+Micro-benchmark for LLMResponseParser.
+
+Runs every case of benchmarks/parser_corpus.py through:
+- legacy: the regex-based parser this service used before the fast path
+- stdlib: the current parser with the json module
+- orjson: the current parser with orjson, when it is installed
+
+and reports the mean time per parse and whether a structured draft was
+recovered.
+
+Usage:
+    python -m benchmarks.parser_benchmark
+    python -m benchmarks.parser_benchmark --iterations 2000 --output parser.json
+"""
+
+import argparse
+import json
+import logging
+import re
+import sys
+import time
+from pathlib import Path
+
+from pydantic import ValidationError
+
+from app.domain.models import AIDraft
+from app.infrastructure.generation.response_parser import (
+    FALLBACK_SUMMARY,
+    LLMResponseParser,
+    orjson,
+)
+from benchmarks.parser_corpus import ParserCase, build_corpus
+
+
+class LegacyLLMResponseParser(LLMResponseParser):
+    """
+    The regex-based parser kept for comparison: no fast path, no repair.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(use_orjson=False)
+
+    def parse_ai_draft(self, text: str) -> AIDraft:
+        cleaned = self._clean_output(text)
+        candidate = self._extract_json_candidate(cleaned)
+        parsed = self._try_parse_json(candidate) if candidate else None
+
+        if isinstance(parsed, list):
+            return self._try_build_ai_draft(parsed)
+
+        if isinstance(parsed, dict):
+            try:
+                return AIDraft.model_validate(parsed)
+            except ValidationError:
+                pass
+
+        return AIDraft(summary=FALLBACK_SUMMARY, recommendations=[])
+
+    def _clean_output(self, text: str) -> str:
+        return re.sub(r"<think>[\s\S]*?</think>\s*", "", text, flags=re.IGNORECASE).strip()
+
+    def _extract_json_candidate(self, text: str) -> str | None:
+        fenced_object = re.search(r"```json\s*(\{[\s\S]*?\})\s*```", text, flags=re.IGNORECASE)
+
+        if fenced_object:
+            return fenced_object.group(1)
+
+        start = text.find("{")
+        end = text.rfind("}")
+
+        if start != -1 and end != -1 and end > start:
+            return text[start : end + 1]
+
+        return None
+
+
+def build_parsers() -> dict[str, LLMResponseParser]:
+    parsers: dict[str, LLMResponseParser] = {
+        "legacy": LegacyLLMResponseParser(),
+        "stdlib": LLMResponseParser(use_orjson=False),
+    }
+
+    if orjson is not None:
+        parsers["orjson"] = LLMResponseParser(use_orjson=True)
+
+    return parsers
+
+
+def time_case(parser: LLMResponseParser, case: ParserCase, iterations: int) -> dict:
+    draft = parser.parse_ai_draft(case.text)
+
+    started = time.perf_counter()
+
+    for _ in range(iterations):
+        parser.parse_ai_draft(case.text)
+
+    elapsed = time.perf_counter() - started
+
+    return {
+        "mean_us": round(elapsed / iterations * 1_000_000, 2),
+        "structured": not parser.is_fallback(draft),
+        "recommendations": len(draft.recommendations),
+    }
+
+
+def run(iterations: int) -> dict:
+    corpus = build_corpus()
+    parsers = build_parsers()
+    results = []
+
+    print(f"{'case':<26} {'chars':>7} " + " ".join(f"{name:>16}" for name in parsers))
+
+    for case in corpus:
+        row = {"case": case.name, "chars": len(case.text), "expect_structured": case.expect_structured}
+
+        for name, parser in parsers.items():
+            row[name] = time_case(parser, case, iterations)
+
+        results.append(row)
+
+        cells = " ".join(
+            f"{row[name]['mean_us']:>12.1f}us {'S' if row[name]['structured'] else 'F':>1}"
+            for name in parsers
+        )
+        print(f"{case.name:<26} {len(case.text):>7} {cells}")
+
+    summary = {
+        name: {
+            "total_mean_us": round(sum(row[name]["mean_us"] for row in results), 2),
+            "fallbacks": sum(1 for row in results if not row[name]["structured"]),
+            "missed": sum(
+                1 for row in results if row["expect_structured"] and not row[name]["structured"]
+            ),
+        }
+        for name in parsers
+    }
+
+    for name, totals in summary.items():
+        print(
+            f"{name:<8} total={totals['total_mean_us']:>10.1f}us "
+            f"fallbacks={totals['fallbacks']} missed={totals['missed']}"
+        )
+
+    return {"iterations": iterations, "results": results, "summary": summary}
+
+
+def parse_args(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--output", type=Path, default=None)
+
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+
+    # The parser logs every fallback and repair; keep the output readable.
+    logging.disable(logging.WARNING)
+
+    report = run(args.iterations)
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2))
+        print(f"Results written to {args.output}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+"""
+Corpus of realistic and malformed model outputs for LLMResponseParser.
+
+Every case is generated from the same draft so the benchmark measures parsing
+cost, not content differences. "expect_structured" says whether a good parser
+should recover a structured draft from the case.
+"""
+
+import json
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class ParserCase:
+    name: str
+    text: str
+    expect_structured: bool
+
+
+def _draft(recommendation_count: int = 3) -> dict:
+    return {
+        "summary": "A student is deciding between a monolith and microservices for a small project.",
+        "recommendations": [
+            {
+                "title": f"Recommendation {index}",
+                "content": (
+                    "For a small project with limited complexity, a monolithic "
+                    "architecture may be more straightforward to implement. "
+                ) * 3,
+                "reasoning": "The retrieved context says monoliths are easier to develop and deploy.",
+            }
+            for index in range(1, recommendation_count + 1)
+        ],
+        "missing_information": ["Team size.", "Expected growth of the system."],
+        "important_notes": ["Microservices add operational complexity."],
+    }
+
+
+def _thinking(paragraphs: int) -> str:
+    paragraph = (
+        "Okay, let me think about this case. The user is asking about architecture, "
+        "and the context mentions monoliths {and} microservices. I should not make "
+        "a final decision and I need to return JSON only. "
+    )
+
+    return "<think>\n" + "\n".join(paragraph for _ in range(paragraphs)) + "\n</think>\n\n"
+
+
+def build_corpus() -> list[ParserCase]:
+    draft = _draft()
+    clean = json.dumps(draft, ensure_ascii=False)
+    pretty = json.dumps(draft, ensure_ascii=False, indent=2)
+
+    trailing_commas = pretty.replace('"\n    }', '",\n    }').replace("}\n  ]", "},\n  ]")
+    missing_commas = pretty.replace('",\n      "content"', '"\n      "content"')
+    raw_newlines = clean.replace("straightforward to implement. ", "straightforward\nto implement. ")
+    truncated = pretty[: int(len(pretty) * 0.8)]
+
+    return [
+        ParserCase("clean_json", clean, True),
+        ParserCase("pretty_json", pretty, True),
+        ParserCase("fenced_json", f"```json\n{pretty}\n```", True),
+        ParserCase("prose_around_json", f"Here is the draft:\n{pretty}\nLet me know if you need more.", True),
+        ParserCase("short_think_json", _thinking(3) + clean, True),
+        ParserCase("long_think_json", _thinking(400) + clean, True),
+        ParserCase("long_think_fenced", _thinking(400) + f"```json\n{pretty}\n```", True),
+        ParserCase("trailing_commas", trailing_commas, True),
+        ParserCase("missing_commas", missing_commas, True),
+        ParserCase("raw_newlines_in_strings", raw_newlines, True),
+        ParserCase("truncated_output", truncated, True),
+        ParserCase("json_array", json.dumps(["First option.", "Second option."]), True),
+        ParserCase("plain_text", "I cannot produce JSON for this case, but here is advice.", False),
+        ParserCase("unclosed_think", "<think>\n" + "thinking " * 2000, False),
+    ]
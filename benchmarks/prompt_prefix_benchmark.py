@@ -0,0 +1,293 @@
+"""
+Prefix stability check and benchmark for the prompt templates.
+
+Renders the same set of varied requests (cases, specialities, languages,
+retrieved context in random order, recommendation counts) with the
+generic template of every prompt version and reports, per version:
+- shared_prefix: characters (and estimated tokens) common to every prompt
+- cacheable: the share of each prompt that a provider prefix cache could
+  serve from the prompts sent before it
+
+For templates whose system message has no placeholders (prefix_cache_v1)
+it also verifies that the system message is byte-identical for every
+request and that the prompt does not depend on the order retrieved
+context arrives in; the exit code is 1 if not.
+
+--constrained renders the prompts used with schema-constrained decoding
+(LLM_RESPONSE_FORMAT=json_schema or guided_json).
+
+With --llm-url the requests are also sent to an OpenAI-compatible
+provider with max_tokens=1, so the mean latency is dominated by prefill.
+
+Usage:
+    python -m benchmarks.prompt_prefix_benchmark
+    python -m benchmarks.prompt_prefix_benchmark --requests 100 --output prefix.json
+    python -m benchmarks.prompt_prefix_benchmark --templates-dir prompts/ --constrained
+    python -m benchmarks.prompt_prefix_benchmark --llm-url http://127.0.0.1:8000/v1 --model local-model
+"""
+
+import argparse
+import bisect
+import json
+import random
+import sys
+import time
+import uuid
+from pathlib import Path
+
+import httpx
+
+from app.domain.models import CaseQuery, RetrievedContext
+from app.infrastructure.prompts.context_packer import estimate_tokens
+from app.infrastructure.prompts.template_registry import (
+    BUILTIN_TEMPLATES_DIR,
+    PromptTemplate,
+    PromptTemplateRegistry,
+)
+
+CASES = [
+    "The tenant reported recurring water damage in the bathroom ceiling after the upstairs renovation.",
+    "My employer has not paid overtime for the last three months despite written requests.",
+    "The seller refuses to refund a laptop that stopped working two weeks after delivery.",
+    "Our neighbour built a fence that is half a metre inside our property line.",
+    "I was dismissed during my probation period without any stated reason.",
+]
+
+SPECIALITIES = ["tenancy law", "employment law", "consumer law", None]
+
+LANGUAGES = ["en", "de", "nl"]
+
+CHUNK = (
+    "Section {index}: The party responsible must remedy the defect within a "
+    "reasonable period after written notice. If the defect is not remedied, "
+    "the other party may reduce payments in proportion to the impairment. "
+) * 6
+
+
+def build_requests(count: int, seed: int) -> list[tuple[CaseQuery, list[RetrievedContext], int]]:
+    rng = random.Random(seed)
+    chunks = [
+        RetrievedContext(
+            id=uuid.UUID(int=rng.getrandbits(128)),
+            source=rng.choice(["text", "pdf"]),
+            raw_text=CHUNK.format(index=index),
+            similarity=round(rng.uniform(0.5, 0.95), 4),
+        )
+        for index in range(40)
+    ]
+
+    requests = []
+
+    for _ in range(count):
+        query = CaseQuery(
+            text=rng.choice(CASES),
+            speciality=rng.choice(SPECIALITIES),
+            language=rng.choice(LANGUAGES),
+        )
+        contexts = rng.sample(chunks, rng.randint(0, 8))
+        requests.append((query, contexts, rng.randint(1, 5)))
+
+    return requests
+
+
+def flatten(messages: list[dict[str, str]]) -> str:
+    # Roughly what a chat template sends to the model.
+    return "".join(f"<|{message['role']}|>\n{message['content']}\n" for message in messages)
+
+
+def common_prefix_length(first: str, second: str) -> int:
+    limit = min(len(first), len(second))
+    low, high = 0, limit
+
+    # Binary search on the longest prefix; slicing compares in C.
+    while low < high:
+        middle = (low + high + 1) // 2
+
+        if first[:middle] == second[:middle]:
+            low = middle
+        else:
+            high = middle - 1
+
+    return low
+
+
+def cacheable_fraction(prompts: list[str]) -> float:
+    """
+    Mean share of each prompt that matches a prompt sent before it. The
+    longest match with any earlier prompt is with a sorted-order neighbour.
+    """
+
+    seen: list[str] = []
+    shares = []
+
+    for prompt in prompts:
+        position = bisect.bisect_left(seen, prompt)
+        neighbours = seen[max(position - 1, 0):position + 1]
+        shared = max((common_prefix_length(prompt, other) for other in neighbours), default=0)
+
+        shares.append(shared / len(prompt))
+        bisect.insort(seen, prompt)
+
+    return sum(shares[1:]) / max(len(shares) - 1, 1)
+
+
+def check_prefix_stability(
+    template: PromptTemplate,
+    requests,
+    seed: int,
+    constrained: bool,
+) -> list[str]:
+    rng = random.Random(seed)
+    errors = []
+    system_messages = set()
+
+    for query, contexts, n in requests:
+        messages = template.build_messages(
+            query=query,
+            contexts=contexts,
+            n=n,
+            constrained=constrained,
+        )
+        system_messages.add(messages[0]["content"])
+
+        shuffled = rng.sample(contexts, len(contexts))
+
+        reordered = template.build_messages(
+            query=query,
+            contexts=shuffled,
+            n=n,
+            constrained=constrained,
+        )
+
+        if reordered != messages:
+            errors.append(f"prompt depends on the context order for case {query.text[:40]!r}")
+
+    if len(system_messages) != 1:
+        errors.append(f"system message differs between requests ({len(system_messages)} variants)")
+
+    return errors
+
+
+def measure_provider(
+    url: str,
+    model: str,
+    api_key: str | None,
+    rendered: list[list[dict[str, str]]],
+) -> float:
+    headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+    latencies = []
+
+    with httpx.Client(base_url=url.rstrip("/"), headers=headers, timeout=120) as client:
+        for messages in rendered:
+            started = time.perf_counter()
+            response = client.post(
+                "/chat/completions",
+                json={"model": model, "messages": messages, "max_tokens": 1, "temperature": 0},
+            )
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - started)
+
+    return sum(latencies) / len(latencies) * 1000
+
+
+def run(args) -> tuple[dict, bool]:
+    requests = build_requests(args.requests, args.seed)
+    directories = [BUILTIN_TEMPLATES_DIR]
+
+    if args.templates_dir:
+        directories.append(args.templates_dir)
+
+    templates = [
+        template
+        for template in PromptTemplateRegistry(directories=directories).templates()
+        if template.speciality is None
+    ]
+    results = []
+    stable = True
+
+    print(f"{'version':<18} {'shared_prefix':>20} {'cacheable':>10} {'provider':>12}")
+
+    for template in templates:
+        rendered = [
+            template.build_messages(
+                query=query,
+                contexts=contexts,
+                n=n,
+                constrained=args.constrained,
+            )
+            for query, contexts, n in requests
+        ]
+        prompts = [flatten(messages) for messages in rendered]
+
+        shared = min(common_prefix_length(prompts[0], prompt) for prompt in prompts)
+
+        row = {
+            "version": template.version,
+            "shared_prefix_chars": shared,
+            "shared_prefix_tokens": estimate_tokens(prompts[0][:shared]),
+            "cacheable": round(cacheable_fraction(prompts), 4),
+            "provider_mean_ms": None,
+            "errors": [],
+        }
+
+        if template.static_system:
+            row["errors"] = check_prefix_stability(
+                template, requests, args.seed, args.constrained
+            )
+            stable = stable and not row["errors"]
+
+        if args.llm_url:
+            row["provider_mean_ms"] = round(
+                measure_provider(args.llm_url, args.model, args.api_key, rendered), 2
+            )
+
+        results.append(row)
+
+        provider = f"{row['provider_mean_ms']:.1f}ms" if row["provider_mean_ms"] else "-"
+        print(
+            f"{template.version:<18} {shared:>8} chars {row['shared_prefix_tokens']:>5} tok "
+            f"{row['cacheable']:>9.1%} {provider:>12}"
+        )
+
+        for error in row["errors"]:
+            print(f"  FAIL: {error}")
+
+    report = {
+        "requests": args.requests,
+        "seed": args.seed,
+        "constrained": args.constrained,
+        "results": results,
+    }
+
+    return report, stable
+
+
+def parse_args(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--templates-dir", type=Path, default=None)
+    parser.add_argument("--constrained", action="store_true")
+    parser.add_argument("--llm-url", default=None)
+    parser.add_argument("--model", default="local-model")
+    parser.add_argument("--api-key", default=None)
+    parser.add_argument("--output", type=Path, default=None)
+
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+
+    report, stable = run(args)
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2))
+        print(f"Results written to {args.output}")
+
+    return 0 if stable else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
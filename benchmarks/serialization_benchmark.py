@@ -0,0 +1,220 @@
+"""
+Micro-benchmark for JSON serialization on the service hot paths.
+
+Compares, per message:
+- api_response: FastAPI's default path for a SolveCaseResult
+  (jsonable_encoder, then json.dumps) against ModelJSONResponse
+- case_service_body: jsonable_encoder plus httpx's json= encoding of an
+  AIDraft against model_dump_json
+- amqp_consume: json.loads plus model_validate of a MassTransit envelope
+  against parse_case_assigned_event (model_validate_json on the raw body)
+- embedding_response: httpx's response.json() against json_loads on the raw
+  response bytes
+
+and reports the mean CPU time per message and the time saved.
+
+Usage:
+    python -m benchmarks.serialization_benchmark
+    python -m benchmarks.serialization_benchmark --iterations 5000 --output serialization.json
+"""
+
+import argparse
+import json
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Callable
+
+import httpx
+from fastapi.encoders import jsonable_encoder
+
+from app.api.responses import ModelJSONResponse
+from app.core.serialization import json_loads, orjson
+from app.domain.events import CaseAssignedEvent
+from app.domain.models import (
+    AIDraft,
+    DraftRecommendation,
+    SolveCaseResult,
+    UsedContext,
+)
+from app.infrastructure.rabbitmq_adapter import parse_case_assigned_event
+
+PREVIEW = (
+    "The tenant reported recurring water damage in the bathroom ceiling after the "
+    "upstairs renovation. The landlord was notified in writing twice and has not "
+    "responded within the period set in the lease agreement. "
+) * 2
+
+
+def build_result(contexts: int = 10) -> SolveCaseResult:
+    draft = AIDraft(
+        summary="The tenant may be entitled to a rent reduction and repair by the landlord.",
+        recommendations=[
+            DraftRecommendation(
+                title=f"Recommendation {index}",
+                content="Send a formal notice of defect with a deadline for repair. " * 4,
+                reasoning="The lease obliges the landlord to keep the property in good repair. " * 2,
+            )
+            for index in range(3)
+        ],
+        missing_information=["Date of the first notification", "Photos of the damage"],
+        important_notes=[
+            "This is an AI-generated draft and must be reviewed by a human consultant "
+            "before being sent to the user."
+        ],
+        used_context=[
+            UsedContext(
+                id=uuid.uuid4(),
+                source="pdf",
+                pdf_id=uuid.uuid4(),
+                similarity=0.8123,
+                text_preview=PREVIEW[:300],
+            )
+            for _ in range(contexts)
+        ],
+    )
+
+    return SolveCaseResult(case_id=uuid.uuid4(), draft=draft)
+
+
+def build_amqp_body() -> bytes:
+    envelope = {
+        "messageId": str(uuid.uuid4()),
+        "conversationId": str(uuid.uuid4()),
+        "sourceAddress": "rabbitmq://broker/case-service",
+        "destinationAddress": "rabbitmq://broker/Contracts.Shared.Events:CaseAssigned",
+        "messageType": ["urn:message:Contracts.Shared.Events:CaseAssigned"],
+        "message": {
+            "caseId": str(uuid.uuid4()),
+            "consultantId": str(uuid.uuid4()),
+        },
+        "sentTime": "2024-11-05T10:15:00Z",
+        "headers": {},
+        "host": {"machineName": "case-service-1", "processName": "CaseService"},
+    }
+
+    return json.dumps(envelope).encode("utf-8")
+
+
+def build_embedding_response(contexts: int = 10) -> httpx.Response:
+    body = {
+        "results": [
+            {
+                "id": str(uuid.uuid4()),
+                "source": "pdf",
+                "raw_text": PREVIEW * 4,
+                "pdf_id": str(uuid.uuid4()),
+                "similarity": 0.8123,
+            }
+            for _ in range(contexts)
+        ]
+    }
+
+    return httpx.Response(200, content=json.dumps(body).encode("utf-8"))
+
+
+def legacy_amqp_parse(body: bytes) -> CaseAssignedEvent:
+    raw = json.loads(body)
+
+    payload = raw.get("message", raw)
+
+    return CaseAssignedEvent.model_validate(payload)
+
+
+def legacy_json_body(value) -> bytes:
+    # What JSONResponse and httpx's json= do with an encoded value.
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def build_cases() -> dict[str, dict[str, Callable[[], object]]]:
+    result = build_result()
+    draft = result.draft
+    amqp_body = build_amqp_body()
+    embedding_response = build_embedding_response()
+
+    return {
+        "api_response": {
+            "legacy": lambda: legacy_json_body(jsonable_encoder(result)),
+            "fast": lambda: ModelJSONResponse(result).body,
+        },
+        "case_service_body": {
+            "legacy": lambda: legacy_json_body(jsonable_encoder(draft)),
+            "fast": lambda: draft.model_dump_json(by_alias=True).encode("utf-8"),
+        },
+        "amqp_consume": {
+            "legacy": lambda: legacy_amqp_parse(amqp_body),
+            "fast": lambda: parse_case_assigned_event(amqp_body),
+        },
+        "embedding_response": {
+            "legacy": lambda: json.loads(embedding_response.text),
+            "fast": lambda: json_loads(embedding_response.content),
+        },
+    }
+
+
+def time_operation(operation: Callable[[], object], iterations: int) -> float:
+    operation()
+
+    started = time.process_time()
+
+    for _ in range(iterations):
+        operation()
+
+    return (time.process_time() - started) / iterations * 1_000_000
+
+
+def run(iterations: int) -> dict:
+    results = []
+
+    print(f"orjson: {'installed' if orjson is not None else 'not installed'}")
+    print(f"{'path':<20} {'legacy':>12} {'fast':>12} {'saved':>12} {'speedup':>8}")
+
+    for name, variants in build_cases().items():
+        legacy_us = time_operation(variants["legacy"], iterations)
+        fast_us = time_operation(variants["fast"], iterations)
+
+        row = {
+            "path": name,
+            "legacy_us": round(legacy_us, 2),
+            "fast_us": round(fast_us, 2),
+            "saved_us": round(legacy_us - fast_us, 2),
+            "speedup": round(legacy_us / fast_us, 2) if fast_us else None,
+        }
+        results.append(row)
+
+        print(
+            f"{name:<20} {legacy_us:>10.1f}us {fast_us:>10.1f}us "
+            f"{row['saved_us']:>10.1f}us {row['speedup'] or 0:>7.2f}x"
+        )
+
+    return {
+        "iterations": iterations,
+        "orjson": orjson is not None,
+        "results": results,
+    }
+
+
+def parse_args(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--output", type=Path, default=None)
+
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+
+    report = run(args.iterations)
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2))
+        print(f"Results written to {args.output}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())